@@ -0,0 +1,107 @@
+"""
+Streaming ZIP bundles of documents for the Fiber Expansion Platform.
+
+A bundle is written by zipfile into a ChunkSink and sent as it is built:
+each stored file is read in chunks and every chunk of archive drained to
+the response, so neither the archive nor a whole document is ever held in
+memory or staged on disk. Files go into one folder per property.
+"""
+import logging
+import os
+import zipfile
+from datetime import datetime
+from typing import Iterator, List
+
+from sqlalchemy import select
+
+from .database import SessionLocal
+from .models.models import Document, Property
+from .streaming import ChunkSink
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_CHUNK_SIZE = 256 * 1024
+BUNDLE_QUERY_SIZE = 500
+
+# Formats that are already compressed are stored as they are
+STORED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".gif", ".docx", ".xlsx"}
+
+
+def _safe_name(name: str) -> str:
+    """Make a name usable as one path segment inside the archive."""
+    name = name.replace("/", "-").replace("\\", "-").strip(". ")
+    return name or "untitled"
+
+
+def _unique_name(name: str, used: set) -> str:
+    """Number repeated archive names: plat.pdf, plat (2).pdf, ..."""
+    stem, extension = os.path.splitext(name)
+    candidate, n = name, 1
+    while candidate.lower() in used:
+        n += 1
+        candidate = f"{stem} ({n}){extension}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def iter_bundle_documents(criteria: list) -> Iterator[List]:
+    """
+    Yield chunks of (id, filename, path, created_at, property name) rows by id.
+
+    Runs inside the response stream, so it owns its database session.
+    """
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(
+                    Document.id,
+                    Document.original_filename,
+                    Document.filename,
+                    Document.file_path,
+                    Document.created_at,
+                    Property.name.label("property_name"),
+                    Property.id.label("property_id")
+                )
+                .join(Property, Property.id == Document.property_id)
+                .where(Document.id > last_id, *criteria)
+                .order_by(Document.id)
+                .limit(BUNDLE_QUERY_SIZE)
+            ).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+    finally:
+        db.close()
+
+
+def stream_bundle(criteria: list) -> Iterator[bytes]:
+    """Stream a ZIP archive of the documents matching the criteria."""
+    sink = ChunkSink()
+    used = set()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as archive:
+        for rows in iter_bundle_documents(criteria):
+            for row in rows:
+                if not os.path.exists(row.file_path):
+                    logger.warning("Bundle skipped document %s: file not found", row.id)
+                    continue
+                folder = _safe_name(f"{row.property_name} ({row.property_id})")
+                name = _unique_name(
+                    f"{folder}/{_safe_name(row.original_filename or row.filename)}", used
+                )
+                created = row.created_at or datetime.now()
+                entry = zipfile.ZipInfo(name, date_time=created.timetuple()[:6])
+                extension = os.path.splitext(name.lower())[1]
+                entry.compress_type = (
+                    zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                )
+                entry.file_size = os.path.getsize(row.file_path)
+
+                with open(row.file_path, "rb") as source, archive.open(entry, "w") as target:
+                    while chunk := source.read(BUNDLE_CHUNK_SIZE):
+                        target.write(chunk)
+                        yield sink.drain()
+                yield sink.drain()
+    yield sink.drain()
@@ -31,6 +31,19 @@ class Settings(BaseSettings):
     # File uploads
     max_upload_size: int = 50 * 1024 * 1024  # 50MB
     upload_directory: str = "uploads"
+    preview_workers: int = 2  # Threads rendering document previews
+    
+    # Imports
+    import_batch_size: int = 1000  # Spreadsheet rows processed per batch
+    import_workers: int = 2  # Imports running at once
+    import_sheet_workers: int = 2  # Processes parsing workbook sheets in parallel
+    
+    # Scoring
+    rescore_chunk_size: int = 1000  # Rows scored and committed per chunk
+    timing_rescore_interval_hours: float = 24  # 0 disables the scheduler
+    
+    # Dashboard
+    stats_cache_ttl_seconds: float = 60
     
     # GVTC Texas Counties (13-county footprint)
     gvtc_counties: list = [
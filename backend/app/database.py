@@ -1,4 +1,5 @@
 """Database connection and session management."""
+import os
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -17,6 +18,10 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+MIGRATIONS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations"
+)
+
 
 def get_db():
     """Dependency to get database session."""
@@ -28,6 +33,27 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables."""
-    from . import models  # noqa
+    """Initialize database tables and apply pending migrations."""
+    from .models import models  # noqa
     Base.metadata.create_all(bind=engine)
+    run_migrations()
+
+
+def run_migrations(connection=None, merge_duplicates: bool = False):
+    """
+    Upgrade the database to the latest Alembic revision.
+    
+    create_all only creates missing tables; the migrations in
+    backend/migrations alter the tables an older release created.
+    An upgrade that finds properties sharing a name and county stops
+    and lists them, unless merge_duplicates is set.
+    """
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIRECTORY)
+    if connection is not None:
+        config.attributes["connection"] = connection
+    config.attributes["merge_duplicates"] = merge_duplicates
+    command.upgrade(config, "head")
@@ -0,0 +1,187 @@
+"""
+Cacheable, resumable file downloads for the Fiber Expansion Platform.
+
+file_download answers a GET for a stored file the way browsers and
+download managers expect: a real media type, a validator (a strong ETag
+from the content hash, or a weak one from size and modification time),
+304 Not Modified for If-None-Match / If-Modified-Since, and a single byte
+range as 206 Partial Content (honouring If-Range) so large plats resume
+instead of restarting.
+"""
+import mimetypes
+import os
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Types the platform's mimetypes table may not know
+MEDIA_TYPES = {
+    ".dwg": "image/vnd.dwg",
+    ".dxf": "image/vnd.dxf",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def media_type_for(filename: str) -> str:
+    """Get the media type of a file from its name."""
+    extension = os.path.splitext(filename.lower())[1]
+    if extension in MEDIA_TYPES:
+        return MEDIA_TYPES[extension]
+    return mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def content_disposition(filename: str, inline: bool = False) -> str:
+    disposition = "inline" if inline else "attachment"
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header into an inclusive (start, end) byte range.
+
+    Only single ranges are served; multi-range and malformed headers
+    return None, which means sending the whole file.
+
+    Raises:
+        RangeNotSatisfiable: If the range starts past the end of the file,
+            or the file is empty
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start, _, end = spec.strip().partition("-")
+    try:
+        if not start:
+            # Suffix range: the last N bytes
+            length = int(end)
+            # An empty file has no last byte to serve
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        first = int(start)
+        last = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable()
+    if last < first:
+        return None
+    return first, min(last, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match uses."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def _range_applies(request: Request, etag: str, last_modified: datetime) -> bool:
+    """If-Range: serve the range only if the client's copy is current."""
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', "W/")):
+        # Strong comparison; a weak validator never matches
+        return not etag.startswith("W/") and if_range == etag
+    try:
+        return parsedate_to_datetime(if_range) >= last_modified.replace(microsecond=0)
+    except (TypeError, ValueError):
+        return False
+
+
+def iter_file(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+def file_download(
+    request: Request,
+    path: str,
+    filename: str,
+    content_hash: Optional[str] = None,
+    inline: bool = False
+) -> Response:
+    """
+    Build the response to a download of a stored file.
+
+    content_hash, when known, is the strong ETag; other files get a weak
+    ETag from their size and modification time.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+    etag = f'"{content_hash}"' if content_hash else f'W/"{size:x}-{int(stat.st_mtime):x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+        "Accept-Ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    headers["Content-Disposition"] = content_disposition(filename, inline)
+    media_type = media_type_for(filename)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and _range_applies(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file(path, start, end - start + 1),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
@@ -0,0 +1,169 @@
+"""
+Streaming property export for the Fiber Expansion Platform.
+
+Rows are read in fixed-size keyset chunks of plain column tuples (never ORM
+objects) and encoded chunk by chunk, so memory stays constant however many
+properties match the export filters.
+"""
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select, Boolean, DateTime, Float, Integer
+
+from .database import SessionLocal
+from .models.models import Property
+from .streaming import ChunkSink
+
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_COLUMNS = [
+    "id", "name", "property_type", "status", "phase",
+    "address", "city", "county", "state", "zip_code", "latitude", "longitude",
+    "units", "buildings", "stories", "lots", "phases", "current_phase",
+    "break_ground_date", "expected_delivery_date", "stabilization_date",
+    "fiber_distance_gvtc", "fiber_distance_lease", "lease_partner", "has_fiber_access",
+    "competitor_count", "median_income", "population_density", "census_tract",
+    "nearby_schools", "nearby_libraries",
+    "score", "tier", "last_scored_at",
+    "notes", "source", "import_job_id", "created_at", "updated_at"
+]
+
+
+class ExportFormat(str, enum.Enum):
+    """Supported export file formats."""
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _plain(value):
+    """Convert a column value to a plain CSV/JSON friendly value."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_export_chunks(criteria: list, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List]:
+    """
+    Yield chunks of export rows matching the criteria, ordered by id.
+
+    Runs inside the response stream, after the request's session is gone,
+    so it owns its database session for the lifetime of the export.
+    """
+    columns = [getattr(Property, name) for name in EXPORT_COLUMNS]
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(*columns)
+                .where(Property.id > last_id, *criteria)
+                .order_by(Property.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+    finally:
+        db.close()
+
+
+def stream_csv(chunks: Iterator[List]) -> Iterator[bytes]:
+    """Encode export chunks as CSV with a header row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows([_plain(v) for v in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_ndjson(chunks: Iterator[List]) -> Iterator[bytes]:
+    """Encode export chunks as newline-delimited JSON objects."""
+    for rows in chunks:
+        lines = [
+            json.dumps({name: _plain(v) for name, v in zip(EXPORT_COLUMNS, row)})
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    fields = []
+    for name in EXPORT_COLUMNS:
+        column_type = Property.__table__.columns[name].type
+        if isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def stream_parquet(chunks: Iterator[List]) -> Iterator[bytes]:
+    """Encode export chunks as Parquet, one row group per chunk."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema()
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in chunks:
+            data = {
+                name: [v.value if isinstance(v, enum.Enum) else v for v in values]
+                for name, values in zip(EXPORT_COLUMNS, zip(*rows))
+            }
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    """Check whether the optional pyarrow dependency is installed."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_export(
+    export_format: ExportFormat,
+    criteria: list,
+    chunk_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Stream properties matching the criteria in the requested format."""
+    chunks = iter_export_chunks(criteria, chunk_size or EXPORT_CHUNK_SIZE)
+    if export_format == ExportFormat.PARQUET:
+        return stream_parquet(chunks)
+    if export_format == ExportFormat.NDJSON:
+        return stream_ndjson(chunks)
+    return stream_csv(chunks)
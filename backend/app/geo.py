@@ -0,0 +1,97 @@
+"""
+Grid-based spatial indexing for property locations.
+
+Locations are bucketed into fixed-size latitude/longitude cells numbered
+row by row, so a bounding box maps to one contiguous range of cell ids per
+grid row. An ordinary B-tree index on the cell id then answers map queries
+on both SQLite and Postgres without a spatial extension.
+"""
+import math
+from typing import List, Optional, Tuple
+
+# Cell size in degrees (~5.5 km north-south)
+GRID_CELL_DEGREES = 0.05
+GRID_ROWS = int(round(180 / GRID_CELL_DEGREES))
+GRID_COLUMNS = int(round(360 / GRID_CELL_DEGREES))
+
+# Above this many grid rows a bbox is matched with a single covering range
+MAX_BBOX_RANGES = 256
+
+# Map clusters per web map tile edge (a 256px tile holds 4x4 clusters)
+CLUSTERS_PER_TILE = 4
+
+
+def _grid_row(lat: float) -> int:
+    return min(max(int(math.floor((lat + 90) / GRID_CELL_DEGREES)), 0), GRID_ROWS - 1)
+
+
+def _grid_column(lng: float) -> int:
+    return min(max(int(math.floor((lng + 180) / GRID_CELL_DEGREES)), 0), GRID_COLUMNS - 1)
+
+
+def grid_cell(lat: Optional[float], lng: Optional[float]) -> Optional[int]:
+    """Get the grid cell id for a location, or None without coordinates."""
+    if lat is None or lng is None:
+        return None
+    return _grid_row(lat) * GRID_COLUMNS + _grid_column(lng)
+
+
+def bbox_cell_ranges(
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float
+) -> List[Tuple[int, int]]:
+    """
+    Get the inclusive cell id ranges covering a bounding box.
+
+    Returns one range per grid row, or a single covering range when the box
+    spans more than MAX_BBOX_RANGES rows. Ranges may include cells partly
+    outside the box, so callers still apply the exact coordinate filter.
+    """
+    first_row, last_row = _grid_row(min_lat), _grid_row(max_lat)
+    first_col, last_col = _grid_column(min_lng), _grid_column(max_lng)
+
+    if last_row - first_row + 1 > MAX_BBOX_RANGES:
+        return [(first_row * GRID_COLUMNS + first_col, last_row * GRID_COLUMNS + last_col)]
+
+    return [
+        (row * GRID_COLUMNS + first_col, row * GRID_COLUMNS + last_col)
+        for row in range(first_row, last_row + 1)
+    ]
+
+
+def cluster_cell_degrees(zoom: int) -> float:
+    """Get the clustering cell size in degrees for a web map zoom level."""
+    return 360 / (2 ** zoom * CLUSTERS_PER_TILE)
+
+
+def backfill_geo_cells(db, chunk_size: int = 1000) -> int:
+    """
+    Assign grid cells to located properties that do not have one yet.
+
+    Returns:
+        Number of properties updated
+    """
+    from sqlalchemy import select, update
+    from .models.models import Property
+
+    updated = 0
+    while True:
+        rows = db.execute(
+            select(Property.id, Property.latitude, Property.longitude)
+            .where(
+                Property.geo_cell.is_(None),
+                Property.latitude.isnot(None),
+                Property.longitude.isnot(None)
+            )
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return updated
+        db.execute(
+            update(Property),
+            [{"id": row.id, "geo_cell": grid_cell(row.latitude, row.longitude)} for row in rows]
+        )
+        db.commit()
+        updated += len(rows)
@@ -0,0 +1,1436 @@
+"""
+Batch import pipeline for property spreadsheets.
+
+Uploaded Excel, CSV and Parquet files are read from the spooled upload and
+handed to the importer as fixed-size DataFrame batches, so peak memory
+depends on the batch size rather than on the size of the file.
+
+Every batch is indexed by data row position (0 for the first row below the
+header), which keeps error reports pointing at spreadsheet row index + 2.
+
+A workbook with several selected sheets is parsed sheet by sheet in a pool
+of worker processes, each spooling its parsed batches to disk, and the
+import job writes them in workbook order through the same batch writer as
+every other file. A property listed on several sheets is written once,
+from its rows merged in workbook order.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .database import SessionLocal
+from .geo import grid_cell
+from .models.models import (
+    Property, PropertyType, PropertyStatus, PropertyPhase, ImportJob, ColumnMappingProfile
+)
+from .scoring import BATCH_SCORING_COLUMNS, calculate_scores_batch, weight_provider
+from .stats import stats_cache
+
+settings = get_settings()
+
+# Keys per lookup query, keeping bound parameters under SQLite's limit
+LOOKUP_CHUNK_SIZE = 400
+
+# Row errors kept on an ImportJob (all of them are counted)
+MAX_REPORTED_ERRORS = 50
+
+
+# Column mapping for imports
+MDU_COLUMN_MAPPING = {
+    "name": ["Name", "Property Name", "Project Name", "MDU Name", "Development Name"],
+    "address": ["Address", "Street Address", "Location", "Street"],
+    "city": ["City", "Town"],
+    "county": ["County"],
+    "state": ["State"],
+    "zip_code": ["Zip", "Zip Code", "ZIP", "Postal Code"],
+    "units": ["Units", "Unit Count", "Total Units", "# Units", "Number of Units"],
+    "buildings": ["Buildings", "Building Count", "# Buildings"],
+    "stories": ["Stories", "Floors"],
+    "status": ["Status", "Property Status", "Project Status"],
+    "phase": ["Phase", "Development Phase", "Construction Phase"],
+    "break_ground_date": ["Break Ground", "Break Ground Date", "Ground Breaking", "Start Date"],
+    "expected_delivery_date": ["Delivery Date", "Expected Delivery", "Completion Date", "Move In Date"],
+    "fiber_distance_gvtc": ["GVTC Distance", "Distance to GVTC", "Fiber Distance", "Distance"],
+    "latitude": ["Latitude", "Lat"],
+    "longitude": ["Longitude", "Long", "Lng"],
+    "competitor_count": ["Competitors", "Competitor Count", "# Competitors"],
+    "notes": ["Notes", "Comments", "Description"]
+}
+
+SFU_COLUMN_MAPPING = {
+    "name": ["Name", "Subdivision Name", "Project Name", "Development Name"],
+    "address": ["Address", "Location"],
+    "city": ["City", "Town"],
+    "county": ["County"],
+    "state": ["State"],
+    "zip_code": ["Zip", "Zip Code", "ZIP"],
+    "lots": ["Lots", "Total Lots", "Lot Count", "# Lots", "Number of Lots"],
+    "phases": ["Phases", "Total Phases", "Phase Count"],
+    "current_phase": ["Current Phase", "Phase"],
+    "status": ["Status"],
+    "break_ground_date": ["Break Ground", "Start Date"],
+    "expected_delivery_date": ["Delivery Date", "Completion Date"],
+    "fiber_distance_gvtc": ["GVTC Distance", "Distance to GVTC", "Fiber Distance"],
+    "latitude": ["Latitude", "Lat"],
+    "longitude": ["Longitude", "Long", "Lng"],
+    "competitor_count": ["Competitors", "Competitor Count"],
+    "notes": ["Notes", "Comments"]
+}
+
+
+def normalize_header(name: str) -> str:
+    """Normalize a column header for matching: case, underscores and spacing."""
+    return " ".join(str(name).replace("_", " ").lower().split())
+
+
+@lru_cache(maxsize=None)
+def alias_index(import_type: str) -> Dict[str, Tuple[str, int]]:
+    """
+    Index the column aliases of an import type by normalized header.
+
+    Each alias maps to its field and its rank among the field's aliases, so
+    a header is matched with one dict lookup and the earlier alias still
+    wins when a file has several columns for one field.
+    """
+    _, column_mapping = import_property_type(import_type)
+    index = {}
+    for field, options in column_mapping.items():
+        for rank, option in enumerate(options):
+            index.setdefault(normalize_header(option), (field, rank))
+    return index
+
+
+def _header_names(cells) -> List[str]:
+    """Name header cells the way pandas does for blank and repeated headers."""
+    names = []
+    seen = {}
+    for i, value in enumerate(cells):
+        name = f"Unnamed: {i}" if value is None or str(value).strip() == "" else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def iter_xlsx_batches(
+    fileobj: BinaryIO,
+    batch_size: int,
+    sheet: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a worksheet (the first by default) of an .xlsx file in row batches.
+
+    The workbook is opened in openpyxl read-only mode, which streams rows
+    from the file instead of building the whole sheet. Blank rows between
+    data rows are kept, as pandas.read_excel keeps them, so they are
+    reported as rows without a name; trailing blank rows are dropped.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _header_names(header)
+        width = len(columns)
+
+        batch, index = [], []
+        for position, row in _data_rows(rows, width):
+            batch.append(row)
+            index.append(position)
+            if len(batch) >= batch_size:
+                yield pd.DataFrame(batch, columns=columns, index=index)
+                batch, index = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, index=index)
+    finally:
+        workbook.close()
+
+
+def _data_rows(rows: Iterable[tuple], width: int) -> Iterator[Tuple[int, tuple]]:
+    """Number the rows below the header and pad them to width, holding back blank runs."""
+    blank_from = None
+    for position, row in enumerate(rows):
+        if all(value is None for value in row):
+            if blank_from is None:
+                blank_from = position
+            continue
+        if blank_from is not None:
+            # Only blank rows followed by data are sheet rows
+            for blank in range(blank_from, position):
+                yield blank, (None,) * width
+            blank_from = None
+        yield position, tuple(row[:width]) + (None,) * (width - len(row))
+
+
+def iter_xls_batches(
+    fileobj: BinaryIO,
+    batch_size: int,
+    sheet: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """Yield a legacy .xls worksheet in row batches (the format cannot be streamed)."""
+    df = pd.read_excel(fileobj, sheet_name=sheet or 0)
+    for start in range(0, len(df), batch_size):
+        yield df.iloc[start:start + batch_size]
+
+
+def iter_csv_batches(
+    fileobj: BinaryIO,
+    batch_size: int,
+    columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a CSV file in row batches with pandas' chunked reader.
+
+    Cells are read as text and coerced by normalize_batch, like Excel
+    cells. Only the given columns are parsed.
+    """
+    reader = pd.read_csv(
+        fileobj, dtype=str, usecols=columns, chunksize=batch_size, encoding="utf-8-sig"
+    )
+    with reader:
+        yield from reader
+
+
+def iter_parquet_batches(
+    fileobj: BinaryIO,
+    batch_size: int,
+    columns: Optional[List[str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Yield a Parquet file in row batches, reading only the given columns."""
+    import pyarrow.parquet as pq
+
+    start = 0
+    for record_batch in pq.ParquetFile(fileobj).iter_batches(batch_size=batch_size, columns=columns):
+        df = record_batch.to_pandas()
+        df.index = range(start, start + len(df))
+        start += len(df)
+        yield df
+
+
+def file_format(filename: str) -> str:
+    """Get the import format of a file from its extension."""
+    return os.path.splitext(filename.lower())[1]
+
+
+def workbook_sheets(fileobj: BinaryIO, filename: str) -> List[str]:
+    """List the worksheets of an Excel file; CSV and Parquet files have none."""
+    extension = file_format(filename)
+    if extension in (".csv", ".parquet"):
+        return []
+    try:
+        if extension == ".xls":
+            return list(pd.ExcelFile(fileobj).sheet_names)
+
+        from openpyxl import load_workbook
+        workbook = load_workbook(fileobj, read_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+    finally:
+        fileobj.seek(0)
+
+
+def select_sheets(available: List[str], requested: Optional[List[str]]) -> List[str]:
+    """
+    Resolve the sheets to import: every sheet unless a list was requested.
+
+    Raises:
+        ValueError: If a requested sheet is not in the workbook
+    """
+    if not requested:
+        return available
+    missing = [name for name in requested if name not in available]
+    if missing:
+        raise ValueError(f"Sheet not found: {', '.join(missing)}")
+    return [name for name in available if name in requested]
+
+
+def read_import_header(
+    fileobj: BinaryIO,
+    filename: str,
+    sheet: Optional[str] = None
+) -> List[str]:
+    """Read the column names of an import file without reading its rows."""
+    extension = file_format(filename)
+    try:
+        if extension == ".csv":
+            return list(pd.read_csv(fileobj, dtype=str, nrows=0, encoding="utf-8-sig").columns)
+        if extension == ".parquet":
+            import pyarrow.parquet as pq
+            return list(pq.ParquetFile(fileobj).schema_arrow.names)
+        if extension == ".xls":
+            return list(pd.read_excel(fileobj, sheet_name=sheet or 0, nrows=0).columns)
+
+        from openpyxl import load_workbook
+        workbook = load_workbook(fileobj, read_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            header = next(worksheet.iter_rows(values_only=True), ())
+        finally:
+            workbook.close()
+        return _header_names(header)
+    finally:
+        fileobj.seek(0)
+
+
+def iter_import_batches(
+    fileobj: BinaryIO,
+    filename: str,
+    batch_size: int = 0,
+    columns: Optional[List[str]] = None,
+    sheet: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield an import file as DataFrame batches.
+
+    Excel, CSV and Parquet files are supported. columns, when given, lists
+    the only columns the caller needs; the columnar formats skip the rest.
+    sheet picks the worksheet of an Excel file (the first by default).
+    """
+    batch_size = batch_size or settings.import_batch_size
+    extension = file_format(filename)
+    if extension == ".csv":
+        return iter_csv_batches(fileobj, batch_size, columns)
+    if extension == ".parquet":
+        return iter_parquet_batches(fileobj, batch_size, columns)
+    if extension == ".xls":
+        return iter_xls_batches(fileobj, batch_size, sheet)
+    return iter_xlsx_batches(fileobj, batch_size, sheet)
+
+
+def map_columns(header: List[str], import_type: str) -> Dict[str, str]:
+    """Map property fields to the file columns that hold them by alias."""
+    index = alias_index(import_type)
+    matches = {}
+    for column in header:
+        match = index.get(normalize_header(column))
+        if match:
+            field, rank = match
+            if field not in matches or rank < matches[field][1]:
+                matches[field] = (column, rank)
+    return {field: column for field, (column, _) in matches.items()}
+
+
+def _unnamed(column: str) -> bool:
+    return str(column).startswith("Unnamed: ")
+
+
+def header_signature(header: List[str]) -> str:
+    """Fingerprint a vendor's header layout: SHA-256 of its normalized names."""
+    names = sorted({normalize_header(column) for column in header if not _unnamed(column)})
+    return hashlib.sha256(json.dumps(names).encode("utf-8")).hexdigest()
+
+
+def unmapped_columns(header: List[str], col_map: Dict[str, str]) -> List[str]:
+    """List the named columns of a file that no field is read from."""
+    mapped = set(col_map.values())
+    return [column for column in header if column not in mapped and not _unnamed(column)]
+
+
+def validate_column_overrides(overrides: Dict[str, Optional[str]], import_type: str) -> None:
+    """
+    Check that a requested mapping only names fields of the import type.
+
+    Raises:
+        ValueError: If a field is unknown
+    """
+    _, column_mapping = import_property_type(import_type)
+    unknown = [field for field in overrides if field not in column_mapping]
+    if unknown:
+        raise ValueError(f"Unknown {import_type} field: {', '.join(unknown)}")
+
+
+def resolve_column_mapping(
+    db: Session,
+    header: List[str],
+    import_type: str,
+    overrides: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, str]:
+    """
+    Work out which column holds each field.
+
+    A header layout imported before maps the way it did last time (its
+    saved profile); any other layout maps by alias. overrides, field to
+    column (or None to leave a field out), are applied last.
+
+    Raises:
+        ValueError: If an override names an unknown field or a missing column
+    """
+    profile = db.query(ColumnMappingProfile).filter(
+        ColumnMappingProfile.import_type == import_type,
+        ColumnMappingProfile.header_signature == header_signature(header)
+    ).first()
+    if profile:
+        # The layout matched on normalized names; map back to this file's spelling
+        columns = {}
+        for column in header:
+            columns.setdefault(normalize_header(column), column)
+        col_map = {
+            field: columns[normalize_header(column)]
+            for field, column in profile.column_mapping.items()
+            if normalize_header(column) in columns
+        }
+    else:
+        col_map = map_columns(header, import_type)
+
+    if overrides:
+        validate_column_overrides(overrides, import_type)
+        missing = [c for c in overrides.values() if c and c not in header]
+        if missing:
+            raise ValueError(f"Column not found: {', '.join(missing)}")
+        for field, column in overrides.items():
+            col_map = {f: c for f, c in col_map.items() if f != field and c != column}
+            if column:
+                col_map[field] = column
+    return col_map
+
+
+def save_mapping_profile(
+    db: Session,
+    header: List[str],
+    import_type: str,
+    col_map: Dict[str, str],
+    job_id: Optional[int] = None
+) -> None:
+    """Remember a header layout's mapping so the next file like it maps the same."""
+    signature = header_signature(header)
+    profile = db.query(ColumnMappingProfile).filter(
+        ColumnMappingProfile.import_type == import_type,
+        ColumnMappingProfile.header_signature == signature
+    ).first()
+    if profile is None:
+        profile = ColumnMappingProfile(import_type=import_type, header_signature=signature)
+        db.add(profile)
+    profile.column_mapping = dict(col_map)
+    profile.import_job_id = job_id
+
+
+def read_column_mappings(
+    db: Session,
+    fileobj: BinaryIO,
+    filename: str,
+    import_type: str,
+    sheets: List[str],
+    overrides: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[Optional[str], Tuple[List[str], Dict[str, str]]]:
+    """Read the header of each sheet (or of the file) and resolve its mapping."""
+    mappings = {}
+    for sheet in sheets or [None]:
+        header = read_import_header(fileobj, filename, sheet)
+        mappings[sheet] = (header, resolve_column_mapping(db, header, import_type, overrides))
+    return mappings
+
+
+STATUS_VALUES = {
+    "prospect": PropertyStatus.PROSPECT,
+    "contacted": PropertyStatus.CONTACTED,
+    "negotiation": PropertyStatus.IN_NEGOTIATION,
+    "in negotiation": PropertyStatus.IN_NEGOTIATION,
+    "committed": PropertyStatus.COMMITTED,
+    "construction": PropertyStatus.UNDER_CONSTRUCTION,
+    "under construction": PropertyStatus.UNDER_CONSTRUCTION,
+    "completed": PropertyStatus.COMPLETED,
+    "on hold": PropertyStatus.ON_HOLD,
+    "declined": PropertyStatus.DECLINED
+}
+
+PHASE_VALUES = {
+    "pre-development": PropertyPhase.PRE_DEVELOPMENT,
+    "predevelopment": PropertyPhase.PRE_DEVELOPMENT,
+    "planning": PropertyPhase.PLANNING,
+    "permitting": PropertyPhase.PERMITTING,
+    "construction": PropertyPhase.CONSTRUCTION,
+    "occupancy": PropertyPhase.OCCUPANCY,
+    "stabilized": PropertyPhase.STABILIZED
+}
+
+TEXT_FIELDS = ("address", "city", "zip_code")
+INT_FIELDS = ("buildings", "stories", "phases", "current_phase")
+FLOAT_FIELDS = ("latitude", "longitude", "fiber_distance_gvtc")
+DATE_FIELDS = ("break_ground_date", "expected_delivery_date")
+
+
+def parse_date(value) -> Optional[datetime]:
+    """Parse a single date from various formats."""
+    if value is None or pd.isna(value):
+        return None
+    if isinstance(value, datetime):
+        return value
+    try:
+        return pd.to_datetime(value).to_pydatetime()
+    except Exception:
+        return None
+
+
+def _text_column(values: pd.Series, default: Optional[str] = None) -> list:
+    """Stripped strings, with blank cells replaced by the default."""
+    text = values.astype(str).str.strip()
+    return text.where(values.notna() & (text != ""), default).tolist()
+
+
+def _int_column(values: pd.Series) -> list:
+    """Integers truncated toward zero, None where a cell is not numeric."""
+    numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+    valid = np.isfinite(numbers)
+    truncated = np.trunc(np.where(valid, numbers, 0))
+    return [int(v) if ok else None for v, ok in zip(truncated.tolist(), valid.tolist())]
+
+
+def _float_column(values: pd.Series) -> list:
+    """Floats, None where a cell is not numeric."""
+    numbers = pd.to_numeric(values, errors="coerce")
+    return numbers.astype(object).where(numbers.notna(), None).tolist()
+
+
+def _date_column(values: pd.Series) -> list:
+    """Datetimes, None where a cell is not a date."""
+    try:
+        dates = pd.to_datetime(values, errors="coerce", format="mixed")
+    except (TypeError, ValueError):
+        # Mixed time zones cannot share a column; parse cell by cell
+        return [parse_date(v) for v in values]
+    return [None if pd.isna(v) else v.to_pydatetime() for v in dates]
+
+
+def _category_column(values: pd.Series, mapping: dict, default) -> list:
+    """Map labels to enum members once per distinct value."""
+    codes, labels = pd.factorize(values)
+    mapped = [mapping.get(str(label).lower().strip(), default) if label else default for label in labels]
+    return [mapped[code] if code >= 0 else default for code in codes.tolist()]
+
+
+def normalize_batch(
+    df: pd.DataFrame,
+    col_map: Dict[str, str],
+    property_type: PropertyType,
+    defaults: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Convert a batch of spreadsheet rows into property values, column-wise.
+
+    Whole columns are coerced at once (numbers and dates that fail to parse
+    become None). Rows without a name or county are reported the same way
+    as before, as {"row": spreadsheet row, "error": message}.
+
+    Returns:
+        (rows, errors): one dict of property values per valid row, in sheet
+        order, and the row errors of the batch
+    """
+    name_col, county_col = col_map.get("name"), col_map.get("county")
+    if name_col:
+        missing_name = df[name_col].isna().to_numpy()
+        names = df[name_col].astype(str).str.strip()
+    else:
+        missing_name = np.ones(len(df), dtype=bool)
+        names = pd.Series("", index=df.index)
+    if county_col:
+        counties = pd.Series(_text_column(df[county_col], ""), index=df.index)
+    else:
+        counties = pd.Series("", index=df.index)
+    missing_county = ~missing_name & (counties == "").to_numpy()
+
+    errors = []
+    for position in np.flatnonzero(missing_name | missing_county).tolist():
+        row = int(df.index[position]) + 2
+        if missing_name[position]:
+            errors.append({"row": row, "error": "Missing property name"})
+        else:
+            errors.append({"row": row, "error": f"Missing county for '{names.iloc[position]}'"})
+
+    valid = ~(missing_name | missing_county)
+    df = df[valid]
+    columns = {"name": names[valid].tolist(), "county": counties[valid].tolist()}
+
+    for field in TEXT_FIELDS:
+        if col_map.get(field):
+            columns[field] = _text_column(df[col_map[field]])
+    if col_map.get("state"):
+        columns["state"] = _text_column(df[col_map["state"]], "TX")
+
+    count_field = "units" if property_type == PropertyType.MDU else "lots"
+    if col_map.get(count_field):
+        columns[count_field] = _int_column(df[col_map[count_field]])
+    for field in INT_FIELDS:
+        if col_map.get(field):
+            columns[field] = _int_column(df[col_map[field]])
+    if col_map.get("competitor_count"):
+        columns["competitor_count"] = [
+            v or 0 for v in _int_column(df[col_map["competitor_count"]])
+        ]
+
+    for field in DATE_FIELDS:
+        if col_map.get(field):
+            columns[field] = _date_column(df[col_map[field]])
+    for field in FLOAT_FIELDS:
+        if col_map.get(field):
+            columns[field] = _float_column(df[col_map[field]])
+
+    if col_map.get("status"):
+        columns["status"] = _category_column(
+            df[col_map["status"]], STATUS_VALUES, PropertyStatus.PROSPECT
+        )
+    if col_map.get("phase"):
+        columns["phase"] = _category_column(
+            df[col_map["phase"]], PHASE_VALUES, PropertyPhase.PRE_DEVELOPMENT
+        )
+    if col_map.get("notes"):
+        notes = df[col_map["notes"]]
+        columns["notes"] = notes.astype(str).str.strip().where(notes.notna(), None).tolist()
+
+    constants = {"property_type": property_type, "state": "TX", **(defaults or {})}
+    fields = list(columns)
+    rows = [
+        {**constants, **dict(zip(fields, values))}
+        for values in zip(*columns.values())
+    ]
+    return rows, errors
+
+
+def lookup_properties(
+    db: Session,
+    keys: Iterable[Tuple[str, str]]
+) -> Dict[Tuple[str, str], Row]:
+    """
+    Load existing property rows for a set of (name, county) keys.
+
+    One tuple IN query per LOOKUP_CHUNK_SIZE keys, served by the
+    (name, county) index, replaces a query per spreadsheet row. Rows are
+    plain column tuples, not ORM objects.
+    """
+    keys = list(set(keys))
+    found = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        for row in db.execute(
+            select(Property.__table__)
+            .where(tuple_(Property.name, Property.county).in_(chunk))
+        ):
+            found[(row.name, row.county)] = row
+    return found
+
+
+def lookup_import_hashes(
+    db: Session,
+    keys: Iterable[Tuple[str, str]]
+) -> Dict[Tuple[str, str], Optional[str]]:
+    """Like lookup_properties, but load only the import hash of each key."""
+    keys = list(set(keys))
+    found = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        for name, county, import_hash in db.execute(
+            select(Property.name, Property.county, Property.import_hash)
+            .where(tuple_(Property.name, Property.county).in_(chunk))
+        ):
+            found[(name, county)] = import_hash
+    return found
+
+
+def merge_row(pending: Dict[Tuple[str, str], Dict[str, Any]], key, data: Dict[str, Any]) -> bool:
+    """
+    Queue a parsed row for writing, folding repeats of a key together.
+
+    A repeated key keeps its earlier values wherever the new row is blank,
+    as updating an existing property does. Returns True for a repeat.
+    """
+    if key in pending:
+        pending[key].update({k: v for k, v in data.items() if v is not None})
+        return True
+    pending[key] = dict(data)
+    return False
+
+
+# Columns describing where a row came from, not what it says
+HASH_EXCLUDED_FIELDS = ("source", "import_job_id", "import_hash")
+
+
+def row_hash(data: Dict[str, Any]) -> str:
+    """SHA-256 of a normalized import row, stable across imports."""
+    content = {k: v for k, v in data.items() if k not in HASH_EXCLUDED_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def plan_batch(
+    rows: List[Dict[str, Any]],
+    known_hashes: Dict[Tuple[str, str], Optional[str]],
+    counts: Dict[str, int],
+    row_counts: Optional[List[Dict[str, int]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Decide what a batch of normalized rows changes.
+
+    Repeats of a key are folded into one row (see merge_row). Each row is
+    hashed and checked against the import hash of the existing property:
+    rows identical to the last import are dropped before any scoring or
+    writing. Adds to the imported/updated/unchanged counts.
+
+    Args:
+        rows: Rows from normalize_batch
+        known_hashes: Import hash (or None) of each existing key
+        row_counts: Counts each row also adds to (its sheet's, for a batch
+            drawn from several sheets)
+
+    Returns:
+        Rows to write, each with its import_hash set
+    """
+    pending, occurrences = {}, {}
+    for index, data in enumerate(rows):
+        key = (data["name"], data["county"])
+        merge_row(pending, key, data)
+        occurrences.setdefault(key, []).append(
+            (counts, row_counts[index]) if row_counts else (counts,)
+        )
+
+    def count(targets, outcome: str) -> None:
+        for target in targets:
+            target[outcome] += 1
+
+    changed = []
+    for key, data in pending.items():
+        data["import_hash"] = row_hash(data)
+        first, *repeats = occurrences[key]
+        if key not in known_hashes:
+            count(first, "imported")
+            for targets in repeats:
+                count(targets, "updated")
+        elif known_hashes[key] == data["import_hash"]:
+            for targets in occurrences[key]:
+                count(targets, "unchanged")
+            continue
+        else:
+            for targets in occurrences[key]:
+                count(targets, "updated")
+        changed.append(data)
+    return changed
+
+
+def _upsert_statement(db: Session, columns: List[str]):
+    """INSERT ... ON CONFLICT (name, county) DO UPDATE for the bind's dialect."""
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Property.__table__)
+    updates = {c: stmt.excluded[c] for c in columns if c not in ("created_by_id", "created_at")}
+    updates["updated_at"] = func.now()
+    return stmt.on_conflict_do_update(index_elements=["name", "county"], set_=updates)
+
+
+def write_properties(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    existing: Dict[Tuple[str, str], Row],
+    created_by_id: Optional[int] = None,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Score a batch of parsed rows and upsert them.
+
+    Rows with the same mapped columns share one statement; a batch merged
+    from sheets with different columns runs one per column set, so a
+    column a row never mapped is left as stored. Blank values of rows that match an existing property keep the stored
+    value, and every row is scored on its merged values with the batch
+    scorer. Mapper events do not run for bulk statements, so derived
+    columns (score, tier, geo_cell, timing_rescore_at) are set here.
+    The caller commits.
+
+    Returns:
+        Number of rows written
+    """
+    if not rows:
+        return 0
+
+    now = now or datetime.now()
+    merged = []
+    scoring = {name: [] for name in BATCH_SCORING_COLUMNS}
+    for data in rows:
+        current = existing.get((data["name"], data["county"]))
+        values = dict(data)
+        if current is not None:
+            for column, value in data.items():
+                if value is None:
+                    values[column] = getattr(current, column)
+        for name in BATCH_SCORING_COLUMNS:
+            if name in values:
+                scoring[name].append(values[name])
+            else:
+                scoring[name].append(getattr(current, name) if current is not None else None)
+        merged.append((values, current))
+
+    result = calculate_scores_batch(
+        scoring, type_weights=weight_provider.snapshot(), now=now, include_breakdown=True
+    )
+
+    params = []
+    for (values, current), score, tier, breakdown, next_change in zip(
+        merged,
+        result["total_score"].tolist(),
+        result["tier"].tolist(),
+        result["breakdown"],
+        result["next_timing_change"]
+    ):
+        latitude = values["latitude"] if "latitude" in values else getattr(current, "latitude", None)
+        longitude = values["longitude"] if "longitude" in values else getattr(current, "longitude", None)
+        values.update(
+            score=score,
+            tier=tier,
+            score_breakdown=breakdown,
+            last_scored_at=now,
+            timing_rescore_at=next_change,
+            geo_cell=grid_cell(latitude, longitude),
+            created_by_id=created_by_id
+        )
+        params.append(values)
+
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for values in params:
+        groups.setdefault(tuple(values), []).append(values)
+    for columns, group in groups.items():
+        db.execute(_upsert_statement(db, list(columns)), group)
+    return len(params)
+
+
+def estimate_rows(
+    fileobj: BinaryIO,
+    filename: str,
+    sheets: Optional[List[str]] = None
+) -> Optional[int]:
+    """
+    Estimate the data rows of an import file without reading them.
+
+    Exact for Parquet (file metadata). For .xlsx only the dimension records
+    of the sheets (the first by default) are read, which can count trailing
+    blank rows and are missing from some files. None when no cheap
+    estimate exists.
+    """
+    extension = file_format(filename)
+    if extension not in (".xlsx", ".parquet"):
+        return None
+    try:
+        if extension == ".parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetFile(fileobj).metadata.num_rows
+
+        from openpyxl import load_workbook
+        workbook = load_workbook(fileobj, read_only=True)
+        try:
+            worksheets = [workbook[name] for name in sheets] if sheets else workbook.worksheets[:1]
+            max_rows = [worksheet.max_row for worksheet in worksheets]
+        finally:
+            workbook.close()
+        if not all(max_rows):
+            return None
+        return sum(max(max_row - 1, 0) for max_row in max_rows)
+    finally:
+        fileobj.seek(0)
+
+
+IMPORT_FORMATS = (".xlsx", ".xls", ".csv", ".parquet")
+IMPORT_SOURCES = {".csv": "CSV Import", ".parquet": "Parquet Import"}
+
+
+def import_property_type(import_type: str) -> Tuple[PropertyType, Dict[str, List[str]]]:
+    """Get the property type and column mapping for an import type."""
+    if import_type == "MDU":
+        return PropertyType.MDU, MDU_COLUMN_MAPPING
+    return PropertyType.SUBDIVISION, SFU_COLUMN_MAPPING
+
+
+def new_import_counts() -> Dict[str, int]:
+    return {
+        "processed": 0, "imported": 0, "updated": 0,
+        "unchanged": 0, "skipped": 0, "errors": 0
+    }
+
+
+class ParsedBatch(NamedTuple):
+    """Normalized rows of one batch, with what they were parsed from."""
+    sheet: Optional[str]
+    rows: List[Dict[str, Any]]
+    errors: List[dict]  # The first MAX_REPORTED_ERRORS row errors
+    error_count: int
+    row_count: int  # Data rows read, including rows with errors
+    column_mapping: Dict[str, str]
+    row_sheets: Optional[List[str]] = None  # Sheet of each row, for rows merged across sheets
+
+
+def iter_parsed_batches(
+    fileobj: BinaryIO,
+    filename: str,
+    import_type: str,
+    col_map: Dict[str, str],
+    sheet: Optional[str] = None,
+    defaults: Optional[Dict[str, Any]] = None
+) -> Iterator[ParsedBatch]:
+    """Read and normalize the mapped columns of a file (or worksheet) batch by batch."""
+    prop_type, _ = import_property_type(import_type)
+    batches = iter_import_batches(
+        fileobj, filename, columns=sorted(set(col_map.values())), sheet=sheet
+    )
+    for df in batches:
+        rows, errors = normalize_batch(df, col_map, prop_type, defaults)
+        yield ParsedBatch(sheet, rows, errors[:MAX_REPORTED_ERRORS], len(errors), len(df), col_map)
+
+
+class SheetSpool(NamedTuple):
+    """Parsed batches of one worksheet, pickled one after another in a file."""
+    sheet: str
+    path: str
+    keys: set  # (name, county) of every parsed row
+
+
+def spool_sheet(
+    fileobj: BinaryIO,
+    filename: str,
+    import_type: str,
+    sheet: str,
+    col_map: Dict[str, str],
+    spool_path: str,
+    defaults: Optional[Dict[str, Any]] = None
+) -> SheetSpool:
+    """Read and normalize a worksheet batch by batch into a spool file."""
+    keys = set()
+    with open(spool_path, "wb") as spool:
+        for batch in iter_parsed_batches(fileobj, filename, import_type, col_map, sheet, defaults):
+            pickle.dump(batch, spool, pickle.HIGHEST_PROTOCOL)
+            keys.update((row["name"], row["county"]) for row in batch.rows)
+    return SheetSpool(sheet, spool_path, keys)
+
+
+def parse_sheet(
+    path: str,
+    filename: str,
+    import_type: str,
+    sheet: str,
+    col_map: Dict[str, str],
+    spool_path: str,
+    defaults: Optional[Dict[str, Any]] = None
+) -> SheetSpool:
+    """
+    Spool a worksheet of an import file (see spool_sheet).
+
+    Runs in a sheet worker process: only paths go in and only the sheet's
+    keys come back, so neither process holds more than a batch of rows.
+    """
+    with open(path, "rb") as fileobj:
+        return spool_sheet(fileobj, filename, import_type, sheet, col_map, spool_path, defaults)
+
+
+def iter_spooled_sheets(spools: List[SheetSpool]) -> Iterator[ParsedBatch]:
+    """
+    Yield the spooled batches of several worksheets in workbook order.
+
+    Rows whose key is on more than one sheet are held back from their
+    sheet's batches and yielded after the last sheet, each key's rows
+    together and in workbook order, so they are merged into one write per
+    property (and one import hash, stable across re-imports). Those
+    batches carry no sheet and name the sheet of each row in row_sheets.
+    """
+    seen, repeated = set(), set()
+    for spool in spools:
+        repeated |= seen & spool.keys
+        seen |= spool.keys
+    del seen
+
+    held: Dict[Tuple[str, str], List[Tuple[Dict[str, Any], str]]] = {}
+    for spool in spools:
+        with open(spool.path, "rb") as batches:
+            while True:
+                try:
+                    batch = pickle.load(batches)
+                except EOFError:
+                    break
+                if repeated:
+                    rows = []
+                    for row in batch.rows:
+                        key = (row["name"], row["county"])
+                        if key in repeated:
+                            held.setdefault(key, []).append((row, batch.sheet))
+                        else:
+                            rows.append(row)
+                    batch = batch._replace(rows=rows)
+                yield batch
+
+    size = settings.import_batch_size
+    keys = list(held)
+    for start in range(0, len(keys), size):
+        occurrences = [entry for key in keys[start:start + size] for entry in held[key]]
+        yield ParsedBatch(
+            None,
+            [row for row, _ in occurrences],
+            [],
+            0,
+            0,
+            {},
+            [sheet for _, sheet in occurrences]
+        )
+
+
+_sheet_executor: Optional[ProcessPoolExecutor] = None
+_sheet_executor_lock = threading.Lock()
+
+
+def sheet_executor() -> ProcessPoolExecutor:
+    """Get the worksheet parser pool, starting it on first use."""
+    global _sheet_executor
+    with _sheet_executor_lock:
+        if _sheet_executor is None:
+            # Spawned rather than forked: the parent runs request and import threads
+            _sheet_executor = ProcessPoolExecutor(
+                max_workers=settings.import_sheet_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _sheet_executor
+
+
+def shutdown_sheet_executor() -> None:
+    """Stop the worksheet parser pool (a later import starts a new one)."""
+    global _sheet_executor
+    with _sheet_executor_lock:
+        if _sheet_executor is not None:
+            _sheet_executor.shutdown(wait=False, cancel_futures=True)
+            _sheet_executor = None
+
+
+def iter_parallel_sheets(
+    path: str,
+    filename: str,
+    import_type: str,
+    col_maps: Dict[str, Dict[str, str]],
+    defaults: Optional[Dict[str, Any]] = None
+) -> Iterator[ParsedBatch]:
+    """
+    Parse worksheets concurrently and yield them in workbook order.
+
+    col_maps gives the column mapping of each sheet to parse, in order.
+
+    At most import_sheet_workers sheets are parsed at a time, each spooled
+    by its worker to a file beside the upload; once every sheet is parsed,
+    the spools are read back a batch at a time (see iter_spooled_sheets),
+    so the writer sees the same batches as for a single sheet. Spools are
+    removed when the consumer finishes or stops.
+    """
+    spool_paths = [f"{path}.{index}.batches" for index in range(len(col_maps))]
+    queued = list(enumerate(col_maps.items()))[::-1]
+    running: Dict[Future, int] = {}
+    spools: Dict[int, SheetSpool] = {}
+    try:
+        try:
+            executor = sheet_executor()
+            while queued or running:
+                while queued and len(running) < settings.import_sheet_workers:
+                    index, (sheet, col_map) = queued.pop()
+                    future = executor.submit(
+                        parse_sheet, path, filename, import_type, sheet, col_map,
+                        spool_paths[index], defaults
+                    )
+                    running[future] = index
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spools[running.pop(future)] = future.result()
+        except BrokenProcessPool:
+            shutdown_sheet_executor()
+            raise
+
+        yield from iter_spooled_sheets([spools[index] for index in sorted(spools)])
+    finally:
+        for future in running:
+            # A sheet still being parsed removes its spool when it finishes
+            if not future.cancel():
+                spool_path = spool_paths[running[future]]
+                future.add_done_callback(lambda _, spool_path=spool_path: _remove_file(spool_path))
+        for spool_path in spool_paths:
+            _remove_file(spool_path)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _add_counts(totals: Dict[str, int], counts: Dict[str, int]) -> None:
+    for name, value in counts.items():
+        totals[name] += value
+
+
+def dry_run_import(
+    db: Session,
+    fileobj: BinaryIO,
+    filename: str,
+    import_type: str,
+    sheets: Optional[List[str]] = None,
+    overrides: Optional[Dict[str, Optional[str]]] = None
+) -> Dict[str, Any]:
+    """
+    Validate an import file and count what importing it would change.
+
+    Runs the same column mapping, coercion, required-field checks and
+    change detection as a real import, batch by batch, but only reads
+    from the database: one hash lookup per batch of keys. Keys seen in
+    earlier batches count as existing, as they would after a real write.
+    Selected worksheets are validated one after another, then merged as
+    an import merges them (see iter_spooled_sheets).
+
+    Raises:
+        ValueError: If a requested sheet or overridden column is not in
+            the file, or an overridden field is unknown
+    """
+    selected = select_sheets(workbook_sheets(fileobj, filename), sheets)
+    multi_sheet = len(selected) > 1
+    mappings = read_column_mappings(db, fileobj, filename, import_type, selected, overrides)
+
+    errors = []
+    counts = new_import_counts()
+    sheet_counts = {sheet: new_import_counts() for sheet in mappings}
+    seen = {}
+    spool_directory = tempfile.mkdtemp(prefix="dry-run-") if multi_sheet else None
+    try:
+        if multi_sheet:
+            spools = []
+            for index, (sheet, (_, col_map)) in enumerate(mappings.items()):
+                spool_path = os.path.join(spool_directory, f"{index}.batches")
+                spools.append(spool_sheet(fileobj, filename, import_type, sheet, col_map, spool_path))
+                fileobj.seek(0)
+            batches = iter_spooled_sheets(spools)
+        else:
+            sheet, (_, col_map) = next(iter(mappings.items()))
+            batches = iter_parsed_batches(fileobj, filename, import_type, col_map, sheet)
+
+        for batch in batches:
+            batch_counts = new_import_counts()
+            for error in batch.errors[:max(MAX_REPORTED_ERRORS - len(errors), 0)]:
+                errors.append({"sheet": batch.sheet, **error} if multi_sheet else error)
+            batch_counts["errors"] = batch_counts["skipped"] = batch.error_count
+            batch_counts["processed"] = batch.row_count
+
+            keys = {(r["name"], r["county"]) for r in batch.rows}
+            known = lookup_import_hashes(db, keys - seen.keys())
+            known.update({key: seen[key] for key in keys & seen.keys()})
+            row_counts = [sheet_counts[s] for s in batch.row_sheets] if batch.row_sheets else None
+            for data in plan_batch(batch.rows, known, batch_counts, row_counts):
+                seen[(data["name"], data["county"])] = data["import_hash"]
+            for key in keys - seen.keys():
+                seen[key] = known[key]
+            if batch.row_sheets is None:
+                _add_counts(sheet_counts[batch.sheet], batch_counts)
+            _add_counts(counts, batch_counts)
+    finally:
+        fileobj.seek(0)
+        if spool_directory:
+            shutil.rmtree(spool_directory, ignore_errors=True)
+
+    return {
+        "filename": filename,
+        "import_type": import_type,
+        "total_rows": counts["processed"],
+        "imported_count": counts["imported"],
+        "updated_count": counts["updated"],
+        "unchanged_count": counts["unchanged"],
+        "skipped_count": counts["skipped"],
+        "error_count": counts["errors"],
+        "errors": errors,
+        "column_mapping": next(iter(mappings.values()))[1],
+        "unmapped_columns": _unmapped_in(mappings),
+        "sheet_counts": sheet_counts if selected else None
+    }
+
+
+def _unmapped_in(mappings: Dict[Optional[str], Tuple[List[str], Dict[str, str]]]) -> List[str]:
+    """List the unmapped columns of every sheet, each name once."""
+    columns = {}
+    for header, col_map in mappings.values():
+        columns.update(dict.fromkeys(unmapped_columns(header, col_map)))
+    return list(columns)
+
+
+def _job_cancelled(db: Session, job_id: int) -> bool:
+    return db.query(ImportJob.status).filter(ImportJob.id == job_id).scalar() == "Cancelled"
+
+
+def _set_status(db: Session, job_id: int, status: str) -> bool:
+    """
+    Move a job to status unless it was cancelled, in the caller's transaction.
+
+    The check and the write are one UPDATE, so a cancel committed by the API
+    in the meantime is never overwritten. Returns False for a cancelled job.
+    """
+    result = db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status != "Cancelled")
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def find_previous_import(db: Session, job: ImportJob) -> Optional[ImportJob]:
+    """Find the latest completed import of the same file, type and sheets."""
+    if not job.file_digest:
+        return None
+    candidates = db.query(ImportJob).filter(
+        ImportJob.file_digest == job.file_digest,
+        ImportJob.import_type == job.import_type,
+        ImportJob.status == "Completed",
+        ImportJob.id != job.id
+    ).order_by(ImportJob.id.desc())
+    for previous in candidates:
+        if sorted(previous.sheets or []) == sorted(job.sheets or []):
+            return previous
+    return None
+
+
+def _repeat_import(job: ImportJob, previous: ImportJob) -> None:
+    """Fill in a job for an already imported file without reading it."""
+    job.total_rows = previous.total_rows
+    job.processed_count = previous.processed_count
+    job.unchanged_count = (
+        (previous.imported_count or 0) + (previous.updated_count or 0) + (previous.unchanged_count or 0)
+    )
+    job.skipped_count = previous.skipped_count
+    job.error_count = previous.error_count
+    job.errors = previous.errors
+    job.column_mapping = previous.column_mapping
+    if previous.sheet_counts:
+        job.sheet_counts = {
+            sheet: {
+                **counts, "imported": 0, "updated": 0,
+                "unchanged": counts["imported"] + counts["updated"] + counts["unchanged"]
+            }
+            for sheet, counts in previous.sheet_counts.items()
+        }
+    job.completed_at = datetime.now()
+
+
+def run_import_job(
+    job_id: int,
+    path: str,
+    user_id: Optional[int] = None,
+    force: bool = False
+) -> None:
+    """
+    Import a spooled upload, recording progress on the ImportJob.
+
+    A file already imported by a completed job (same digest, type and
+    sheets) completes at once unless force is set. Otherwise each batch is
+    written and committed together with the job counts, so GET
+    /imports/{job_id} reports real progress. Several worksheets are parsed
+    in parallel by the sheet pool and written in workbook order, with a
+    property listed on several sheets written once from its merged rows;
+    counts are kept per sheet as well as in total. A job cancelled through
+    the API, or running at server shutdown, stops before its next batch;
+    batches already committed stay.
+    Runs on the import worker pool, so it owns its database session and
+    removes the spooled file when done.
+    """
+    db = SessionLocal()
+    try:
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        if not job:
+            return
+        if job.status == "Cancelled":
+            job.completed_at = datetime.now()
+            db.commit()
+            return
+
+        # A requested column mapping always re-reads the file
+        overrides = job.column_mapping
+        previous = None if force or overrides else find_previous_import(db, job)
+        if previous:
+            _repeat_import(job, previous)
+            _set_status(db, job_id, "Completed")
+            db.commit()
+            return
+
+        with open(path, "rb") as fileobj:
+            _set_status(db, job_id, "Processing")
+            sheets = select_sheets(workbook_sheets(fileobj, job.filename), job.sheets)
+            job.total_rows = estimate_rows(fileobj, job.filename, sheets)
+            mappings = read_column_mappings(
+                db, fileobj, job.filename, job.import_type, sheets, overrides
+            )
+            job.column_mapping = next(iter(mappings.values()))[1]
+            job.unmapped_columns = _unmapped_in(mappings)
+            db.commit()
+
+            source = IMPORT_SOURCES.get(file_format(job.filename), "Excel Import")
+            defaults = {"source": source, "import_job_id": job_id}
+            if len(sheets) > 1:
+                batches = iter_parallel_sheets(
+                    path, job.filename, job.import_type,
+                    {sheet: col_map for sheet, (_, col_map) in mappings.items()}, defaults
+                )
+            else:
+                sheet, (_, col_map) = next(iter(mappings.items()))
+                batches = iter_parsed_batches(
+                    fileobj, job.filename, job.import_type, col_map, sheet, defaults
+                )
+            errors = []
+            counts = new_import_counts()
+            sheet_counts = {sheet: new_import_counts() for sheet in sheets}
+            cancelled = False
+
+            try:
+                for batch in batches:
+                    if _job_cancelled(db, job_id):
+                        cancelled = True
+                        break
+                    if _imports_stopping.is_set():
+                        # Server shutdown: keep the batches written so far
+                        errors.append({"error": "Interrupted by server shutdown"})
+                        _set_status(db, job_id, "Cancelled")
+                        cancelled = True
+                        break
+
+                    batch_counts = new_import_counts()
+                    for error in batch.errors[:max(MAX_REPORTED_ERRORS - len(errors), 0)]:
+                        errors.append({"sheet": batch.sheet, **error} if len(sheets) > 1 else error)
+                    batch_counts["errors"] = batch_counts["skipped"] = batch.error_count
+                    batch_counts["processed"] = batch.row_count
+
+                    # Resolve every existing property in the batch with one lookup
+                    existing = lookup_properties(db, [(r["name"], r["county"]) for r in batch.rows])
+
+                    # Rows merged across sheets count towards each row's sheet
+                    row_counts = (
+                        [sheet_counts[s] for s in batch.row_sheets] if batch.row_sheets else None
+                    )
+                    changed = plan_batch(
+                        batch.rows, {key: row.import_hash for key, row in existing.items()},
+                        batch_counts, row_counts
+                    )
+
+                    # Upsert the batch and commit it with the job progress, so a
+                    # failure only loses the batch in flight
+                    write_properties(db, changed, existing, user_id)
+                    _add_counts(counts, batch_counts)
+                    if batch.sheet is not None:
+                        _add_counts(sheet_counts[batch.sheet], batch_counts)
+                    _record_progress(job, counts, errors, sheet_counts)
+                    db.commit()
+                    stats_cache.invalidate()
+            finally:
+                batches.close()
+
+        _record_progress(job, counts, errors, sheet_counts)
+        job.completed_at = datetime.now()
+        if not cancelled:
+            job.total_rows = counts["processed"]
+            # A cancel after the last batch check keeps the job Cancelled
+            cancelled = not _set_status(db, job_id, "Completed")
+        db.commit()
+
+        if not cancelled:
+            _remember_mappings(db, job.import_type, mappings, job_id)
+
+    except Exception as e:
+        db.rollback()
+        job = db.query(ImportJob).filter(ImportJob.id == job_id).first()
+        if job:
+            job.status = "Failed"
+            job.errors = [{"error": str(e)}]
+            job.completed_at = datetime.now()
+            db.commit()
+    finally:
+        db.close()
+        stats_cache.invalidate()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _remember_mappings(
+    db: Session,
+    import_type: str,
+    mappings: Dict[Optional[str], Tuple[List[str], Dict[str, str]]],
+    job_id: int
+) -> None:
+    """Save the mapping profile of every header layout a completed job read."""
+    for header, col_map in mappings.values():
+        if col_map:
+            save_mapping_profile(db, header, import_type, col_map, job_id)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another import saved the same layout first; its profile stands
+        db.rollback()
+
+
+def _record_progress(
+    job: ImportJob,
+    counts: Dict[str, int],
+    errors: List[dict],
+    sheet_counts: Optional[Dict[str, Dict[str, int]]] = None
+) -> None:
+    job.processed_count = counts["processed"]
+    job.imported_count = counts["imported"]
+    job.updated_count = counts["updated"]
+    job.unchanged_count = counts["unchanged"]
+    job.skipped_count = counts["skipped"]
+    job.error_count = counts["errors"]
+    job.errors = list(errors)
+    if sheet_counts:
+        job.sheet_counts = {sheet: dict(values) for sheet, values in sheet_counts.items()}
+
+
+import_executor = ThreadPoolExecutor(
+    max_workers=settings.import_workers, thread_name_prefix="import"
+)
+
+# Set at shutdown; running jobs stop before their next batch
+_imports_stopping = threading.Event()
+
+
+def submit_import(
+    job_id: int,
+    path: str,
+    user_id: Optional[int] = None,
+    force: bool = False
+) -> Future:
+    """
+    Queue an import job on the local worker pool.
+
+    A job cancelled before it starts, as on shutdown, never runs to remove
+    its spooled file, so the future removes it instead.
+    """
+    future = import_executor.submit(run_import_job, job_id, path, user_id, force)
+    future.add_done_callback(lambda done: done.cancelled() and _remove_file(path))
+    return future
+
+
+def stop_imports() -> None:
+    """
+    Stop the import pools for shutdown.
+
+    Queued jobs are dropped and running ones are cancelled before their
+    next batch, so the worker threads do not hold up process exit.
+    """
+    _imports_stopping.set()
+    import_executor.shutdown(wait=False, cancel_futures=True)
+    shutdown_sheet_executor()
@@ -4,15 +4,25 @@ GVTC Fiber Expansion Intelligence Platform
 Main FastAPI application entry point.
 """
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import logging
 import os
 
 from .config import get_settings
-from .database import init_db
-from .routers import auth, properties, imports, contacts, documents, costs
+from .database import init_db, SessionLocal
+from .routers import auth, properties, imports, contacts, documents, costs, weights
+from .scoring import weight_provider
+from .rescoring import run_timing_rescore
+from .geo import backfill_geo_cells
+from .importer import stop_imports
+from .uploads import UPLOAD_FORM_OVERHEAD, UploadLimitMiddleware
+from .previews import preview_renderer
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -23,6 +33,14 @@ app = FastAPI(
     redoc_url="/api/redoc"
 )
 
+# Fail oversized document uploads while they stream in (inside CORS, so
+# browsers can read the 413)
+app.add_middleware(
+    UploadLimitMiddleware,
+    max_body_size=settings.max_upload_size + UPLOAD_FORM_OVERHEAD,
+    paths=["/api/documents/upload"],
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -39,6 +58,7 @@ app.include_router(imports.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(documents.router, prefix="/api")
 app.include_router(costs.router, prefix="/api")
+app.include_router(weights.router, prefix="/api")
 
 # Ensure upload directory exists
 os.makedirs(settings.upload_directory, exist_ok=True)
@@ -46,8 +66,36 @@ os.makedirs(settings.upload_directory, exist_ok=True)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
+    """Initialize database and load scoring weights on startup."""
     init_db()
+    db = SessionLocal()
+    try:
+        weight_provider.load(db)
+        backfill_geo_cells(db)
+    finally:
+        db.close()
+    
+    if settings.timing_rescore_interval_hours > 0:
+        asyncio.create_task(timing_rescore_scheduler())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Drop queued imports and previews; running imports stop after their current batch."""
+    stop_imports()
+    preview_renderer.shutdown()
+
+
+async def timing_rescore_scheduler():
+    """Periodically rescore properties whose timing factor has changed."""
+    interval = settings.timing_rescore_interval_hours * 3600
+    while True:
+        try:
+            count = await run_in_threadpool(run_timing_rescore)
+            logger.info("Timing rescore tick updated %d properties", count)
+        except Exception:
+            logger.exception("Timing rescore tick failed")
+        await asyncio.sleep(interval)
 
 
 @app.get("/api/health")
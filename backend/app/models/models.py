@@ -1,7 +1,7 @@
 """SQLAlchemy database models for the Fiber Expansion Platform."""
 from sqlalchemy import (
     Column, Integer, String, Float, Text, DateTime, Boolean, 
-    ForeignKey, Enum as SQLEnum, JSON
+    ForeignKey, Enum as SQLEnum, JSON, Index, event, literal_column
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -9,6 +9,7 @@ from datetime import datetime
 import enum
 
 from ..database import Base
+from ..geo import grid_cell
 
 
 class UserRole(str, enum.Enum):
@@ -124,6 +125,7 @@ class Property(Base):
     zip_code = Column(String(20))
     latitude = Column(Float)
     longitude = Column(Float)
+    geo_cell = Column(Integer, index=True)  # Spatial grid cell (see geo.py)
     
     # Property details - MDU
     units = Column(Integer)
@@ -164,6 +166,7 @@ class Property(Base):
     tier = Column(Integer, default=3)
     score_breakdown = Column(JSON)
     last_scored_at = Column(DateTime)
+    timing_rescore_at = Column(DateTime, index=True)  # Next timing threshold crossing
     
     # Notes
     notes = Column(Text)
@@ -171,6 +174,7 @@ class Property(Base):
     # Metadata
     source = Column(String(100))  # Manual, Excel Import, etc.
     import_job_id = Column(Integer)
+    import_hash = Column(String(64))  # SHA-256 of the last imported row
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     created_by_id = Column(Integer, ForeignKey("users.id"))
@@ -180,6 +184,27 @@ class Property(Base):
     costs = relationship("PropertyCost", back_populates="property", uselist=False)
     organization_links = relationship("PropertyOrganization", back_populates="property")
     contact_links = relationship("PropertyContact", back_populates="property")
+    
+    __table_args__ = (
+        # A property is identified by (name, county): backs import key
+        # lookups and their ON CONFLICT upserts
+        Index("ix_properties_name_county", "name", "county", unique=True),
+    )
+
+
+# Score order of the property list: unscored properties sort below every
+# score. The inlined -1 keeps the expression matching its index.
+property_sort_score = func.coalesce(Property.score, literal_column("-1"))
+
+# Backs score-ordered keyset pagination of the property list
+Index("ix_properties_sort_score_id", property_sort_score, Property.id)
+
+
+@event.listens_for(Property, "before_insert")
+@event.listens_for(Property, "before_update")
+def _set_geo_cell(mapper, connection, target):
+    """Keep the spatial grid cell in sync with the coordinates."""
+    target.geo_cell = grid_cell(target.latitude, target.longitude)
 
 
 class PropertyOrganization(Base):
@@ -226,6 +251,8 @@ class Document(Base):
     file_path = Column(String(1000), nullable=False)
     file_type = Column(String(100))  # PDF, Image, Excel, etc.
     file_size = Column(Integer)
+    # SHA-256 of the file, naming its stored blob (None for files stored per document)
+    content_hash = Column(String(64), ForeignKey("document_blobs.content_hash"), index=True)
     document_type = Column(String(100))  # Plat, Site Plan, Cost Sheet, etc.
     description = Column(Text)
     uploaded_by_id = Column(Integer, ForeignKey("users.id"))
@@ -235,6 +262,17 @@ class Document(Base):
     property = relationship("Property", back_populates="documents")
 
 
+class DocumentBlob(Base):
+    """A stored file, shared by every document with the same content."""
+    __tablename__ = "document_blobs"
+    
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the file
+    size = Column(Integer, nullable=False)
+    file_path = Column(String(1000), nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Documents using the blob
+    created_at = Column(DateTime, default=func.now())
+
+
 class PropertyCost(Base):
     """Cost modeling for properties."""
     __tablename__ = "property_costs"
@@ -298,16 +336,54 @@ class ImportJob(Base):
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(500))
     import_type = Column(String(50))  # MDU, Subdivision
-    status = Column(String(50))  # Pending, Processing, Completed, Failed
+    status = Column(String(50))  # Pending, Processing, Completed, Failed, Cancelled
     total_rows = Column(Integer)
+    processed_count = Column(Integer, default=0)
     imported_count = Column(Integer, default=0)
     updated_count = Column(Integer, default=0)
+    unchanged_count = Column(Integer, default=0)  # Rows identical to the last import
     skipped_count = Column(Integer, default=0)
     error_count = Column(Integer, default=0)
     errors = Column(JSON)
-    column_mapping = Column(JSON)
+    column_mapping = Column(JSON)  # Field to file column; requested on upload, then resolved
+    unmapped_columns = Column(JSON)  # Named file columns no field was read from
+    sheets = Column(JSON)  # Worksheets requested for import; None for all
+    sheet_counts = Column(JSON)  # Counts per worksheet, keyed by sheet name
+    file_digest = Column(String(64), index=True)  # SHA-256 of the uploaded file
+    created_by_id = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=func.now())
+    completed_at = Column(DateTime)
+
+
+class ColumnMappingProfile(Base):
+    """Column mapping last imported for a vendor's header layout."""
+    __tablename__ = "column_mapping_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    import_type = Column(String(50), nullable=False)  # MDU, Subdivision
+    header_signature = Column(String(64), nullable=False)  # SHA-256 of the normalized headers
+    column_mapping = Column(JSON, nullable=False)  # Field to file column
+    import_job_id = Column(Integer, ForeignKey("import_jobs.id"))  # Job it was last saved from
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index("ix_column_mapping_profiles_layout", "import_type", "header_signature", unique=True),
+    )
+
+
+class ScoringJob(Base):
+    """Track bulk rescoring jobs."""
+    __tablename__ = "scoring_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String(50))  # Pending, Processing, Completed, Failed
+    total_rows = Column(Integer)
+    processed_count = Column(Integer, default=0)
+    error = Column(Text)
     created_by_id = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime)
     completed_at = Column(DateTime)
 
 
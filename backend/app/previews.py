@@ -0,0 +1,167 @@
+"""
+Document previews for the Fiber Expansion Platform.
+
+Images get a thumbnail and PDFs a raster of their first page, as small
+JPEGs cached on disk under <upload_directory>/previews. They are rendered
+by a bounded pool of background threads when a document is uploaded; a
+preview missing from the cache (never rendered, failed, or removed) is
+rendered again the first time it is requested. Concurrent requests for
+the same preview share one render.
+
+Pillow (images) and PyMuPDF (PDFs) are optional; without them the
+preview endpoint answers 501.
+"""
+import enum
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from .config import get_settings
+from .models.models import Document
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PREVIEW_MEDIA_TYPE = "image/jpeg"
+PREVIEW_QUALITY = 80
+
+
+class PreviewSize(str, enum.Enum):
+    """Preview renditions, named by use."""
+    THUMB = "thumb"
+    LARGE = "large"
+
+
+# Longest side in pixels
+PREVIEW_PIXELS = {
+    PreviewSize.THUMB: 256,
+    PreviewSize.LARGE: 1024,
+}
+
+# MuPDF keeps global state and must not render on several threads at once
+_pdf_lock = threading.Lock()
+
+
+def can_preview(file_type: Optional[str]) -> bool:
+    """Check whether a document type (PDF, Image, ...) has previews."""
+    return file_type in ("Image", "PDF")
+
+
+def previews_available(file_type: Optional[str]) -> bool:
+    """Check whether the optional renderers for a document type are installed."""
+    try:
+        import PIL.Image  # noqa: F401
+        if file_type == "PDF":
+            import fitz  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def preview_key(doc: Document) -> str:
+    """Name a document's previews by its content, so shared files share them."""
+    return doc.content_hash or f"document-{doc.id}"
+
+
+def preview_path(key: str, size: PreviewSize) -> str:
+    return os.path.join(settings.upload_directory, "previews", key[:2], f"{key}-{size.value}.jpg")
+
+
+def render_preview(source_path: str, file_type: str, path: str, pixels: int) -> None:
+    """Render the preview of a file and write it to path atomically."""
+    from PIL import Image, ImageOps
+
+    if file_type == "PDF":
+        import fitz
+
+        with _pdf_lock:
+            with fitz.open(source_path) as pdf:
+                page = pdf[0]
+                zoom = pixels / max(page.rect.width, page.rect.height)
+                pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                image = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+        image.thumbnail((pixels, pixels))
+    else:
+        # Close the source file here; exif_transpose returns a new image, so
+        # shrink that one before leaving the block
+        with Image.open(source_path) as source:
+            # Let JPEG decoding downscale while reading
+            source.draft("RGB", (pixels, pixels))
+            image = ImageOps.exif_transpose(source)
+            image.thumbnail((pixels, pixels))
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, staged = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            image.save(out, "JPEG", quality=PREVIEW_QUALITY, optimize=True)
+        os.replace(staged, path)
+    except BaseException:
+        if os.path.exists(staged):
+            os.remove(staged)
+        raise
+
+
+class PreviewRenderer:
+    """Render previews on a bounded thread pool, one render per preview at a time."""
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="preview")
+        self._pending: Dict[str, Future] = {}
+        # Reentrant: a finished future runs its done callback immediately
+        self._lock = threading.RLock()
+
+    def submit(self, source_path: str, file_type: str, key: str, size: PreviewSize) -> Future:
+        """Queue a render, or join the one already queued for the same preview."""
+        path = preview_path(key, size)
+        with self._lock:
+            future = self._pending.get(path)
+            if future is None:
+                future = self._executor.submit(
+                    render_preview, source_path, file_type, path, PREVIEW_PIXELS[size]
+                )
+                self._pending[path] = future
+                future.add_done_callback(lambda done: self._finish(path, done))
+            return future
+
+    def _finish(self, path: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(path) is future:
+                del self._pending[path]
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Preview %s failed: %s", path, future.exception())
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+preview_renderer = PreviewRenderer(settings.preview_workers)
+
+
+def schedule_previews(doc: Document) -> None:
+    """Render the missing previews of a new document in the background."""
+    if not can_preview(doc.file_type) or not previews_available(doc.file_type):
+        return
+    key = preview_key(doc)
+    for size in PreviewSize:
+        if not os.path.exists(preview_path(key, size)):
+            preview_renderer.submit(doc.file_path, doc.file_type, key, size)
+
+
+def remove_previews(key: str) -> None:
+    """Delete the cached previews of a file that is gone."""
+    for size in PreviewSize:
+        path = preview_path(key, size)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,183 @@
+"""
+Chunked bulk rescoring for the Fiber Expansion Platform.
+
+Scores the property table in fixed-size chunks with the batch scoring
+engine, so memory stays flat and each chunk is committed on its own.
+"""
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .database import SessionLocal
+from .models.models import Property, ScoringJob
+from .scoring import BATCH_SCORING_COLUMNS, calculate_scores_batch, weight_provider
+from .stats import stats_cache
+
+settings = get_settings()
+
+_SCORING_COLUMNS = [getattr(Property, name) for name in BATCH_SCORING_COLUMNS]
+
+
+def iter_scoring_chunks(db: Session, chunk_size: int, *criteria) -> Iterator[List]:
+    """
+    Yield chunks of (id, scoring columns) rows ordered by primary key.
+
+    Each chunk is a separate keyset query (id > last seen id), so no cursor
+    has to survive the per-chunk commits and only the scoring inputs are
+    loaded - never full ORM objects or their stored breakdowns. Optional
+    criteria restrict which properties are read.
+    """
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Property.id, *_SCORING_COLUMNS)
+            .where(Property.id > last_id, *criteria)
+            .order_by(Property.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def rescore_rows(
+    db: Session,
+    rows: List,
+    now: Optional[datetime] = None,
+    type_weights=None
+) -> int:
+    """
+    Score a chunk of rows and write the results back with one bulk UPDATE.
+
+    Returns:
+        Number of rows updated
+    """
+    if not rows:
+        return 0
+
+    now = now or datetime.now()
+    columns = {name: [getattr(row, name) for row in rows] for name in BATCH_SCORING_COLUMNS}
+    result = calculate_scores_batch(
+        columns, type_weights=type_weights, now=now, include_breakdown=True
+    )
+
+    db.execute(
+        update(Property),
+        [
+            {
+                "id": row.id,
+                "score": score,
+                "tier": tier,
+                "score_breakdown": breakdown,
+                "last_scored_at": now,
+                "timing_rescore_at": next_change
+            }
+            for row, score, tier, breakdown, next_change in zip(
+                rows,
+                result["total_score"].tolist(),
+                result["tier"].tolist(),
+                result["breakdown"],
+                result["next_timing_change"]
+            )
+        ]
+    )
+    return len(rows)
+
+
+def run_rescoring_job(job_id: int, chunk_size: Optional[int] = None) -> None:
+    """
+    Rescore every property, recording progress on the ScoringJob.
+
+    Runs outside the request cycle, so it owns its database session.
+    """
+    chunk_size = chunk_size or settings.rescore_chunk_size
+    db = SessionLocal()
+    try:
+        job = db.query(ScoringJob).filter(ScoringJob.id == job_id).first()
+        if not job:
+            return
+
+        job.status = "Processing"
+        job.started_at = datetime.now()
+        job.total_rows = db.query(func.count(Property.id)).scalar() or 0
+        db.commit()
+
+        # One weight snapshot for the whole job, even if weights change mid-run
+        now = datetime.now()
+        type_weights = weight_provider.snapshot()
+        processed = 0
+        for rows in iter_scoring_chunks(db, chunk_size):
+            processed += rescore_rows(db, rows, now, type_weights)
+            job.processed_count = processed
+            db.commit()
+            stats_cache.invalidate()
+
+        job.status = "Completed"
+        job.completed_at = datetime.now()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        job = db.query(ScoringJob).filter(ScoringJob.id == job_id).first()
+        if job:
+            job.status = "Failed"
+            job.error = str(e)
+            job.completed_at = datetime.now()
+            db.commit()
+    finally:
+        db.close()
+
+
+def timing_rescore_due(now: datetime):
+    """
+    Criteria for properties whose timing points changed since last scored.
+
+    Properties scored before timing_rescore_at existed are picked up once,
+    while their break ground date is still ahead of their last scoring.
+    """
+    return or_(
+        Property.timing_rescore_at <= now,
+        and_(
+            Property.timing_rescore_at.is_(None),
+            Property.break_ground_date.isnot(None),
+            or_(
+                Property.last_scored_at.is_(None),
+                Property.last_scored_at < Property.break_ground_date
+            )
+        )
+    )
+
+
+def rescore_due_timing(
+    db: Session,
+    now: Optional[datetime] = None,
+    chunk_size: Optional[int] = None
+) -> int:
+    """
+    Rescore only the properties that crossed a timing threshold.
+
+    Returns:
+        Number of properties rescored
+    """
+    now = now or datetime.now()
+    chunk_size = chunk_size or settings.rescore_chunk_size
+    type_weights = weight_provider.snapshot()
+
+    rescored = 0
+    for rows in iter_scoring_chunks(db, chunk_size, timing_rescore_due(now)):
+        rescored += rescore_rows(db, rows, now, type_weights)
+        db.commit()
+        stats_cache.invalidate()
+    return rescored
+
+
+def run_timing_rescore() -> int:
+    """Run one timing rescoring tick with its own database session."""
+    db = SessionLocal()
+    try:
+        return rescore_due_timing(db)
+    finally:
+        db.close()
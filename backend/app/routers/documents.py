@@ -1,20 +1,30 @@
 """Document upload and management API endpoints."""
+import asyncio
+import logging
 import os
-import uuid
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..auth import get_current_user, require_analyst
-from ..models.models import Document, Property, User
+from ..models.models import Document, DocumentBlob, Property, User
 from ..schemas import DocumentOut
 from ..config import get_settings
+from ..bundles import stream_bundle
+from ..downloads import file_download
+from ..previews import (
+    PreviewSize, can_preview, preview_key, preview_path, preview_renderer,
+    previews_available, remove_previews, schedule_previews
+)
+from ..storage import SHA256_PATTERN, add_reference, release_blob, stage_upload, store_blob
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Ensure upload directory exists
 os.makedirs(settings.upload_directory, exist_ok=True)
@@ -66,7 +76,13 @@ async def upload_document(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_analyst)
 ):
-    """Upload a document for a property."""
+    """
+    Upload a document for a property.
+    
+    The file is streamed to disk in chunks and hashed on the way; a file
+    over the size limit fails with 413 as soon as the limit is passed.
+    Content already stored for another document is kept only once.
+    """
     # Validate property exists
     prop = db.query(Property).filter(Property.id == property_id).first()
     if not prop:
@@ -79,35 +95,75 @@ async def upload_document(
             detail=f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
     
-    # Check file size
-    contents = await file.read()
-    if len(contents) > settings.max_upload_size:
+    # Stream the file to disk off the event loop, then store it by content
+    staged_path, file_size, content_hash = await run_in_threadpool(
+        stage_upload, file.file, settings.max_upload_size
+    )
+    blob = store_blob(db, staged_path, file_size, content_hash)
+    
+    return create_document(
+        db, blob, property_id, file.filename, document_type, description, current_user
+    )
+
+
+@router.post("/attach", response_model=DocumentOut)
+async def attach_document(
+    property_id: int = Form(...),
+    content_hash: str = Form(...),
+    filename: str = Form(...),
+    document_type: str = Form("Other"),
+    description: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_analyst)
+):
+    """
+    Attach already stored content to a property without uploading it.
+    
+    Clients hash a file first and only upload it when this returns 404.
+    """
+    prop = db.query(Property).filter(Property.id == property_id).first()
+    if not prop:
+        raise HTTPException(status_code=404, detail="Property not found")
+    
+    if not allowed_file(filename):
         raise HTTPException(
             status_code=400,
-            detail=f"File too large. Maximum size: {settings.max_upload_size // (1024*1024)}MB"
+            detail=f"File type not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
         )
+    if not SHA256_PATTERN.match(content_hash):
+        raise HTTPException(status_code=400, detail="content_hash must be a SHA-256 hex digest")
     
-    # Generate unique filename
-    ext = file.filename.rsplit('.', 1)[1].lower()
-    unique_filename = f"{uuid.uuid4()}.{ext}"
+    blob = add_reference(db, content_hash)
+    if blob is None:
+        raise HTTPException(status_code=404, detail="No stored file with this content")
     
-    # Create property subdirectory
-    prop_dir = os.path.join(settings.upload_directory, f"property_{property_id}")
-    os.makedirs(prop_dir, exist_ok=True)
-    
-    # Save file
-    file_path = os.path.join(prop_dir, unique_filename)
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    return create_document(
+        db, blob, property_id, filename, document_type, description, current_user
+    )
+
+
+def create_document(
+    db: Session,
+    blob: DocumentBlob,
+    property_id: int,
+    filename: str,
+    document_type: str,
+    description: Optional[str],
+    current_user: User
+) -> Document:
+    """
+    Create a document for a referenced blob and commit it with the reference.
     
-    # Create document record
+    Its previews are then rendered in the background.
+    """
     doc = Document(
         property_id=property_id,
-        filename=unique_filename,
-        original_filename=file.filename,
-        file_path=file_path,
-        file_type=get_file_type(file.filename),
-        file_size=len(contents),
+        filename=blob.content_hash,
+        original_filename=filename,
+        file_path=blob.file_path,
+        file_type=get_file_type(filename),
+        file_size=blob.size,
+        content_hash=blob.content_hash,
         document_type=document_type,
         description=description,
         uploaded_by_id=current_user.id
@@ -116,10 +172,27 @@ async def upload_document(
     db.add(doc)
     db.commit()
     db.refresh(doc)
+    schedule_previews(doc)
     
     return doc
 
 
+def document_filter_criteria(
+    property_id: Optional[int] = None,
+    document_type: Optional[str] = None,
+    search: Optional[str] = None
+) -> list:
+    """Build the WHERE criteria shared by the document list and bundle."""
+    criteria = []
+    if property_id:
+        criteria.append(Document.property_id == property_id)
+    if document_type:
+        criteria.append(Document.document_type == document_type)
+    if search:
+        criteria.append(Document.original_filename.ilike(f"%{search}%"))
+    return criteria
+
+
 @router.get("", response_model=List[DocumentOut])
 async def list_documents(
     property_id: Optional[int] = None,
@@ -130,18 +203,37 @@ async def list_documents(
     db: Session = Depends(get_db)
 ):
     """List documents with optional filters."""
-    query = db.query(Document)
-    
-    if property_id:
-        query = query.filter(Document.property_id == property_id)
-    if document_type:
-        query = query.filter(Document.document_type == document_type)
-    if search:
-        query = query.filter(Document.original_filename.ilike(f"%{search}%"))
+    query = db.query(Document).filter(
+        *document_filter_criteria(property_id, document_type, search)
+    )
     
     return query.order_by(Document.created_at.desc()).offset(skip).limit(limit).all()
 
 
+@router.get("/bundle")
+async def download_bundle(
+    property_id: Optional[int] = None,
+    document_type: Optional[str] = None,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Download the documents matching the filters as one ZIP archive.
+    
+    The archive is built while it streams, one folder per property.
+    """
+    criteria = document_filter_criteria(property_id, document_type, search)
+    if db.query(Document.id).filter(*criteria).first() is None:
+        raise HTTPException(status_code=404, detail="No documents match these filters")
+    
+    filename = f"property-{property_id}-documents.zip" if property_id else "documents.zip"
+    return StreamingResponse(
+        stream_bundle(criteria),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 @router.get("/property/{property_id}", response_model=List[DocumentOut])
 async def get_property_documents(property_id: int, db: Session = Depends(get_db)):
     """Get all documents for a property."""
@@ -162,8 +254,19 @@ async def get_document(doc_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{doc_id}/download")
-async def download_document(doc_id: int, db: Session = Depends(get_db)):
-    """Download a document file."""
+async def download_document(
+    doc_id: int,
+    request: Request,
+    inline: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Download a document file.
+    
+    Supports conditional requests (ETag / Last-Modified, answered with 304)
+    and single byte ranges (206) for resuming large files. inline asks the
+    browser to display the file rather than save it.
+    """
     doc = db.query(Document).filter(Document.id == doc_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
@@ -171,10 +274,57 @@ async def download_document(doc_id: int, db: Session = Depends(get_db)):
     if not os.path.exists(doc.file_path):
         raise HTTPException(status_code=404, detail="File not found on server")
     
-    return FileResponse(
-        path=doc.file_path,
-        filename=doc.original_filename,
-        media_type='application/octet-stream'
+    return file_download(
+        request,
+        doc.file_path,
+        doc.original_filename or doc.filename,
+        content_hash=doc.content_hash,
+        inline=inline
+    )
+
+
+@router.get("/{doc_id}/preview")
+async def get_document_preview(
+    doc_id: int,
+    request: Request,
+    size: PreviewSize = PreviewSize.THUMB,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a small JPEG preview of an image or the first page of a PDF.
+    
+    Previews are rendered when a document is uploaded; one missing from
+    the cache is rendered on this request.
+    """
+    doc = db.query(Document).filter(Document.id == doc_id).first()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    if not can_preview(doc.file_type):
+        raise HTTPException(status_code=404, detail="No preview for this file type")
+    if not previews_available(doc.file_type):
+        raise HTTPException(status_code=501, detail="Preview rendering is not installed on the server")
+    
+    key = preview_key(doc)
+    path = preview_path(key, size)
+    if not os.path.exists(path):
+        if not os.path.exists(doc.file_path):
+            raise HTTPException(status_code=404, detail="File not found on server")
+        try:
+            await asyncio.wrap_future(
+                preview_renderer.submit(doc.file_path, doc.file_type, key, size)
+            )
+        except Exception as e:
+            logger.warning("Preview of document %s failed: %s", doc_id, e)
+            raise HTTPException(status_code=404, detail="Preview could not be generated")
+    
+    name = os.path.splitext(doc.original_filename or doc.filename)[0]
+    return file_download(
+        request,
+        path,
+        f"{name}-{size.value}.jpg",
+        content_hash=f"{doc.content_hash}-{size.value}" if doc.content_hash else None,
+        inline=True
     )
 
 
@@ -207,16 +357,20 @@ async def delete_document(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_analyst)
 ):
-    """Delete a document."""
+    """Delete a document, and its file when no other document shares it."""
     doc = db.query(Document).filter(Document.id == doc_id).first()
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Delete file from disk
-    if os.path.exists(doc.file_path):
-        os.remove(doc.file_path)
-    
     db.delete(doc)
+    db.flush()
+    if doc.content_hash:
+        if release_blob(db, doc.content_hash):
+            remove_previews(doc.content_hash)
+    else:
+        if os.path.exists(doc.file_path):
+            os.remove(doc.file_path)
+        remove_previews(preview_key(doc))
     db.commit()
     
     return {"message": "Document deleted"}
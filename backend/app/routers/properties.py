@@ -1,29 +1,51 @@
 """Property API endpoints."""
+import base64
+import json
 from typing import List, Optional
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, Query as SAQuery
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_, and_, tuple_, func, case, cast, Integer
 
 from ..database import get_db
 from ..auth import get_current_user, require_analyst
 from ..models.models import (
     Property, PropertyType, PropertyStatus, PropertyPhase,
-    User, PropertyContact, PropertyOrganization
+    User, PropertyContact, PropertyOrganization, ScoringJob, property_sort_score
 )
 from ..schemas import (
     PropertyCreate, PropertyUpdate, PropertyOut, PropertyListOut,
-    PropertyFilter
+    PropertyFilter, ScoringJobOut, ClusterResponse
 )
-from ..scoring import recalculate_property_score, calculate_score
+from ..scoring import recalculate_property_score, rescore_changed_factors, calculate_score
+from ..rescoring import run_rescoring_job, rescore_due_timing
+from ..geo import bbox_cell_ranges, cluster_cell_degrees
+from ..stats import stats_cache
+from ..export import ExportFormat, MEDIA_TYPES, parquet_available, stream_export
 
 router = APIRouter(prefix="/properties", tags=["Properties"])
 
 
-@router.get("", response_model=List[PropertyListOut])
-async def list_properties(
-    skip: int = 0,
-    limit: int = 100,
+def encode_cursor(score: Optional[float], property_id: int) -> str:
+    """Encode a (score, id) position as an opaque pagination cursor."""
+    # Unscored properties sit at the sort score of property_sort_score
+    raw = json.dumps([-1 if score is None else score, property_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a pagination cursor back into a (score, id) position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, property_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), int(property_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def property_filter_criteria(
     county: Optional[str] = None,
     property_type: Optional[PropertyType] = None,
     status: Optional[PropertyStatus] = None,
@@ -32,24 +54,21 @@ async def list_properties(
     min_lat: Optional[float] = None,
     max_lat: Optional[float] = None,
     min_lng: Optional[float] = None,
-    max_lng: Optional[float] = None,
-    db: Session = Depends(get_db)
-):
-    """List all properties with optional filters."""
-    query = db.query(Property)
-    
-    # Apply filters
+    max_lng: Optional[float] = None
+) -> list:
+    """Build the SQL criteria for the standard property list filters."""
+    criteria = []
     if county:
-        query = query.filter(Property.county == county)
+        criteria.append(Property.county == county)
     if property_type:
-        query = query.filter(Property.property_type == property_type)
+        criteria.append(Property.property_type == property_type)
     if status:
-        query = query.filter(Property.status == status)
+        criteria.append(Property.status == status)
     if tier:
-        query = query.filter(Property.tier == tier)
+        criteria.append(Property.tier == tier)
     if search:
         search_pattern = f"%{search}%"
-        query = query.filter(
+        criteria.append(
             or_(
                 Property.name.ilike(search_pattern),
                 Property.city.ilike(search_pattern),
@@ -58,20 +77,214 @@ async def list_properties(
         )
     
     # Bounding box filter for map
-    if all([min_lat, max_lat, min_lng, max_lng]):
-        query = query.filter(
-            and_(
-                Property.latitude >= min_lat,
-                Property.latitude <= max_lat,
-                Property.longitude >= min_lng,
-                Property.longitude <= max_lng
-            )
+    if all(v is not None for v in (min_lat, max_lat, min_lng, max_lng)):
+        criteria.append(bbox_filter(min_lat, max_lat, min_lng, max_lng))
+    
+    return criteria
+
+
+def apply_property_filters(query: SAQuery, *args, **kwargs) -> SAQuery:
+    """Apply the standard property list filters to a query."""
+    return query.filter(*property_filter_criteria(*args, **kwargs))
+
+
+def bbox_filter(min_lat: float, max_lat: float, min_lng: float, max_lng: float):
+    """
+    Build a bounding box filter served by the geo_cell index.
+    
+    The cell ranges narrow the search through the index; the coordinate
+    predicates then trim cells that are only partly inside the box.
+    """
+    ranges = bbox_cell_ranges(min_lat, max_lat, min_lng, max_lng)
+    return and_(
+        or_(*[Property.geo_cell.between(first, last) for first, last in ranges]),
+        Property.latitude >= min_lat,
+        Property.latitude <= max_lat,
+        Property.longitude >= min_lng,
+        Property.longitude <= max_lng
+    )
+
+
+@router.get("", response_model=List[PropertyListOut])
+async def list_properties(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    county: Optional[str] = None,
+    property_type: Optional[PropertyType] = None,
+    status: Optional[PropertyStatus] = None,
+    tier: Optional[int] = None,
+    search: Optional[str] = None,
+    min_lat: Optional[float] = None,
+    max_lat: Optional[float] = None,
+    min_lng: Optional[float] = None,
+    max_lng: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List all properties with optional filters.
+    
+    Pass cursor (empty for the first page) to use keyset pagination instead
+    of skip: the X-Next-Cursor response header then holds the cursor for
+    the following page and is omitted on the last page.
+    """
+    query = apply_property_filters(
+        db.query(Property), county, property_type, status, tier, search,
+        min_lat, max_lat, min_lng, max_lng
+    )
+    
+    # Order by score descending (highest priority first, unscored last),
+    # id breaks ties
+    query = query.order_by(property_sort_score.desc(), Property.id.desc())
+    
+    if cursor is None:
+        return query.offset(skip).limit(limit).all()
+    
+    # Keyset pagination: seek past the last (score, id) seen, served by
+    # the ix_properties_sort_score_id index regardless of page depth
+    if cursor:
+        last_score, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(property_sort_score, Property.id) < (last_score, last_id))
+    
+    page = query.limit(limit + 1).all()
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1].score, page[-1].id)
+    return page
+
+
+@router.get("/export")
+async def export_properties(
+    format: ExportFormat = ExportFormat.CSV,
+    county: Optional[str] = None,
+    property_type: Optional[PropertyType] = None,
+    status: Optional[PropertyStatus] = None,
+    tier: Optional[int] = None,
+    search: Optional[str] = None,
+    min_lat: Optional[float] = None,
+    max_lat: Optional[float] = None,
+    min_lng: Optional[float] = None,
+    max_lng: Optional[float] = None
+):
+    """
+    Export properties as CSV, NDJSON or Parquet.
+    
+    Takes the same filters as the property list. Rows are streamed in
+    chunks straight from the database, so memory use does not grow with
+    the size of the export.
+    """
+    if format == ExportFormat.PARQUET and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    
+    criteria = property_filter_criteria(
+        county, property_type, status, tier, search,
+        min_lat, max_lat, min_lng, max_lng
+    )
+    filename = f"properties-{datetime.now():%Y%m%d-%H%M%S}.{format.value}"
+    return StreamingResponse(
+        stream_export(format, criteria),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def commit_property(db: Session) -> None:
+    """Commit a property write, rejecting a duplicate (name, county)."""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="A property with this name already exists in this county"
+        )
+    stats_cache.invalidate()
+
+
+def parse_bbox(bbox: str) -> tuple:
+    """Parse a 'min_lng,min_lat,max_lng,max_lat' bounding box string."""
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="bbox must be 'min_lng,min_lat,max_lng,max_lat'"
         )
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="bbox minimums exceed maximums")
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def _grid_index(db: Session, offset_value, cell_size: float):
+    """SQL expression for the grid index of a non-negative coordinate offset."""
+    value = offset_value / cell_size
+    # Postgres rounds when casting to integer; SQLite truncates, which is
+    # floor for the non-negative offsets used here
+    if db.get_bind().dialect.name == "sqlite":
+        return cast(value, Integer)
+    return func.floor(value)
+
+
+@router.get("/clusters", response_model=ClusterResponse)
+async def get_clusters(
+    bbox: str,
+    zoom: int = Query(..., ge=0, le=22),
+    county: Optional[str] = None,
+    property_type: Optional[PropertyType] = None,
+    status: Optional[PropertyStatus] = None,
+    tier: Optional[int] = None,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get map marker clusters for a bounding box.
+    
+    Properties are aggregated per grid cell sized for the zoom level, so the
+    response grows with the number of cells on screen rather than the
+    number of properties.
+    """
+    min_lat, max_lat, min_lng, max_lng = parse_bbox(bbox)
+    cell_size = cluster_cell_degrees(zoom)
+    
+    cell_y = _grid_index(db, Property.latitude + 90, cell_size).label("cell_y")
+    cell_x = _grid_index(db, Property.longitude + 180, cell_size).label("cell_x")
+    count = func.count(Property.id)
     
-    # Order by score descending (highest priority first)
-    query = query.order_by(Property.score.desc())
+    query = db.query(
+        count.label("count"),
+        func.avg(Property.latitude).label("latitude"),
+        func.avg(Property.longitude).label("longitude"),
+        func.max(Property.score).label("max_score"),
+        func.sum(case((Property.tier == 1, 1), else_=0)).label("tier_1"),
+        func.sum(case((Property.tier == 2, 1), else_=0)).label("tier_2"),
+        func.sum(case((Property.tier == 3, 1), else_=0)).label("tier_3"),
+        func.min(Property.id).label("first_id")
+    )
+    query = apply_property_filters(
+        query, county, property_type, status, tier, search,
+        min_lat, max_lat, min_lng, max_lng
+    )
+    rows = query.group_by(cell_y, cell_x).all()
     
-    return query.offset(skip).limit(limit).all()
+    clusters = [
+        {
+            "count": row.count,
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "max_score": row.max_score,
+            "tiers": {"1": row.tier_1 or 0, "2": row.tier_2 or 0, "3": row.tier_3 or 0},
+            "property_id": row.first_id if row.count == 1 else None
+        }
+        for row in rows
+    ]
+    
+    return {
+        "zoom": zoom,
+        "cell_size": cell_size,
+        "total": sum(c["count"] for c in clusters),
+        "clusters": clusters
+    }
 
 
 @router.get("/counties")
@@ -89,38 +302,7 @@ async def get_counties(db: Session = Depends(get_db)):
 @router.get("/stats")
 async def get_stats(db: Session = Depends(get_db)):
     """Get summary statistics for dashboard."""
-    from sqlalchemy import func
-    
-    total = db.query(func.count(Property.id)).scalar() or 0
-    
-    by_type = db.query(
-        Property.property_type,
-        func.count(Property.id)
-    ).group_by(Property.property_type).all()
-    
-    by_tier = db.query(
-        Property.tier,
-        func.count(Property.id)
-    ).group_by(Property.tier).all()
-    
-    by_status = db.query(
-        Property.status,
-        func.count(Property.id)
-    ).group_by(Property.status).all()
-    
-    total_units = db.query(func.sum(Property.units)).scalar() or 0
-    total_lots = db.query(func.sum(Property.lots)).scalar() or 0
-    avg_score = db.query(func.avg(Property.score)).scalar() or 0
-    
-    return {
-        "total_properties": total,
-        "by_type": {str(t[0].value) if t[0] else "Unknown": t[1] for t in by_type},
-        "by_tier": {str(t[0]) if t[0] else "Unknown": t[1] for t in by_tier},
-        "by_status": {str(t[0].value) if t[0] else "Unknown": t[1] for t in by_status},
-        "total_units": total_units,
-        "total_lots": total_lots,
-        "average_score": round(avg_score, 2) if avg_score else 0
-    }
+    return stats_cache.get(db)
 
 
 @router.get("/{property_id}", response_model=PropertyOut)
@@ -149,7 +331,7 @@ async def create_property(
     prop = recalculate_property_score(prop)
     
     db.add(prop)
-    db.commit()
+    commit_property(db)
     db.refresh(prop)
     return prop
 
@@ -166,15 +348,18 @@ async def update_property(
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
     
-    # Update only provided fields
+    # Update only provided fields, tracking which ones actually changed
     update_data = property_data.model_dump(exclude_unset=True)
+    changed_fields = set()
     for field, value in update_data.items():
+        if getattr(prop, field) != value:
+            changed_fields.add(field)
         setattr(prop, field, value)
     
-    # Recalculate score after update
-    prop = recalculate_property_score(prop)
+    # Rescore only the factors whose inputs changed
+    rescore_changed_factors(prop, changed_fields)
     
-    db.commit()
+    commit_property(db)
     db.refresh(prop)
     return prop
 
@@ -192,6 +377,7 @@ async def delete_property(
     
     db.delete(prop)
     db.commit()
+    stats_cache.invalidate()
     return {"message": "Property deleted"}
 
 
@@ -208,24 +394,49 @@ async def recalculate_score(
     
     prop = recalculate_property_score(prop)
     db.commit()
+    stats_cache.invalidate()
     db.refresh(prop)
     return prop
 
 
-@router.post("/recalculate-all")
+@router.post("/recalculate-all", response_model=ScoringJobOut, status_code=status.HTTP_202_ACCEPTED)
 async def recalculate_all_scores(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_analyst)
 ):
-    """Recalculate scores for all properties."""
-    properties = db.query(Property).all()
-    count = 0
-    for prop in properties:
-        recalculate_property_score(prop)
-        count += 1
+    """
+    Start a background job that recalculates scores for all properties.
     
+    Poll GET /properties/recalculate-all/{job_id} for progress.
+    """
+    job = ScoringJob(status="Pending", created_by_id=current_user.id)
+    db.add(job)
     db.commit()
-    return {"message": f"Recalculated scores for {count} properties"}
+    db.refresh(job)
+    
+    background_tasks.add_task(run_rescoring_job, job.id)
+    return job
+
+
+@router.post("/rescore-timing")
+def rescore_timing(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_analyst)
+):
+    """Rescore now the properties that crossed a timing threshold."""
+    count = rescore_due_timing(db)
+    stats_cache.invalidate()
+    return {"message": f"Rescored {count} properties with changed timing"}
+
+
+@router.get("/recalculate-all/{job_id}", response_model=ScoringJobOut)
+async def get_recalculate_job(job_id: int, db: Session = Depends(get_db)):
+    """Get progress of a bulk rescoring job."""
+    job = db.query(ScoringJob).filter(ScoringJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+    return job
 
 
 @router.get("/{property_id}/score-breakdown")
@@ -0,0 +1,72 @@
+"""Scoring weight API endpoints."""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..auth import require_admin
+from ..models.models import ScoringWeight, User, PropertyType
+from ..schemas import ScoringWeightCreate, ScoringWeightOut
+from ..scoring import weight_provider, FALLBACK_WEIGHTS
+
+router = APIRouter(prefix="/scoring-weights", tags=["Scoring"])
+
+
+@router.get("", response_model=List[ScoringWeightOut])
+async def list_weights(db: Session = Depends(get_db)):
+    """List all configured scoring weights."""
+    return db.query(ScoringWeight).order_by(
+        ScoringWeight.property_type, ScoringWeight.factor_name
+    ).all()
+
+
+@router.get("/active")
+async def get_active_weights():
+    """Get the weights currently used for scoring, with the cache version."""
+    return {
+        "version": weight_provider.version,
+        "weights": {
+            prop_type.value: dict(weights)
+            for prop_type, weights in weight_provider.snapshot().items()
+        }
+    }
+
+
+@router.put("", response_model=ScoringWeightOut)
+async def set_weight(
+    weight_data: ScoringWeightCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Create or update the weight of a scoring factor.
+    
+    Takes effect for all new scoring immediately; stored scores are not
+    changed until they are recalculated.
+    """
+    if weight_data.factor_name not in FALLBACK_WEIGHTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown factor. Allowed: {', '.join(FALLBACK_WEIGHTS)}"
+        )
+    if weight_data.weight < 0:
+        raise HTTPException(status_code=400, detail="Weight must not be negative")
+    
+    prop_type = PropertyType(weight_data.property_type.value)
+    weight = db.query(ScoringWeight).filter(
+        ScoringWeight.property_type == prop_type,
+        ScoringWeight.factor_name == weight_data.factor_name
+    ).first()
+    if not weight:
+        weight = ScoringWeight(property_type=prop_type, factor_name=weight_data.factor_name)
+        db.add(weight)
+    
+    weight.weight = weight_data.weight
+    weight.is_active = weight_data.is_active
+    weight.updated_by_id = current_user.id
+    db.commit()
+    db.refresh(weight)
+    
+    # Weights changed - reload the in-process cache
+    weight_provider.load(db)
+    return weight
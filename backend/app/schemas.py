@@ -1,5 +1,5 @@
 """Pydantic schemas for API request/response validation."""
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional, List, Any
 from datetime import datetime
 from enum import Enum
@@ -226,6 +226,11 @@ class PropertyUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+def unscored_as_zero(score: Optional[float]) -> float:
+    """Report a property that was never scored with score 0."""
+    return 0 if score is None else score
+
+
 class PropertyOut(PropertyBase):
     id: int
     score: float = 0
@@ -235,6 +240,8 @@ class PropertyOut(PropertyBase):
     created_at: datetime
     updated_at: datetime
     
+    _unscored = field_validator("score", mode="before")(unscored_as_zero)
+    
     class Config:
         from_attributes = True
 
@@ -253,6 +260,8 @@ class PropertyListOut(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     
+    _unscored = field_validator("score", mode="before")(unscored_as_zero)
+    
     class Config:
         from_attributes = True
 
@@ -308,6 +317,7 @@ class DocumentOut(DocumentBase):
     original_filename: Optional[str] = None
     file_type: Optional[str] = None
     file_size: Optional[int] = None
+    content_hash: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -322,11 +332,17 @@ class ImportJobOut(BaseModel):
     import_type: Optional[str] = None
     status: str
     total_rows: Optional[int] = None
+    processed_count: int = 0
     imported_count: int = 0
     updated_count: int = 0
+    unchanged_count: int = 0
     skipped_count: int = 0
     error_count: int = 0
     errors: Optional[List[dict]] = None
+    column_mapping: Optional[dict] = None
+    unmapped_columns: Optional[List[str]] = None
+    sheets: Optional[List[str]] = None
+    sheet_counts: Optional[dict] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
     
@@ -334,6 +350,23 @@ class ImportJobOut(BaseModel):
         from_attributes = True
 
 
+class ImportDryRunOut(BaseModel):
+    """What importing a file would do, without writing anything."""
+    filename: str
+    import_type: str
+    dry_run: bool = True
+    total_rows: int = 0
+    imported_count: int = 0
+    updated_count: int = 0
+    unchanged_count: int = 0
+    skipped_count: int = 0
+    error_count: int = 0
+    errors: List[dict] = []
+    column_mapping: dict = {}
+    unmapped_columns: List[str] = []
+    sheet_counts: Optional[dict] = None
+
+
 # ============ Scoring Schemas ============
 
 class ScoreBreakdown(BaseModel):
@@ -351,6 +384,20 @@ class ScoreOut(BaseModel):
     calculated_at: datetime
 
 
+class ScoringJobOut(BaseModel):
+    id: int
+    status: str
+    total_rows: Optional[int] = None
+    processed_count: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
 class ScoringWeightBase(BaseModel):
     property_type: PropertyType
     factor_name: str
@@ -386,6 +433,22 @@ class PropertyFilter(BaseModel):
     search: Optional[str] = None
 
 
+class PropertyCluster(BaseModel):
+    count: int
+    latitude: float
+    longitude: float
+    max_score: Optional[float] = None
+    tiers: dict
+    property_id: Optional[int] = None  # Set when the cluster is a single property
+
+
+class ClusterResponse(BaseModel):
+    zoom: int
+    cell_size: float
+    total: int
+    clusters: List[PropertyCluster]
+
+
 class BoundingBox(BaseModel):
     min_lat: float
     min_lng: float
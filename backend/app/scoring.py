@@ -5,8 +5,11 @@ Provides transparent, weighted scoring for MDU and Subdivision properties
 to prioritize fiber expansion opportunities.
 """
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
-from .models.models import Property, PropertyType
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Sequence, Tuple, Union
+import threading
+import numpy as np
+from .models.models import Property, PropertyType, ScoringWeight
 
 
 # Default scoring weights by property type
@@ -34,6 +37,90 @@ DEFAULT_WEIGHTS = {
 }
 
 
+# Fallback weight for each factor when a weights dict omits it
+FALLBACK_WEIGHTS = {
+    "scale": 0.25,
+    "fiber": 0.20,
+    "competitors": 0.15,
+    "income": 0.10,
+    "density": 0.10,
+    "erate": 0.10,
+    "timing": 0.05,
+    "relationship": 0.05,
+    "hoa_readiness": 0.05
+}
+
+# Weight key used by each breakdown factor
+FACTOR_WEIGHT_KEYS = {
+    "scale": "scale",
+    "fiber_proximity": "fiber",
+    "competitors": "competitors",
+    "income": "income",
+    "density": "density",
+    "erate_anchors": "erate",
+    "timing": "timing",
+    "relationship": "relationship",
+    "hoa_readiness": "hoa_readiness"
+}
+
+
+class WeightProvider:
+    """
+    In-process cache of the active scoring weights.
+    
+    Active ScoringWeight rows are loaded once into an immutable map per
+    property type and stamped with a version. Scoring reads the cached map
+    without touching the database; the cache is only reloaded when weights
+    change. Property types without active rows use DEFAULT_WEIGHTS, as does
+    everything until the first load.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._weights = self._freeze({})
+        self.version = 0
+    
+    @staticmethod
+    def _freeze(loaded: Dict[PropertyType, Dict[str, float]]) -> Mapping:
+        weights = {}
+        for prop_type in PropertyType:
+            # Active rows override single factors; the rest keep the type defaults
+            factors = {**DEFAULT_WEIGHTS[prop_type], **loaded.get(prop_type, {})}
+            weights[prop_type] = MappingProxyType(factors)
+        return MappingProxyType(weights)
+    
+    def load(self, db) -> int:
+        """
+        Reload active weights from the database.
+        
+        Returns:
+            The new cache version
+        """
+        rows = db.query(ScoringWeight).filter(ScoringWeight.is_active == True).all()  # noqa: E712
+        loaded: Dict[PropertyType, Dict[str, float]] = {}
+        for row in rows:
+            loaded.setdefault(PropertyType(row.property_type), {})[row.factor_name] = row.weight
+        
+        with self._lock:
+            self._weights = self._freeze(loaded)
+            self.version += 1
+            return self.version
+    
+    def get(self, prop_type: Optional[PropertyType]) -> Mapping[str, float]:
+        """Get the active weights for a property type."""
+        weights = self._weights
+        if prop_type in weights:
+            return weights[prop_type]
+        return weights[PropertyType.MDU]
+    
+    def snapshot(self) -> Mapping[PropertyType, Mapping[str, float]]:
+        """Get the full weight map, for consistent use across a batch job."""
+        return self._weights
+
+
+weight_provider = WeightProvider()
+
+
 # Minimum score for unknown values - used when property data is incomplete
 # This provides a baseline score that doesn't heavily penalize missing data
 # while still encouraging complete property information
@@ -143,12 +230,15 @@ def calculate_erate_points(schools: int, libraries: int) -> float:
     return 30
 
 
-def calculate_timing_points(break_ground_date: Optional[datetime]) -> float:
+def calculate_timing_points(
+    break_ground_date: Optional[datetime],
+    now: Optional[datetime] = None
+) -> float:
     """Calculate timing points based on days until break ground."""
     if not break_ground_date:
         return 40  # Default if unknown
     
-    days_away = (break_ground_date - datetime.now()).days
+    days_away = (break_ground_date - (now or datetime.now())).days
     
     if days_away < 0:
         return 50  # Already started
@@ -183,6 +273,33 @@ def calculate_hoa_readiness_points(has_hoa: bool, has_contact: bool) -> float:
     return 40
 
 
+# Days before break ground at which timing points change (see
+# calculate_timing_points); 0 is the start date itself
+TIMING_THRESHOLD_DAYS = (730, 365, 180, 0)
+
+
+def next_timing_change(
+    break_ground_date: Optional[datetime],
+    now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """
+    Get the next time the timing points of a property will change.
+    
+    Timing points step down as whole days until break ground fall to 730,
+    365 and 180, and change again once the date has passed. Returns None
+    when no further change is coming.
+    """
+    if not break_ground_date:
+        return None
+    now = now or datetime.now()
+    for days in TIMING_THRESHOLD_DAYS:
+        # (date - t).days drops to `days` as soon as t passes this instant
+        crossing = break_ground_date - timedelta(days=days + 1) if days else break_ground_date
+        if crossing >= now:
+            return crossing
+    return None
+
+
 def determine_tier(score: float) -> int:
     """Determine tier based on total score."""
     if score >= 75:
@@ -192,12 +309,154 @@ def determine_tier(score: float) -> int:
     return 3
 
 
+# Model columns that feed each breakdown factor
+FACTOR_INPUTS = {
+    "scale": ("property_type", "units", "lots"),
+    "fiber_proximity": ("fiber_distance_gvtc", "fiber_distance_lease"),
+    "competitors": ("competitor_count",),
+    "income": ("median_income",),
+    "density": ("population_density",),
+    "erate_anchors": ("nearby_schools", "nearby_libraries"),
+    "timing": ("break_ground_date",),
+    "relationship": (),
+    "hoa_readiness": (),
+}
+
+# Every model column that can change a property's score
+SCORE_INPUT_COLUMNS = frozenset(
+    column for columns in FACTOR_INPUTS.values() for column in columns
+)
+
+
+def factor_names(prop_type: PropertyType) -> List[str]:
+    """Get the breakdown factors, in scoring order, for a property type."""
+    last_factor = "relationship" if prop_type == PropertyType.MDU else "hoa_readiness"
+    return [
+        "scale", "fiber_proximity", "competitors", "income",
+        "density", "erate_anchors", "timing", last_factor
+    ]
+
+
+def factors_affected_by(changed_columns) -> set:
+    """Get the factors whose inputs include any of the changed columns."""
+    changed = set(changed_columns)
+    return {
+        factor for factor, inputs in FACTOR_INPUTS.items()
+        if changed.intersection(inputs)
+    }
+
+
+def resolve_weights(
+    prop_type: PropertyType,
+    weights: Optional[Dict[str, float]] = None
+) -> Dict[str, float]:
+    """Get the weights to score a property type with."""
+    if weights is not None:
+        return weights
+    return weight_provider.get(prop_type)
+
+
+def _factor_weight(factor: str, weights: Dict[str, float]) -> float:
+    """Get the weight applied to a breakdown factor."""
+    weight_key = FACTOR_WEIGHT_KEYS[factor]
+    return weights.get(weight_key, FALLBACK_WEIGHTS[weight_key])
+
+
+def score_factor(
+    factor: str,
+    prop: Property,
+    weights: Dict[str, float],
+    now: datetime,
+    relationship_strength: float = 3.0,
+    has_hoa: bool = False,
+    has_hoa_contact: bool = False
+) -> Tuple[float, Dict[str, Any]]:
+    """
+    Score a single factor for a property.
+    
+    Returns:
+        Tuple of the unrounded weighted points and the breakdown entry.
+    """
+    if factor not in FACTOR_WEIGHT_KEYS:
+        raise ValueError(f"Unknown scoring factor: {factor}")
+    weight = _factor_weight(factor, weights)
+    
+    if factor == "scale":
+        # Units for MDU, Lots for SFU
+        if prop.property_type == PropertyType.MDU:
+            raw_value = prop.units
+            points = calculate_scale_points_mdu(prop.units)
+            unit = "units"
+        else:
+            raw_value = prop.lots
+            points = calculate_scale_points_sfu(prop.lots)
+            unit = "lots"
+    
+    elif factor == "fiber_proximity":
+        best_fiber_distance = min(
+            prop.fiber_distance_gvtc or float('inf'),
+            prop.fiber_distance_lease or float('inf')
+        )
+        if best_fiber_distance == float('inf'):
+            best_fiber_distance = None
+        raw_value = best_fiber_distance
+        points = calculate_fiber_proximity_points(best_fiber_distance)
+        unit = "miles"
+    
+    elif factor == "competitors":
+        raw_value = prop.competitor_count
+        points = calculate_competitor_points(prop.competitor_count)
+        unit = "count"
+    
+    elif factor == "income":
+        raw_value = prop.median_income
+        points = calculate_income_points(prop.median_income)
+        unit = "dollars"
+    
+    elif factor == "density":
+        raw_value = prop.population_density
+        points = calculate_density_points(prop.population_density)
+        unit = "per_sq_mi"
+    
+    elif factor == "erate_anchors":
+        raw_value = (prop.nearby_schools or 0) + (prop.nearby_libraries or 0)
+        points = calculate_erate_points(prop.nearby_schools, prop.nearby_libraries)
+        unit = "count"
+    
+    elif factor == "timing":
+        raw_value = None
+        if prop.break_ground_date:
+            raw_value = (prop.break_ground_date - now).days
+        points = calculate_timing_points(prop.break_ground_date, now)
+        unit = "days"
+    
+    elif factor == "relationship":
+        raw_value = relationship_strength
+        points = calculate_relationship_points(relationship_strength)
+        unit = "strength"
+    
+    else:
+        raw_value = {"has_hoa": has_hoa, "has_contact": has_hoa_contact}
+        points = calculate_hoa_readiness_points(has_hoa, has_hoa_contact)
+        unit = "readiness"
+    
+    weighted = points * weight
+    return weighted, {
+        "factor": factor,
+        "raw_value": raw_value,
+        "weight": weight,
+        "points": round(weighted, 2),
+        "unit": unit
+    }
+
+
 def calculate_score(
     prop: Property,
     weights: Optional[Dict[str, float]] = None,
     relationship_strength: float = 3.0,
     has_hoa: bool = False,
-    has_hoa_contact: bool = False
+    has_hoa_contact: bool = False,
+    now: Optional[datetime] = None
 ) -> Dict[str, Any]:
     """
     Calculate comprehensive score for a property.
@@ -205,150 +464,21 @@ def calculate_score(
     Returns:
         Dict containing total_score, tier, and breakdown of each factor.
     """
-    # Get appropriate weights
-    prop_type = prop.property_type
-    if weights is None:
-        weights = DEFAULT_WEIGHTS.get(prop_type, DEFAULT_WEIGHTS[PropertyType.MDU])
+    if now is None:
+        now = datetime.now()
+    
+    weights = resolve_weights(prop.property_type, weights)
     
     breakdown = []
     total_weighted_score = 0
     
-    # Scale points (Units for MDU, Lots for SFU)
-    if prop_type == PropertyType.MDU:
-        scale_raw = prop.units
-        scale_points = calculate_scale_points_mdu(prop.units)
-        scale_unit = "units"
-    else:
-        scale_raw = prop.lots
-        scale_points = calculate_scale_points_sfu(prop.lots)
-        scale_unit = "lots"
-    
-    scale_weight = weights.get("scale", 0.25)
-    scale_weighted = scale_points * scale_weight
-    total_weighted_score += scale_weighted
-    breakdown.append({
-        "factor": "scale",
-        "raw_value": scale_raw,
-        "weight": scale_weight,
-        "points": round(scale_weighted, 2),
-        "unit": scale_unit
-    })
-    
-    # Fiber proximity
-    best_fiber_distance = min(
-        prop.fiber_distance_gvtc or float('inf'),
-        prop.fiber_distance_lease or float('inf')
-    )
-    if best_fiber_distance == float('inf'):
-        best_fiber_distance = None
-    
-    fiber_points = calculate_fiber_proximity_points(best_fiber_distance)
-    fiber_weight = weights.get("fiber", 0.20)
-    fiber_weighted = fiber_points * fiber_weight
-    total_weighted_score += fiber_weighted
-    breakdown.append({
-        "factor": "fiber_proximity",
-        "raw_value": best_fiber_distance,
-        "weight": fiber_weight,
-        "points": round(fiber_weighted, 2),
-        "unit": "miles"
-    })
-    
-    # Competitors
-    competitor_points = calculate_competitor_points(prop.competitor_count)
-    competitor_weight = weights.get("competitors", 0.15)
-    competitor_weighted = competitor_points * competitor_weight
-    total_weighted_score += competitor_weighted
-    breakdown.append({
-        "factor": "competitors",
-        "raw_value": prop.competitor_count,
-        "weight": competitor_weight,
-        "points": round(competitor_weighted, 2),
-        "unit": "count"
-    })
-    
-    # Income
-    income_points = calculate_income_points(prop.median_income)
-    income_weight = weights.get("income", 0.10)
-    income_weighted = income_points * income_weight
-    total_weighted_score += income_weighted
-    breakdown.append({
-        "factor": "income",
-        "raw_value": prop.median_income,
-        "weight": income_weight,
-        "points": round(income_weighted, 2),
-        "unit": "dollars"
-    })
-    
-    # Density
-    density_points = calculate_density_points(prop.population_density)
-    density_weight = weights.get("density", 0.10)
-    density_weighted = density_points * density_weight
-    total_weighted_score += density_weighted
-    breakdown.append({
-        "factor": "density",
-        "raw_value": prop.population_density,
-        "weight": density_weight,
-        "points": round(density_weighted, 2),
-        "unit": "per_sq_mi"
-    })
-    
-    # E-Rate anchors
-    erate_points = calculate_erate_points(prop.nearby_schools, prop.nearby_libraries)
-    erate_weight = weights.get("erate", 0.10)
-    erate_weighted = erate_points * erate_weight
-    total_weighted_score += erate_weighted
-    breakdown.append({
-        "factor": "erate_anchors",
-        "raw_value": (prop.nearby_schools or 0) + (prop.nearby_libraries or 0),
-        "weight": erate_weight,
-        "points": round(erate_weighted, 2),
-        "unit": "count"
-    })
-    
-    # Timing
-    timing_points = calculate_timing_points(prop.break_ground_date)
-    timing_weight = weights.get("timing", 0.05)
-    timing_weighted = timing_points * timing_weight
-    total_weighted_score += timing_weighted
-    
-    days_away = None
-    if prop.break_ground_date:
-        days_away = (prop.break_ground_date - datetime.now()).days
-    
-    breakdown.append({
-        "factor": "timing",
-        "raw_value": days_away,
-        "weight": timing_weight,
-        "points": round(timing_weighted, 2),
-        "unit": "days"
-    })
-    
-    # Relationship or HOA readiness (depending on type)
-    if prop_type == PropertyType.MDU:
-        rel_points = calculate_relationship_points(relationship_strength)
-        rel_weight = weights.get("relationship", 0.05)
-        rel_weighted = rel_points * rel_weight
-        total_weighted_score += rel_weighted
-        breakdown.append({
-            "factor": "relationship",
-            "raw_value": relationship_strength,
-            "weight": rel_weight,
-            "points": round(rel_weighted, 2),
-            "unit": "strength"
-        })
-    else:
-        hoa_points = calculate_hoa_readiness_points(has_hoa, has_hoa_contact)
-        hoa_weight = weights.get("hoa_readiness", 0.05)
-        hoa_weighted = hoa_points * hoa_weight
-        total_weighted_score += hoa_weighted
-        breakdown.append({
-            "factor": "hoa_readiness",
-            "raw_value": {"has_hoa": has_hoa, "has_contact": has_hoa_contact},
-            "weight": hoa_weight,
-            "points": round(hoa_weighted, 2),
-            "unit": "readiness"
-        })
+    for factor in factor_names(prop.property_type):
+        weighted, entry = score_factor(
+            factor, prop, weights, now,
+            relationship_strength, has_hoa, has_hoa_contact
+        )
+        total_weighted_score += weighted
+        breakdown.append(entry)
     
     # Calculate final score (0-100)
     final_score = round(min(total_weighted_score, 100), 2)
@@ -358,7 +488,7 @@ def calculate_score(
         "total_score": final_score,
         "tier": tier,
         "breakdown": breakdown,
-        "calculated_at": datetime.now().isoformat()
+        "calculated_at": now.isoformat()
     }
 
 
@@ -372,9 +502,418 @@ def recalculate_property_score(prop: Property) -> Property:
     Returns:
         Updated property with new score
     """
-    score_result = calculate_score(prop)
+    now = datetime.now()
+    score_result = calculate_score(prop, now=now)
     prop.score = score_result["total_score"]
     prop.tier = score_result["tier"]
     prop.score_breakdown = score_result["breakdown"]
-    prop.last_scored_at = datetime.now()
+    prop.last_scored_at = now
+    prop.timing_rescore_at = next_timing_change(prop.break_ground_date, now)
     return prop
+
+
+def rescore_changed_factors(prop: Property, changed_columns) -> bool:
+    """
+    Update a property's score after some of its columns changed.
+    
+    Only the factors fed by the changed columns are recomputed; the other
+    entries of the stored breakdown are reused as-is. Falls back to a full
+    recalculation when the stored breakdown cannot be reused (missing,
+    different factor set, or scored with different weights).
+    
+    Args:
+        prop: Property model instance, already holding the new values
+        changed_columns: Names of the model columns that changed
+        
+    Returns:
+        True if the score was updated, False if nothing score-relevant changed
+    """
+    changed_columns = set(changed_columns)
+    dirty = factors_affected_by(changed_columns)
+    if not dirty:
+        return False
+    
+    weights = resolve_weights(prop.property_type)
+    breakdown = prop.score_breakdown or []
+    expected_factors = factor_names(prop.property_type)
+    
+    # Stored points are rounded to cents, which is exact only for weights
+    # expressed in hundredths (all factor points are multiples of 5)
+    reusable = (
+        "property_type" not in changed_columns
+        and [entry.get("factor") for entry in breakdown] == expected_factors
+        and all(
+            entry.get("weight") == _factor_weight(entry["factor"], weights)
+            and round(entry["weight"], 2) == entry["weight"]
+            for entry in breakdown
+        )
+    )
+    if not reusable:
+        recalculate_property_score(prop)
+        return True
+    
+    now = datetime.now()
+    new_breakdown = []
+    total_weighted_score = 0
+    for entry in breakdown:
+        if entry["factor"] in dirty:
+            weighted, entry = score_factor(entry["factor"], prop, weights, now)
+        else:
+            weighted = entry["points"]
+        total_weighted_score += weighted
+        new_breakdown.append(entry)
+    
+    prop.score = round(min(total_weighted_score, 100), 2)
+    prop.tier = determine_tier(prop.score)
+    prop.score_breakdown = new_breakdown
+    prop.last_scored_at = now
+    if "timing" in dirty:
+        prop.timing_rescore_at = next_timing_change(prop.break_ground_date, now)
+    return True
+
+
+# ============ Batch Scoring ============
+
+# Model columns read by the batch scorer
+BATCH_SCORING_COLUMNS = (
+    "property_type",
+    "units",
+    "lots",
+    "fiber_distance_gvtc",
+    "fiber_distance_lease",
+    "competitor_count",
+    "median_income",
+    "population_density",
+    "nearby_schools",
+    "nearby_libraries",
+    "break_ground_date",
+)
+
+# Threshold tables for the batch scorer: (thresholds, points).
+# These mirror the calculate_*_points functions above - keep them in sync.
+SCALE_MDU_TABLE = ([75, 150, 250, 400], [MIN_UNKNOWN_SCORE, 55, 70, 85, 100])
+SCALE_SFU_TABLE = ([150, 300, 600, 1000], [MIN_UNKNOWN_SCORE, 55, 70, 85, 100])
+FIBER_TABLE = ([0.25, 0.50, 1.00, 2.00], [100, 80, 60, 40, 20])
+INCOME_TABLE = ([45000, 65000, 85000, 110000], [25, 40, 60, 80, 100])
+DENSITY_TABLE = ([600, 1200, 2000, 3000], [25, 40, 60, 80, 100])
+TIMING_TABLE = ([180, 365, 730], [100, 70, 40, 20])
+RELATIONSHIP_TABLE = ([1.5, 2.5, 3.5, 4.5], [20, 40, 60, 80, 100])
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def _points_at_least(values: np.ndarray, table) -> np.ndarray:
+    """Look up points for tables where a higher value earns more points."""
+    thresholds, points = table
+    idx = np.searchsorted(thresholds, values, side="right")
+    return np.asarray(points, dtype=float)[idx]
+
+
+def _points_at_most(values: np.ndarray, table) -> np.ndarray:
+    """Look up points for tables where a lower value earns more points."""
+    thresholds, points = table
+    idx = np.searchsorted(thresholds, values, side="left")
+    return np.asarray(points, dtype=float)[idx]
+
+
+def _float_column(values: Sequence) -> np.ndarray:
+    """Convert a column to a float array with NaN for missing values."""
+    return np.array(values, dtype=float).reshape(-1)
+
+
+def _python_value(value: Any) -> Any:
+    """Convert NumPy scalars and NaN back to plain JSON-friendly values."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def _factor_weights(
+    weights: Optional[Dict[str, float]],
+    type_weights: Optional[Mapping[PropertyType, Mapping[str, float]]],
+    is_sfu: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Resolve the per-row weight of every factor."""
+    if type_weights is None:
+        type_weights = weight_provider.snapshot()
+    resolved = {}
+    for factor, fallback in FALLBACK_WEIGHTS.items():
+        if weights is not None:
+            weight = weights.get(factor, fallback)
+            resolved[factor] = np.full(is_sfu.shape, weight, dtype=float)
+        else:
+            resolved[factor] = np.where(
+                is_sfu,
+                type_weights[PropertyType.SUBDIVISION].get(factor, fallback),
+                type_weights[PropertyType.MDU].get(factor, fallback)
+            )
+    return resolved
+
+
+def property_columns(props: Sequence[Any]) -> Dict[str, List[Any]]:
+    """Extract the batch scoring columns from properties or result rows."""
+    return {
+        column: [getattr(p, column) for p in props]
+        for column in BATCH_SCORING_COLUMNS
+    }
+
+
+def calculate_scores_batch(
+    columns: Dict[str, Sequence],
+    weights: Optional[Dict[str, float]] = None,
+    type_weights: Optional[Mapping[PropertyType, Mapping[str, float]]] = None,
+    relationship_strength: Union[float, Sequence[float]] = 3.0,
+    has_hoa: Union[bool, Sequence[bool]] = False,
+    has_hoa_contact: Union[bool, Sequence[bool]] = False,
+    now: Optional[datetime] = None,
+    include_breakdown: bool = False
+) -> Dict[str, Any]:
+    """
+    Calculate scores for many properties at once.
+    
+    Produces exactly the same total_score and tier as calculate_score for
+    every row, but evaluates each factor over whole columns with NumPy.
+    
+    Args:
+        columns: Mapping of each name in BATCH_SCORING_COLUMNS to a
+            sequence of values (None for missing), one entry per property.
+        weights: Weights applied to every row. When omitted each row uses
+            the active weights for its property type.
+        type_weights: Per-type weight map to use instead of the current
+            weight_provider snapshot (see WeightProvider.snapshot).
+        relationship_strength: Scalar or per-row contact strength (MDU).
+        has_hoa: Scalar or per-row HOA flag (Subdivision).
+        has_hoa_contact: Scalar or per-row HOA contact flag (Subdivision).
+        now: Reference time for the timing factor.
+        include_breakdown: Also build the per-row breakdown lists.
+        
+    Returns:
+        Dict containing total_score and tier arrays, the weighted points of
+        each factor, each row's next_timing_change, and the breakdown lists
+        when requested.
+    """
+    if now is None:
+        now = datetime.now()
+    
+    # Compared element by element: NumPy would treat the str enum as a scalar
+    prop_types = list(columns["property_type"])
+    is_mdu = np.array([t == PropertyType.MDU for t in prop_types], dtype=bool)
+    is_sfu = np.array([t == PropertyType.SUBDIVISION for t in prop_types], dtype=bool)
+    factor_weights = _factor_weights(weights, type_weights, is_sfu)
+    
+    # Scale points (Units for MDU, Lots for SFU)
+    units = _float_column(columns["units"])
+    lots = _float_column(columns["lots"])
+    scale_points = np.where(
+        is_mdu,
+        _points_at_least(units, SCALE_MDU_TABLE),
+        _points_at_least(lots, SCALE_SFU_TABLE)
+    )
+    scale_raw = np.where(is_mdu, units, lots)
+    scale_points[np.isnan(scale_raw) | (scale_raw == 0)] = MIN_UNKNOWN_SCORE
+    
+    # Fiber proximity (zero distances are treated as unknown, as in calculate_score)
+    gvtc = _float_column(columns["fiber_distance_gvtc"])
+    lease = _float_column(columns["fiber_distance_lease"])
+    gvtc = np.where(np.isnan(gvtc) | (gvtc == 0), np.inf, gvtc)
+    lease = np.where(np.isnan(lease) | (lease == 0), np.inf, lease)
+    best_fiber = np.minimum(gvtc, lease)
+    fiber_unknown = np.isinf(best_fiber)
+    fiber_points = np.where(fiber_unknown, 40, _points_at_most(best_fiber, FIBER_TABLE))
+    
+    # Competitors
+    competitors = _float_column(columns["competitor_count"])
+    competitor_points = np.select(
+        [np.isnan(competitors), competitors == 0, competitors == 1, competitors == 2],
+        [50, 100, 80, 60],
+        30
+    ).astype(float)
+    
+    # Income and density
+    income = _float_column(columns["median_income"])
+    income_points = np.where(
+        np.isnan(income) | (income == 0), 50, _points_at_least(income, INCOME_TABLE)
+    )
+    density = _float_column(columns["population_density"])
+    density_points = np.where(
+        np.isnan(density) | (density == 0), 50, _points_at_least(density, DENSITY_TABLE)
+    )
+    
+    # E-Rate anchors
+    anchors = (
+        np.nan_to_num(_float_column(columns["nearby_schools"]))
+        + np.nan_to_num(_float_column(columns["nearby_libraries"]))
+    )
+    erate_points = np.select(
+        [anchors >= 3, anchors == 2, anchors == 1], [100, 80, 60], 30
+    ).astype(float)
+    
+    # Timing - whole days until break ground, floored like timedelta.days
+    break_ground = np.asarray(
+        columns["break_ground_date"], dtype="datetime64[us]"
+    ).reshape(-1)
+    timing_unknown = np.isnat(break_ground)
+    offsets = np.where(
+        timing_unknown, 0, (break_ground - np.datetime64(now, "us")).astype(np.int64)
+    )
+    days_away = offsets // _MICROSECONDS_PER_DAY
+    timing_points = np.select(
+        [timing_unknown, days_away < 0],
+        [40, 50],
+        _points_at_most(days_away, TIMING_TABLE)
+    ).astype(float)
+    
+    # Relationship (MDU) or HOA readiness (Subdivision)
+    strength = np.broadcast_to(
+        np.asarray(relationship_strength, dtype=float), is_mdu.shape
+    )
+    hoa = np.broadcast_to(np.asarray(has_hoa, dtype=bool), is_mdu.shape)
+    hoa_contact = np.broadcast_to(np.asarray(has_hoa_contact, dtype=bool), is_mdu.shape)
+    relationship_points = _points_at_least(strength, RELATIONSHIP_TABLE)
+    hoa_points = np.select([hoa & hoa_contact, hoa], [100, 70], 40).astype(float)
+    
+    # Weighted points, summed in the same order as calculate_score
+    weighted = {
+        "scale": scale_points * factor_weights["scale"],
+        "fiber_proximity": fiber_points * factor_weights["fiber"],
+        "competitors": competitor_points * factor_weights["competitors"],
+        "income": income_points * factor_weights["income"],
+        "density": density_points * factor_weights["density"],
+        "erate_anchors": erate_points * factor_weights["erate"],
+        "timing": timing_points * factor_weights["timing"],
+        "relationship": relationship_points * factor_weights["relationship"],
+        "hoa_readiness": hoa_points * factor_weights["hoa_readiness"],
+    }
+    last_weighted = np.where(is_mdu, weighted["relationship"], weighted["hoa_readiness"])
+    total = (
+        weighted["scale"]
+        + weighted["fiber_proximity"]
+        + weighted["competitors"]
+        + weighted["income"]
+        + weighted["density"]
+        + weighted["erate_anchors"]
+        + weighted["timing"]
+        + last_weighted
+    )
+    
+    # Next timing threshold crossing for each row (see next_timing_change)
+    crossings = break_ground[:, None] - np.array(
+        [np.timedelta64(days + 1 if days else 0, "D") for days in TIMING_THRESHOLD_DAYS]
+    )[None, :]
+    upcoming = crossings >= np.datetime64(now, "us")
+    has_crossing = upcoming.any(axis=1) & ~timing_unknown
+    next_crossing = crossings[np.arange(len(crossings)), upcoming.argmax(axis=1)]
+    next_crossing = np.where(has_crossing, next_crossing, np.datetime64("NaT"))
+    
+    # Python's round() is used so results match calculate_score bit for bit
+    capped = np.minimum(total, 100).tolist()
+    total_score = np.array([round(value, 2) for value in capped], dtype=float)
+    tier = np.select([total_score >= 75, total_score >= 50], [1, 2], 3)
+    
+    result = {
+        "total_score": total_score,
+        "tier": tier,
+        "weighted": weighted,
+        "next_timing_change": [
+            None if np.isnat(value) else value.astype(datetime)
+            for value in next_crossing
+        ],
+        "calculated_at": now.isoformat()
+    }
+    
+    if include_breakdown:
+        result["breakdown"] = _build_batch_breakdowns(
+            columns, is_mdu, factor_weights, weighted,
+            best_fiber, fiber_unknown, anchors, days_away, timing_unknown,
+            strength, hoa, hoa_contact
+        )
+    
+    return result
+
+
+def _build_batch_breakdowns(
+    columns, is_mdu, factor_weights, weighted,
+    best_fiber, fiber_unknown, anchors, days_away, timing_unknown,
+    strength, hoa, hoa_contact
+) -> List[List[Dict[str, Any]]]:
+    """Assemble calculate_score-compatible breakdown lists from batch arrays."""
+    rounded = {
+        factor: [round(value, 2) for value in values.tolist()]
+        for factor, values in weighted.items()
+    }
+    weight_lists = {factor: values.tolist() for factor, values in factor_weights.items()}
+    
+    breakdowns = []
+    for i, mdu in enumerate(is_mdu.tolist()):
+        breakdown = [
+            {
+                "factor": "scale",
+                "raw_value": _python_value(columns["units"][i] if mdu else columns["lots"][i]),
+                "weight": weight_lists["scale"][i],
+                "points": rounded["scale"][i],
+                "unit": "units" if mdu else "lots"
+            },
+            {
+                "factor": "fiber_proximity",
+                "raw_value": None if fiber_unknown[i] else float(best_fiber[i]),
+                "weight": weight_lists["fiber"][i],
+                "points": rounded["fiber_proximity"][i],
+                "unit": "miles"
+            },
+            {
+                "factor": "competitors",
+                "raw_value": _python_value(columns["competitor_count"][i]),
+                "weight": weight_lists["competitors"][i],
+                "points": rounded["competitors"][i],
+                "unit": "count"
+            },
+            {
+                "factor": "income",
+                "raw_value": _python_value(columns["median_income"][i]),
+                "weight": weight_lists["income"][i],
+                "points": rounded["income"][i],
+                "unit": "dollars"
+            },
+            {
+                "factor": "density",
+                "raw_value": _python_value(columns["population_density"][i]),
+                "weight": weight_lists["density"][i],
+                "points": rounded["density"][i],
+                "unit": "per_sq_mi"
+            },
+            {
+                "factor": "erate_anchors",
+                "raw_value": int(anchors[i]),
+                "weight": weight_lists["erate"][i],
+                "points": rounded["erate_anchors"][i],
+                "unit": "count"
+            },
+            {
+                "factor": "timing",
+                "raw_value": None if timing_unknown[i] else int(days_away[i]),
+                "weight": weight_lists["timing"][i],
+                "points": rounded["timing"][i],
+                "unit": "days"
+            },
+        ]
+        if mdu:
+            breakdown.append({
+                "factor": "relationship",
+                "raw_value": float(strength[i]),
+                "weight": weight_lists["relationship"][i],
+                "points": rounded["relationship"][i],
+                "unit": "strength"
+            })
+        else:
+            breakdown.append({
+                "factor": "hoa_readiness",
+                "raw_value": {"has_hoa": bool(hoa[i]), "has_contact": bool(hoa_contact[i])},
+                "weight": weight_lists["hoa_readiness"][i],
+                "points": rounded["hoa_readiness"][i],
+                "unit": "readiness"
+            })
+        breakdowns.append(breakdown)
+    
+    return breakdowns
@@ -0,0 +1,111 @@
+"""
+Dashboard statistics for the Fiber Expansion Platform.
+
+All summary figures come from one grouped query and are kept in an
+in-process cache. Writes that change properties invalidate the cache, and a
+TTL bounds staleness from writers in other processes.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .models.models import Property
+
+
+def compute_property_stats(db: Session) -> Dict[str, Any]:
+    """
+    Compute dashboard statistics with a single grouped query.
+
+    Rows are grouped by (type, tier, status), so the result set is bounded
+    by the number of combinations, not the number of properties. Totals
+    and per-dimension counts are folded from those groups.
+    """
+    groups = db.query(
+        Property.property_type,
+        Property.tier,
+        Property.status,
+        func.count(Property.id),
+        func.sum(Property.units),
+        func.sum(Property.lots),
+        func.sum(Property.score),
+        func.count(Property.score)
+    ).group_by(Property.property_type, Property.tier, Property.status).all()
+
+    total = 0
+    total_units = 0
+    total_lots = 0
+    score_sum = 0.0
+    scored = 0
+    by_type: Dict[str, int] = {}
+    by_tier: Dict[str, int] = {}
+    by_status: Dict[str, int] = {}
+
+    for prop_type, tier, status, count, units, lots, score_total, score_count in groups:
+        total += count
+        total_units += units or 0
+        total_lots += lots or 0
+        score_sum += score_total or 0
+        scored += score_count
+
+        type_key = str(prop_type.value) if prop_type else "Unknown"
+        tier_key = str(tier) if tier else "Unknown"
+        status_key = str(status.value) if status else "Unknown"
+        by_type[type_key] = by_type.get(type_key, 0) + count
+        by_tier[tier_key] = by_tier.get(tier_key, 0) + count
+        by_status[status_key] = by_status.get(status_key, 0) + count
+
+    avg_score = score_sum / scored if scored else 0
+
+    return {
+        "total_properties": total,
+        "by_type": by_type,
+        "by_tier": by_tier,
+        "by_status": by_status,
+        "total_units": total_units,
+        "total_lots": total_lots,
+        "average_score": round(avg_score, 2) if avg_score else 0
+    }
+
+
+class StatsCache:
+    """
+    TTL cache for dashboard statistics.
+
+    invalidate() bumps a generation counter, so a computation that started
+    before an invalidation is never stored as fresh.
+    """
+
+    def __init__(self, ttl_seconds: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._value: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        """Get cached statistics, recomputing them when stale."""
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+            generation = self._generation
+
+        value = compute_property_stats(db)
+
+        with self._lock:
+            if generation == self._generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl_seconds
+        return value
+
+    def invalidate(self) -> None:
+        """Drop cached statistics after properties change."""
+        with self._lock:
+            self._value = None
+            self._generation += 1
+
+
+stats_cache = StatsCache(get_settings().stats_cache_ttl_seconds)
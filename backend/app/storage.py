@@ -0,0 +1,125 @@
+"""
+Content-addressed document storage for the Fiber Expansion Platform.
+
+Uploaded files are stored once per distinct content, as blobs named by
+their SHA-256 under <upload_directory>/blobs/<aa>/<bb>/<sha256>. Documents
+reference a blob by its hash and each blob counts its references, so the
+same plat attached to many phases takes the disk space of one file, and
+the file is removed only when its last document is deleted.
+
+Reference counts change with single UPDATE statements in the caller's
+transaction; a blob row that reaches zero is deleted with its file before
+that transaction commits, so a concurrent upload of the same content
+either sees the row (and keeps it alive) or stores the file afresh.
+"""
+import os
+import re
+import tempfile
+from typing import BinaryIO, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .models.models import DocumentBlob
+from .uploads import copy_upload
+
+settings = get_settings()
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def blob_directory() -> str:
+    return os.path.join(settings.upload_directory, "blobs")
+
+
+def blob_path(content_hash: str) -> str:
+    """Get the storage path of a blob, fanned out by its first hash bytes."""
+    return os.path.join(blob_directory(), content_hash[:2], content_hash[2:4], content_hash)
+
+
+def stage_upload(fileobj: BinaryIO, max_size: int) -> Tuple[str, int, str]:
+    """
+    Copy an upload into the staging area beside the blobs.
+
+    Staged files are on the same filesystem as the blobs, so storing one
+    is a rename. Blocking; call it from a worker thread.
+
+    Returns:
+        (staged path, size in bytes, SHA-256 hex digest)
+    """
+    staging = os.path.join(blob_directory(), "staging")
+    os.makedirs(staging, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=staging)
+    os.close(fd)
+    size, content_hash = copy_upload(fileobj, path, max_size)
+    return path, size, content_hash
+
+
+def add_reference(db: Session, content_hash: str) -> Optional[DocumentBlob]:
+    """Count one more document using a stored blob; None if it is not stored."""
+    counted = db.execute(
+        update(DocumentBlob)
+        .where(DocumentBlob.content_hash == content_hash)
+        .values(ref_count=DocumentBlob.ref_count + 1)
+    ).rowcount
+    if not counted:
+        return None
+    return db.get(DocumentBlob, content_hash)
+
+
+def store_blob(db: Session, staged_path: str, size: int, content_hash: str) -> DocumentBlob:
+    """
+    Reference the blob for a staged upload, storing it if it is new.
+
+    A duplicate of stored content only gains a reference and its staged
+    copy is discarded. Call it before adding anything else to the session
+    (a concurrent insert of the same blob rolls it back); the caller commits.
+    """
+    try:
+        blob = add_reference(db, content_hash)
+        if blob is not None:
+            return blob
+
+        path = blob_path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(staged_path, path)
+        blob = DocumentBlob(content_hash=content_hash, size=size, file_path=path, ref_count=1)
+        db.add(blob)
+        try:
+            db.flush()
+        except IntegrityError:
+            # Another upload stored the same content first; the file we
+            # moved into place is byte-for-byte the one it stored
+            db.rollback()
+            return add_reference(db, content_hash)
+        return blob
+    finally:
+        if os.path.exists(staged_path):
+            os.remove(staged_path)
+
+
+def release_blob(db: Session, content_hash: str) -> bool:
+    """
+    Drop one document's reference to a blob, deleting it with the last one.
+
+    The caller commits.
+
+    Returns:
+        Whether the blob was deleted
+    """
+    db.execute(
+        update(DocumentBlob)
+        .where(DocumentBlob.content_hash == content_hash)
+        .values(ref_count=DocumentBlob.ref_count - 1)
+    )
+    deleted = db.execute(
+        delete(DocumentBlob)
+        .where(DocumentBlob.content_hash == content_hash, DocumentBlob.ref_count <= 0)
+    ).rowcount
+    if deleted:
+        path = blob_path(content_hash)
+        if os.path.exists(path):
+            os.remove(path)
+    return bool(deleted)
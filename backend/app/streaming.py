@@ -0,0 +1,48 @@
+"""
+Helpers for streaming generated files in HTTP responses.
+
+Writers such as pyarrow's ParquetWriter and zipfile expect a file object.
+ChunkSink is a write-only file object that buffers what they write until
+the response generator drains it, so a file is sent piece by piece and
+never staged whole in memory or on disk.
+"""
+from typing import List
+
+
+class ChunkSink:
+    """Write-only, non-seekable file object drained by a response generator."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def readable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
@@ -0,0 +1,93 @@
+"""
+Streaming file uploads for the Fiber Expansion Platform.
+
+Uploads are never held in memory whole. UploadLimitMiddleware counts
+request body bytes as they arrive and fails the request as soon as an
+upload route receives more than the limit; copy_upload then moves the
+parsed file to its destination in fixed-size chunks, hashing it on the way
+and enforcing the exact file size limit.
+"""
+import hashlib
+import os
+from typing import BinaryIO, Iterable, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Room for the multipart boundaries and form fields sent with a file
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+
+def too_large_detail(max_size: int) -> str:
+    return f"File too large. Maximum size: {max_size // (1024*1024)}MB"
+
+
+def copy_upload(fileobj: BinaryIO, path: str, max_size: int) -> Tuple[int, str]:
+    """
+    Copy an uploaded file to path in chunks, hashing it as it is written.
+
+    Blocking; call it from a worker thread. The partial file is removed
+    when the upload is over max_size or the copy fails.
+
+    Returns:
+        (size in bytes, SHA-256 hex digest)
+
+    Raises:
+        HTTPException: 413 if the file is larger than max_size
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := fileobj.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(status_code=413, detail=too_large_detail(max_size))
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return size, digest.hexdigest()
+
+
+class UploadLimitMiddleware:
+    """
+    Reject oversized request bodies on upload routes while they stream in.
+
+    A declared Content-Length over the limit is refused before the body is
+    read; otherwise body chunks are counted as the form parser receives
+    them and the request fails with 413 at the first chunk past the limit.
+    """
+
+    def __init__(self, app, max_body_size: int, paths: Iterable[str]):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        detail = too_large_detail(self.max_body_size - UPLOAD_FORM_OVERHEAD)
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,209 @@
+"""Bring databases created before migrations up to the current schema
+
+Tables are created by init_db (Base.metadata.create_all), which never
+alters a table that already exists. This revision adds the columns and
+indexes introduced since then to existing tables; each step is skipped
+when create_all already made it, so new databases pass through unchanged.
+
+The unique (name, county) index cannot be created while properties share
+a name and county. The upgrade then stops, listing them, before changing
+anything. Resolve them by hand, or merge each group into its lowest id with
+
+    alembic -x merge_duplicates=true upgrade head
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+import logging
+import warnings
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Tables whose rows point at a property
+PROPERTY_CHILD_TABLES = ("property_organizations", "property_contacts", "documents")
+
+# Duplicate groups listed when the upgrade stops
+REPORTED_DUPLICATES = 20
+
+
+def _index(table: str, name: str):
+    with warnings.catch_warnings():
+        # SQLite does not reflect expression indexes such as the sort index
+        warnings.filterwarnings("ignore", "Skipped unsupported reflection", sa.exc.SAWarning)
+        indexes = sa.inspect(op.get_bind()).get_indexes(table)
+    for index in indexes:
+        if index["name"] == name:
+            return index
+    return None
+
+
+def _add_column(table: str, column: sa.Column, indexed: bool = False) -> None:
+    """Add a column, and its ix_<table>_<column> index, unless they exist."""
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns(table)}
+    if column.name not in columns:
+        # Batch mode copies the table where SQLite cannot add a constraint
+        with op.batch_alter_table(table) as batch:
+            batch.add_column(column)
+    index_name = f"ix_{table}_{column.name}"
+    if indexed and _index(table, index_name) is None:
+        op.create_index(index_name, table, [column.name])
+
+
+def _drop_columns(table: str, *names: str, indexed: tuple = ()) -> None:
+    for name in indexed:
+        op.drop_index(f"ix_{table}_{name}", table_name=table)
+    with op.batch_alter_table(table) as batch:
+        for name in names:
+            batch.drop_column(name)
+
+
+def _merge_requested() -> bool:
+    """Check for -x merge_duplicates=true, or the merge_duplicates config attribute."""
+    requested = context.get_x_argument(as_dictionary=True).get("merge_duplicates", "")
+    return requested.lower() == "true" or bool(context.config.attributes.get("merge_duplicates"))
+
+
+def _duplicate_properties() -> list:
+    """Each (name, county) held by several properties, with their ids in order."""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT p.name, p.county, p.id FROM properties p "
+        "JOIN (SELECT name, county FROM properties "
+        "      GROUP BY name, county HAVING COUNT(*) > 1) d "
+        "ON p.name = d.name AND p.county = d.county "
+        "ORDER BY p.name, p.county, p.id"
+    )).all()
+    groups = {}
+    for name, county, property_id in rows:
+        groups.setdefault((name, county), []).append(property_id)
+    return [(name, county, ids) for (name, county), ids in groups.items()]
+
+
+def _resolve_duplicate_properties() -> None:
+    """
+    Stop the upgrade on duplicate properties, unless a merge was requested.
+
+    Raises:
+        RuntimeError: Listing the duplicate groups, if no merge was requested
+    """
+    duplicates = _duplicate_properties()
+    if not duplicates:
+        return
+    if not _merge_requested():
+        listed = "\n".join(
+            f"  {name!r} in {county!r}: ids {', '.join(map(str, ids))}"
+            for name, county, ids in duplicates[:REPORTED_DUPLICATES]
+        )
+        more = len(duplicates) - REPORTED_DUPLICATES
+        if more > 0:
+            listed += f"\n  ... and {more} more"
+        raise RuntimeError(
+            f"Cannot add the unique (name, county) index: {len(duplicates)} groups of "
+            f"properties share a name and county:\n{listed}\n"
+            "Merge or rename them, or rerun with "
+            "`alembic -x merge_duplicates=true upgrade head` to keep the lowest id "
+            "of each group and delete the others."
+        )
+    _merge_duplicate_properties(duplicates)
+
+
+def _merge_duplicate_properties(duplicates: list) -> None:
+    """
+    Keep the first property (lowest id) of each (name, county).
+
+    Rows pointing at a duplicate move to the kept property; a duplicate's
+    cost model is dropped if the kept property has one. Every merge is logged.
+    """
+    bind = op.get_bind()
+    pairs = []
+    for name, county, ids in duplicates:
+        logger.warning(
+            "Merging duplicate properties %s into %d (%r in %r)",
+            ", ".join(map(str, ids[1:])), ids[0], name, county
+        )
+        pairs.extend({"duplicate_id": i, "keep_id": ids[0]} for i in ids[1:])
+
+    for table in PROPERTY_CHILD_TABLES:
+        bind.execute(sa.text(
+            f"UPDATE {table} SET property_id = :keep_id WHERE property_id = :duplicate_id"
+        ), pairs)
+    for pair in pairs:
+        bind.execute(sa.text(
+            "DELETE FROM property_costs WHERE property_id = :duplicate_id "
+            "AND EXISTS (SELECT 1 FROM property_costs WHERE property_id = :keep_id)"
+        ), pair)
+        bind.execute(sa.text(
+            "UPDATE property_costs SET property_id = :keep_id WHERE property_id = :duplicate_id"
+        ), pair)
+    bind.execute(sa.text("DELETE FROM properties WHERE id = :duplicate_id"), pairs)
+
+
+def upgrade() -> None:
+    # Before changing anything, so a stopped upgrade leaves the database as it was
+    name_county = _index("properties", "ix_properties_name_county")
+    needs_unique = name_county is None or not name_county["unique"]
+    if needs_unique:
+        _resolve_duplicate_properties()
+
+    # Next timing threshold crossing; NULL rows are rescored once by the scheduler
+    _add_column("properties", sa.Column("timing_rescore_at", sa.DateTime()), indexed=True)
+
+    # Spatial grid cell; filled at startup by geo.backfill_geo_cells
+    _add_column("properties", sa.Column("geo_cell", sa.Integer()), indexed=True)
+
+    # Change detection: the last imported row of each property, and the
+    # uploaded file of each job
+    _add_column("properties", sa.Column("import_hash", sa.String(64)))
+    _add_column("import_jobs", sa.Column("unchanged_count", sa.Integer(), server_default="0"))
+    _add_column("import_jobs", sa.Column("file_digest", sa.String(64)), indexed=True)
+
+    # Live import progress
+    _add_column("import_jobs", sa.Column("processed_count", sa.Integer(), server_default="0"))
+
+    # Worksheets requested by each import job, and its counts per sheet
+    _add_column("import_jobs", sa.Column("sheets", sa.JSON()))
+    _add_column("import_jobs", sa.Column("sheet_counts", sa.JSON()))
+
+    # File columns an import job read no field from
+    _add_column("import_jobs", sa.Column("unmapped_columns", sa.JSON()))
+
+    # Stored blob of each document; documents uploaded before have none
+    blob = sa.ForeignKey("document_blobs.content_hash", name="documents_content_hash_fkey")
+    _add_column("documents", sa.Column("content_hash", sa.String(64), blob), indexed=True)
+
+    # Score-ordered keyset pagination sorts unscored properties last
+    op.drop_index("ix_properties_score_id", table_name="properties", if_exists=True)
+    op.create_index(
+        "ix_properties_sort_score_id", "properties", [sa.text("coalesce(score, -1)"), "id"],
+        if_not_exists=True
+    )
+
+    # Imports upsert ON CONFLICT (name, county), which needs a unique index
+    if needs_unique:
+        if name_county is not None:
+            op.drop_index("ix_properties_name_county", table_name="properties")
+        op.create_index("ix_properties_name_county", "properties", ["name", "county"], unique=True)
+
+
+def downgrade() -> None:
+    # Before any batch copy of properties, which would not carry the expression index over
+    op.drop_index("ix_properties_sort_score_id", table_name="properties")
+    op.create_index("ix_properties_score_id", "properties", ["score", "id"])
+    op.drop_index("ix_properties_name_county", table_name="properties")
+    _drop_columns("properties", "timing_rescore_at", indexed=("timing_rescore_at",))
+    _drop_columns("properties", "geo_cell", indexed=("geo_cell",))
+    _drop_columns("properties", "import_hash")
+    _drop_columns("import_jobs", "unchanged_count", "file_digest", indexed=("file_digest",))
+    _drop_columns("import_jobs", "processed_count")
+    _drop_columns("import_jobs", "sheets", "sheet_counts")
+    _drop_columns("import_jobs", "unmapped_columns")
+    _drop_columns("documents", "content_hash", indexed=("content_hash",))
@@ -0,0 +1,115 @@
+"""Parity tests for the batch scoring engine."""
+import random
+import pytest
+from datetime import datetime, timedelta
+from app.scoring import (
+    calculate_score,
+    calculate_scores_batch,
+    property_columns,
+    next_timing_change,
+    DEFAULT_WEIGHTS
+)
+from app.models.models import Property, PropertyType
+
+
+NOW = datetime(2025, 6, 1, 9, 30)
+
+
+def random_property(rng: random.Random) -> Property:
+    """Create a property with randomized (and often missing) scoring inputs."""
+    def maybe(value):
+        return None if rng.random() < 0.15 else value
+
+    break_ground = None
+    if rng.random() > 0.15:
+        # Half-day offsets keep every date clear of day boundaries
+        break_ground = NOW + timedelta(days=rng.randint(-400, 1200), hours=12)
+
+    return Property(
+        name="Random",
+        county="Comal",
+        property_type=rng.choice([PropertyType.MDU, PropertyType.SUBDIVISION]),
+        units=maybe(rng.choice([0, 10, 74, 75, 149, 150, 250, 399, 400, 900])),
+        lots=maybe(rng.choice([0, 50, 150, 299, 300, 600, 999, 1000, 2500])),
+        fiber_distance_gvtc=maybe(rng.choice([0, 0.1, 0.25, 0.26, 0.5, 1.0, 1.7, 2.0, 5.5])),
+        fiber_distance_lease=maybe(rng.choice([0, 0.2, 0.5, 0.75, 2.0, 3.0])),
+        competitor_count=maybe(rng.randint(0, 5)),
+        median_income=maybe(rng.choice([0, 30000, 45000, 64999, 85000, 110000, 150000])),
+        population_density=maybe(rng.choice([0, 300.5, 600, 1200, 1999, 3000, 5000])),
+        nearby_schools=maybe(rng.randint(0, 3)),
+        nearby_libraries=maybe(rng.randint(0, 2)),
+        break_ground_date=break_ground
+    )
+
+
+class TestBatchScoringParity:
+    """The batch scorer must match calculate_score exactly."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_randomized_parity(self, seed):
+        rng = random.Random(seed)
+        props = [random_property(rng) for _ in range(500)]
+
+        result = calculate_scores_batch(
+            property_columns(props), now=NOW, include_breakdown=True
+        )
+
+        for i, prop in enumerate(props):
+            expected = calculate_score(prop, now=NOW)
+            assert result["total_score"][i] == expected["total_score"]
+            assert result["tier"][i] == expected["tier"]
+            assert result["breakdown"][i] == expected["breakdown"]
+            assert result["next_timing_change"][i] == next_timing_change(prop.break_ground_date, NOW)
+
+    def test_explicit_weights_parity(self):
+        rng = random.Random(7)
+        props = [random_property(rng) for _ in range(200)]
+        weights = {"scale": 0.4, "fiber": 0.3, "timing": 0.125}
+
+        result = calculate_scores_batch(property_columns(props), weights=weights, now=NOW)
+
+        for i, prop in enumerate(props):
+            expected = calculate_score(prop, weights=weights, now=NOW)
+            assert result["total_score"][i] == expected["total_score"]
+            assert result["tier"][i] == expected["tier"]
+
+    def test_relationship_and_hoa_arrays(self):
+        rng = random.Random(11)
+        props = [random_property(rng) for _ in range(100)]
+        strengths = [rng.choice([1, 1.5, 2.5, 3.5, 4.5, 5]) for _ in props]
+        has_hoa = [rng.random() < 0.5 for _ in props]
+        has_contact = [rng.random() < 0.5 for _ in props]
+
+        result = calculate_scores_batch(
+            property_columns(props),
+            relationship_strength=strengths,
+            has_hoa=has_hoa,
+            has_hoa_contact=has_contact,
+            now=NOW
+        )
+
+        for i, prop in enumerate(props):
+            expected = calculate_score(
+                prop,
+                relationship_strength=strengths[i],
+                has_hoa=has_hoa[i],
+                has_hoa_contact=has_contact[i],
+                now=NOW
+            )
+            assert result["total_score"][i] == expected["total_score"]
+
+    def test_empty_batch(self):
+        columns = property_columns([])
+        result = calculate_scores_batch(columns, now=NOW)
+
+        assert len(result["total_score"]) == 0
+        assert len(result["tier"]) == 0
+
+    def test_default_weights_follow_property_type(self):
+        mdu = Property(name="A", county="Comal", property_type=PropertyType.MDU, units=400)
+        sfu = Property(name="B", county="Comal", property_type=PropertyType.SUBDIVISION, lots=1000)
+
+        result = calculate_scores_batch(property_columns([mdu, sfu]), now=NOW)
+
+        assert result["weighted"]["scale"][0] == 100 * DEFAULT_WEIGHTS[PropertyType.MDU]["scale"]
+        assert result["weighted"]["scale"][1] == 100 * DEFAULT_WEIGHTS[PropertyType.SUBDIVISION]["scale"]
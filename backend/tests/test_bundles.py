@@ -0,0 +1,55 @@
+"""Tests for streaming ZIP bundles of documents."""
+import io
+import zipfile
+from app.bundles import _unique_name, stream_bundle
+from app.models.models import Document, Property, PropertyType
+
+
+class TestBundles:
+    """Test building document bundles."""
+
+    def test_unique_names(self):
+        used = set()
+
+        assert _unique_name("A/plat.pdf", used) == "A/plat.pdf"
+        assert _unique_name("A/Plat.pdf", used) == "A/Plat (2).pdf"
+        assert _unique_name("A/plat.pdf", used) == "A/plat (3).pdf"
+        assert _unique_name("B/plat.pdf", used) == "B/plat.pdf"
+
+    def test_stream_bundle(self, test_db, tmp_path):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        try:
+            prop = Property(name="Oak/Ridge", county="Comal", property_type=PropertyType.MDU)
+            db.add(prop)
+            db.flush()
+            contents = {"plat.pdf": b"%PDF plat", "site.dwg": b"dwg " * 1000}
+            for name, data in contents.items():
+                path = tmp_path / name
+                path.write_bytes(data)
+                db.add(Document(
+                    property_id=prop.id, filename=name, original_filename=name,
+                    file_path=str(path), document_type="Plat"
+                ))
+            db.add(Document(
+                property_id=prop.id, filename="gone.pdf", original_filename="plat.pdf",
+                file_path=str(tmp_path / "gone.pdf"), document_type="Plat"
+            ))
+            db.commit()
+
+            archive = zipfile.ZipFile(io.BytesIO(b"".join(
+                stream_bundle([Document.property_id == prop.id])
+            )))
+
+            folder = f"Oak-Ridge ({prop.id})"
+            assert archive.testzip() is None
+            assert archive.namelist() == [f"{folder}/plat.pdf", f"{folder}/site.dwg"]
+            assert archive.read(f"{folder}/site.dwg") == contents["site.dwg"]
+            assert archive.getinfo(f"{folder}/plat.pdf").compress_type == zipfile.ZIP_STORED
+            assert archive.getinfo(f"{folder}/site.dwg").compress_type == zipfile.ZIP_DEFLATED
+        finally:
+            db.rollback()
+            db.query(Document).delete()
+            db.query(Property).filter(Property.name == "Oak/Ridge").delete()
+            db.commit()
+            db.close()
@@ -0,0 +1,75 @@
+"""Tests for cacheable, resumable downloads."""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.downloads import RangeNotSatisfiable, file_download, media_type_for, parse_range
+
+CONTENT_HASH = "ab" * 32
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / "plat.dwg"
+    path.write_bytes(bytes(range(256)) * 4)
+    app = FastAPI()
+
+    @app.get("/files/{name}")
+    async def download(name: str, request: Request):
+        return file_download(request, str(path), name, content_hash=CONTENT_HASH)
+
+    return TestClient(app)
+
+
+class TestParseRange:
+    """Test Range header parsing."""
+
+    def test_forms(self):
+        assert parse_range("bytes=0-99", 1000) == (0, 99)
+        assert parse_range("bytes=900-", 1000) == (900, 999)
+        assert parse_range("bytes=-100", 1000) == (900, 999)
+        assert parse_range("bytes=990-2000", 1000) == (990, 999)
+
+    def test_ignored_and_unsatisfiable(self):
+        assert parse_range("bytes=0-1,5-6", 1000) is None
+        assert parse_range("items=0-1", 1000) is None
+        assert parse_range("bytes=9-2", 1000) is None
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=1000-", 1000)
+        for header in ("bytes=-100", "bytes=0-"):
+            with pytest.raises(RangeNotSatisfiable):
+                parse_range(header, 0)
+
+
+class TestFileDownload:
+    """Test conditional and partial downloads."""
+
+    def test_full_download_headers(self, client):
+        response = client.get("/files/plat.dwg")
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == f'"{CONTENT_HASH}"'
+        assert response.headers["content-type"] == "image/vnd.dwg"
+        assert response.headers["accept-ranges"] == "bytes"
+        assert len(response.content) == 1024
+        assert media_type_for("Site Plan.PDF") == "application/pdf"
+
+    def test_conditional_requests(self, client):
+        first = client.get("/files/plat.dwg")
+
+        assert client.get("/files/plat.dwg", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+        assert client.get("/files/plat.dwg", headers={"If-None-Match": '"other"'}).status_code == 200
+        since = {"If-Modified-Since": first.headers["last-modified"]}
+        assert client.get("/files/plat.dwg", headers=since).status_code == 304
+
+    def test_ranges(self, client):
+        partial = client.get("/files/plat.dwg", headers={"Range": "bytes=256-259"})
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == "bytes 256-259/1024"
+        assert partial.content == bytes([0, 1, 2, 3])
+
+        stale = client.get("/files/plat.dwg", headers={"Range": "bytes=0-3", "If-Range": '"old"'})
+        assert stale.status_code == 200
+
+        beyond = client.get("/files/plat.dwg", headers={"Range": "bytes=5000-"})
+        assert beyond.status_code == 416
+        assert beyond.headers["content-range"] == "bytes */1024"
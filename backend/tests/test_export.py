@@ -0,0 +1,60 @@
+"""Tests for streaming property export."""
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from app.export import EXPORT_COLUMNS, stream_csv, stream_ndjson, stream_parquet
+from app.models.models import PropertyType, PropertyStatus
+
+
+def make_row(row_id: int) -> tuple:
+    values = {name: None for name in EXPORT_COLUMNS}
+    values.update(
+        id=row_id,
+        name=f'Oak "{row_id}", Phase 1',
+        property_type=PropertyType.MDU,
+        status=PropertyStatus.PROSPECT,
+        county="Comal",
+        units=120,
+        score=55.5,
+        has_fiber_access=True,
+        break_ground_date=datetime(2026, 3, 1)
+    )
+    return tuple(values[name] for name in EXPORT_COLUMNS)
+
+
+def chunks():
+    return iter([[make_row(1), make_row(2)], [make_row(3)]])
+
+
+class TestExportFormats:
+    """Test export encoders over chunked rows."""
+
+    def test_csv_round_trip(self):
+        data = b"".join(stream_csv(chunks())).decode()
+        rows = list(csv.DictReader(io.StringIO(data)))
+
+        assert [r["id"] for r in rows] == ["1", "2", "3"]
+        assert rows[0]["name"] == 'Oak "1", Phase 1'
+        assert rows[0]["property_type"] == "MDU"
+        assert rows[0]["break_ground_date"] == "2026-03-01T00:00:00"
+
+    def test_ndjson_one_object_per_row(self):
+        lines = b"".join(stream_ndjson(chunks())).decode().splitlines()
+
+        assert len(lines) == 3
+        first = json.loads(lines[0])
+        assert first["status"] == "Prospect"
+        assert first["units"] == 120
+        assert first["city"] is None
+
+    def test_parquet_row_group_per_chunk(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        data = b"".join(stream_parquet(chunks()))
+
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        assert parquet_file.num_row_groups == 2
+        table = parquet_file.read()
+        assert table.column("id").to_pylist() == [1, 2, 3]
+        assert table.column("property_type").to_pylist() == ["MDU"] * 3
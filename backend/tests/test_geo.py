@@ -0,0 +1,56 @@
+"""Tests for grid-based spatial indexing."""
+import random
+from app.geo import (
+    grid_cell,
+    bbox_cell_ranges,
+    cluster_cell_degrees,
+    GRID_COLUMNS
+)
+
+
+class TestGridCell:
+    """Test grid cell assignment."""
+    
+    def test_missing_coordinates(self):
+        assert grid_cell(None, -98.5) is None
+        assert grid_cell(29.5, None) is None
+    
+    def test_neighbouring_cells(self):
+        cell = grid_cell(29.52, -98.52)
+        assert grid_cell(29.52, -98.47) == cell + 1
+        assert grid_cell(29.57, -98.52) == cell + GRID_COLUMNS
+    
+    def test_extremes_are_clamped(self):
+        assert grid_cell(90, 180) == grid_cell(89.99, 179.99)
+        assert grid_cell(-90, -180) == 0
+
+
+class TestBboxCellRanges:
+    """Test bounding box to cell range conversion."""
+    
+    def test_ranges_cover_points_in_box(self):
+        rng = random.Random(3)
+        box = (29.1, 29.6, -98.7, -98.1)
+        ranges = bbox_cell_ranges(*box)
+        
+        for _ in range(500):
+            lat = rng.uniform(box[0], box[1])
+            lng = rng.uniform(box[2], box[3])
+            cell = grid_cell(lat, lng)
+            assert any(first <= cell <= last for first, last in ranges)
+    
+    def test_one_range_per_row(self):
+        assert len(bbox_cell_ranges(29.0, 29.24, -99, -98)) == 5
+    
+    def test_large_box_uses_single_range(self):
+        ranges = bbox_cell_ranges(-60, 60, -120, -60)
+        assert len(ranges) == 1
+        assert ranges[0] == (grid_cell(-60, -120), grid_cell(60, -60))
+
+
+class TestClusterCells:
+    """Test zoom-dependent cluster cell sizes."""
+    
+    def test_cells_halve_per_zoom_level(self):
+        assert cluster_cell_degrees(0) == 90
+        assert cluster_cell_degrees(10) == cluster_cell_degrees(9) / 2
@@ -0,0 +1,571 @@
+"""Tests for the property import pipeline."""
+import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from datetime import datetime
+from openpyxl import Workbook
+import pandas as pd
+from app import importer
+from app.importer import (
+    iter_import_batches, read_import_header, normalize_batch, lookup_properties, merge_row, write_properties,
+    run_import_job, row_hash, dry_run_import, workbook_sheets, select_sheets, shutdown_sheet_executor,
+    map_columns, resolve_column_mapping, save_mapping_profile, unmapped_columns
+)
+from app.models.models import (
+    Property, PropertyType, PropertyStatus, PropertyPhase, ImportJob, ColumnMappingProfile
+)
+from app.scoring import calculate_score
+
+
+def make_workbook(rows) -> io.BytesIO:
+    return make_sheets({"Sheet": rows})
+
+
+def make_sheets(sheets) -> io.BytesIO:
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        sheet = workbook.create_sheet(title)
+        for row in rows:
+            sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class TestExcelReader:
+    """Test streaming Excel batches."""
+
+    def test_batches_keep_spreadsheet_positions(self):
+        rows = [["Name", "County", "Units"]]
+        rows += [[f"Prop {i}", "Comal", i] for i in range(7)]
+
+        batches = list(iter_import_batches(make_workbook(rows), "vendor.xlsx", batch_size=3))
+
+        assert [len(df) for df in batches] == [3, 3, 1]
+        assert list(batches[1].index) == [3, 4, 5]
+        assert batches[2].loc[6, "Name"] == "Prop 6"
+
+    def test_blank_and_repeated_headers(self):
+        rows = [["Name", None, "Name"], ["A", "x", "B"]]
+
+        df = next(iter_import_batches(make_workbook(rows), "vendor.xlsx", batch_size=10))
+
+        assert list(df.columns) == ["Name", "Unnamed: 1", "Name.1"]
+
+    def test_trailing_blank_rows_dropped_and_short_rows_padded(self):
+        rows = [
+            ["Name", "County", "Break Ground"],
+            ["A", "Comal", datetime(2026, 1, 1)],
+            [None, None, None],
+            ["B"],
+            [None, None, None],
+            [None, None, None]
+        ]
+
+        batches = list(iter_import_batches(make_workbook(rows), "vendor.xlsx", batch_size=2))
+
+        assert [list(batch.index) for batch in batches] == [[0, 1], [2]]
+        assert batches[0].loc[0, "Break Ground"] == datetime(2026, 1, 1)
+        assert batches[1].loc[2, "County"] is None
+        # A blank row between data rows is reported, as pandas.read_excel reads it
+        errors = [normalize_batch(batch, {"name": "Name", "county": "County"}, PropertyType.MDU)[1]
+                  for batch in batches]
+        assert errors == [[{"row": 3, "error": "Missing property name"}],
+                          [{"row": 4, "error": "Missing county for 'B'"}]]
+
+    def test_sheets_listed_and_read_by_name(self):
+        workbook = make_sheets({
+            "Comal": [["Name", "County"], ["A", "Comal"]],
+            "Hays": [["Name", "County"], ["B", "Hays"], ["C", "Hays"]]
+        })
+
+        assert workbook_sheets(workbook, "vendor.xlsx") == ["Comal", "Hays"]
+        df = next(iter_import_batches(workbook, "vendor.xlsx", batch_size=10, sheet="Hays"))
+        assert list(df["Name"]) == ["B", "C"]
+        assert select_sheets(["Comal", "Hays"], ["Hays"]) == ["Hays"]
+        with pytest.raises(ValueError):
+            select_sheets(["Comal", "Hays"], ["Bexar"])
+
+
+class TestColumnarReaders:
+    """Test CSV and Parquet batches."""
+
+    def test_csv_batches_as_text(self):
+        data = io.BytesIO("\ufeffName,County,Units,Extra\nA,Comal,10,x\nB,,,y\nC,Hays,7,z\n".encode())
+
+        assert read_import_header(data, "feed.csv") == ["Name", "County", "Units", "Extra"]
+        batches = list(iter_import_batches(data, "feed.csv", batch_size=2, columns=["Name", "County", "Units"]))
+
+        assert [list(df.index) for df in batches] == [[0, 1], [2]]
+        assert list(batches[0].columns) == ["Name", "County", "Units"]
+        assert batches[0].loc[0, "Units"] == "10"
+        assert pd.isna(batches[0].loc[1, "County"])
+
+    def test_parquet_projects_columns(self):
+        pytest.importorskip("pyarrow")
+        data = io.BytesIO()
+        pd.DataFrame({"Name": ["A", "B", "C"], "Units": [1, 2, 3], "Extra": ["x", "y", "z"]}).to_parquet(data)
+        data.seek(0)
+
+        assert read_import_header(data, "feed.parquet") == ["Name", "Units", "Extra"]
+        batches = list(iter_import_batches(data, "feed.parquet", batch_size=2, columns=["Name", "Units"]))
+
+        assert [list(df.index) for df in batches] == [[0, 1], [2]]
+        assert list(batches[1].columns) == ["Name", "Units"]
+        assert batches[1].loc[2, "Units"] == 3
+
+
+class TestColumnMapping:
+    """Test alias matching and saved mapping profiles."""
+
+    def test_aliases_match_normalized_headers(self):
+        header = [" property_NAME ", "Name", "county", "# Units", "Lot Size"]
+
+        col_map = map_columns(header, "MDU")
+
+        assert col_map == {"name": "Name", "county": "county", "units": "# Units"}
+        assert unmapped_columns(header, col_map) == [" property_NAME ", "Lot Size"]
+
+    def test_profile_and_overrides(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        header = ["Proj", "County", "Unit Qty", "Memo"]
+        try:
+            assert resolve_column_mapping(db, header, "Subdivision") == {"county": "County"}
+
+            overrides = {"name": "Proj", "lots": "Unit Qty", "county": None}
+            col_map = resolve_column_mapping(db, header, "Subdivision", overrides)
+            assert col_map == {"name": "Proj", "lots": "Unit Qty"}
+            with pytest.raises(ValueError):
+                resolve_column_mapping(db, header, "Subdivision", {"name": "Missing"})
+
+            save_mapping_profile(db, header, "Subdivision", col_map)
+            db.commit()
+            reordered = ["memo", "unit qty", "county", "proj"]
+            assert resolve_column_mapping(db, header[::-1], "Subdivision") == col_map
+            assert resolve_column_mapping(db, reordered, "Subdivision") == {
+                "name": "proj", "lots": "unit qty"
+            }
+            assert resolve_column_mapping(db, header, "MDU") == {"county": "County"}
+        finally:
+            db.rollback()
+            db.query(ColumnMappingProfile).delete()
+            db.commit()
+            db.close()
+
+
+class TestNormalizeBatch:
+    """Test column-wise row normalization."""
+
+    COL_MAP = {
+        "name": "Name", "county": "County", "units": "Units", "status": "Status",
+        "phase": "Phase", "break_ground_date": "Break Ground", "latitude": "Lat",
+        "competitor_count": "Competitors", "state": "State", "notes": "Notes"
+    }
+
+    def make_batch(self, rows, start=0):
+        columns = ["Name", "County", "Units", "Status", "Phase", "Break Ground",
+                   "Lat", "Competitors", "State", "Notes"]
+        return pd.DataFrame(rows, columns=columns, index=range(start, start + len(rows)))
+
+    def test_coerces_columns(self):
+        df = self.make_batch([
+            [" Oak ", "Comal", "200", "Under Construction", "planning",
+             datetime(2026, 1, 1), "29.5", None, None, " call "],
+            ["Elm", "Hays", 12.9, "unknown", None, "2027-05-01", "n/a", 3, "OK", None],
+            ["Ash", "Hays", "abc", None, "Stabilized", "not a date", 30.1, "x", "", None],
+        ])
+
+        rows, errors = normalize_batch(df, self.COL_MAP, PropertyType.MDU, {"source": "Excel Import"})
+
+        assert errors == []
+        oak, elm, ash = rows
+        assert oak["name"] == "Oak" and oak["units"] == 200 and oak["latitude"] == 29.5
+        assert oak["status"] == PropertyStatus.UNDER_CONSTRUCTION
+        assert oak["phase"] == PropertyPhase.PLANNING
+        assert oak["competitor_count"] == 0
+        assert oak["state"] == "TX" and oak["notes"] == "call"
+        assert oak["source"] == "Excel Import" and oak["property_type"] == PropertyType.MDU
+        assert elm["units"] == 12 and elm["latitude"] is None and elm["competitor_count"] == 3
+        assert elm["status"] == PropertyStatus.PROSPECT
+        assert elm["phase"] == PropertyPhase.PRE_DEVELOPMENT
+        assert elm["break_ground_date"] == datetime(2027, 5, 1)
+        assert elm["state"] == "OK" and elm["notes"] is None
+        assert ash["units"] is None and ash["break_ground_date"] is None
+        assert ash["phase"] == PropertyPhase.STABILIZED and ash["state"] == "TX"
+
+    def test_required_field_errors_use_sheet_rows(self):
+        df = self.make_batch([
+            ["Oak", "Comal"] + [None] * 8,
+            [None, "Comal"] + [None] * 8,
+            ["Elm", None] + [None] * 8,
+            ["Ash", "  "] + [None] * 8,
+        ], start=10)
+
+        rows, errors = normalize_batch(df, self.COL_MAP, PropertyType.MDU)
+
+        assert [r["name"] for r in rows] == ["Oak"]
+        assert errors == [
+            {"row": 13, "error": "Missing property name"},
+            {"row": 14, "error": "Missing county for 'Elm'"},
+            {"row": 15, "error": "Missing county for 'Ash'"},
+        ]
+
+    def test_lots_only_for_subdivisions(self):
+        df = pd.DataFrame({"Name": ["A"], "County": ["Comal"], "Lots": ["300"], "Units": [5]})
+        col_map = {"name": "Name", "county": "County", "lots": "Lots", "units": "Units"}
+
+        rows, _ = normalize_batch(df, col_map, PropertyType.SUBDIVISION)
+
+        assert rows[0]["lots"] == 300
+        assert "units" not in rows[0]
+
+
+class TestKeyLookup:
+    """Test batched (name, county) lookups."""
+
+    def test_lookup_finds_existing_keys(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        try:
+            db.add_all([
+                Property(name=f"Lookup {i}", county="Comal", property_type=PropertyType.MDU)
+                for i in range(1000)
+            ])
+            db.commit()
+
+            keys = [(f"Lookup {i}", "Comal") for i in range(0, 1200, 3)] + [("Lookup 1", "Hays")]
+            found = lookup_properties(db, keys)
+
+            assert set(found) == {(f"Lookup {i}", "Comal") for i in range(0, 1000, 3)}
+            assert found[("Lookup 3", "Comal")].name == "Lookup 3"
+        finally:
+            db.query(Property).filter(Property.name.like("Lookup %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+
+class TestBulkWrite:
+    """Test the bulk upsert path."""
+
+    def test_row_hash_ignores_provenance(self):
+        row = {"name": "A", "county": "Comal", "units": 10, "status": PropertyStatus.PROSPECT,
+               "break_ground_date": datetime(2026, 1, 1)}
+
+        assert row_hash(row) == row_hash({**row, "source": "CSV Import", "import_job_id": 7})
+        assert row_hash(row) != row_hash({**row, "units": 11})
+
+    def test_merge_row_keeps_earlier_values(self):
+        pending = {}
+        assert not merge_row(pending, ("A", "Comal"), {"name": "A", "units": 10, "notes": "x"})
+        assert merge_row(pending, ("A", "Comal"), {"name": "A", "units": None, "notes": "y"})
+        assert pending[("A", "Comal")] == {"name": "A", "units": 10, "notes": "y"}
+
+    def test_insert_then_update_keeps_blank_columns(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        base = {"property_type": PropertyType.MDU, "county": "Comal", "source": "Excel Import"}
+        try:
+            rows = [
+                {**base, "name": "Upsert A", "units": 400, "latitude": 29.7, "longitude": -98.1},
+                {**base, "name": "Upsert B", "units": 20, "latitude": None, "longitude": None},
+            ]
+            assert write_properties(db, rows, {}) == 2
+            db.commit()
+
+            existing = lookup_properties(db, [("Upsert A", "Comal")])
+            update = [{**base, "name": "Upsert A", "units": None, "latitude": None, "longitude": None}]
+            write_properties(db, update, existing)
+            db.commit()
+
+            prop = db.query(Property).filter(Property.name == "Upsert A").one()
+            assert prop.units == 400
+            assert prop.geo_cell is not None
+            assert prop.score == calculate_score(prop, now=prop.last_scored_at)["total_score"]
+            assert db.query(Property).filter(Property.name.like("Upsert %")).count() == 2
+        finally:
+            db.query(Property).filter(Property.name.like("Upsert %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+
+class TestImportJob:
+    """Test running an import job end to end."""
+
+    def spool(self, rows) -> str:
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as spooled:
+            spooled.write(make_workbook(rows).getvalue())
+        return spooled.name
+
+    def test_job_records_counts(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        rows = [["Name", "County", "Units"], ["Job A", "Comal", 10], ["Job A", "Comal", None],
+                [None, "Comal", 5], ["Job B", "Hays", 20]]
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU", status="Pending")
+            db.add(job)
+            db.commit()
+            path = self.spool(rows)
+
+            run_import_job(job.id, path)
+
+            db.refresh(job)
+            assert job.status == "Completed"
+            assert (job.total_rows, job.processed_count) == (4, 4)
+            assert (job.imported_count, job.updated_count, job.error_count) == (2, 1, 1)
+            assert job.errors == [{"row": 4, "error": "Missing property name"}]
+            assert not os.path.exists(path)
+            assert db.query(Property).filter(Property.import_job_id == job.id).count() == 2
+        finally:
+            db.query(Property).filter(Property.name.like("Job %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_repeated_rows_and_files_are_skipped(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        rows = [["Name", "County", "Units"], ["Repeat A", "Comal", 10], ["Repeat B", "Hays", 20]]
+        try:
+            jobs = []
+            for digest, force, data in [
+                ("d1", False, rows),
+                ("d1", False, rows),
+                ("d1", True, rows),
+                ("d2", False, rows[:2] + [["Repeat B", "Hays", 25]]),
+            ]:
+                job = ImportJob(filename="vendor.xlsx", import_type="MDU",
+                                status="Pending", file_digest=digest)
+                db.add(job)
+                db.commit()
+                run_import_job(job.id, self.spool(data), force=force)
+                db.refresh(job)
+                jobs.append(job)
+
+            counts = [(j.imported_count, j.updated_count, j.unchanged_count) for j in jobs]
+            assert counts == [(2, 0, 0), (0, 0, 2), (0, 0, 2), (0, 1, 1)]
+            assert all(j.status == "Completed" for j in jobs)
+            assert db.query(Property).filter(Property.name == "Repeat B").one().units == 25
+        finally:
+            db.query(Property).filter(Property.name.like("Repeat %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_cancelled_job_does_not_run(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU", status="Cancelled")
+            db.add(job)
+            db.commit()
+
+            run_import_job(job.id, self.spool([["Name", "County"], ["Job C", "Comal"]]))
+
+            db.refresh(job)
+            assert job.status == "Cancelled"
+            assert job.completed_at is not None
+            assert db.query(Property).filter(Property.name == "Job C").count() == 0
+        finally:
+            db.close()
+
+    def test_cancel_after_last_batch_stays_cancelled(self, test_db, monkeypatch):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        write_batch = importer.write_properties
+
+        def cancel_then_write(*args):
+            # The API cancels once the job has checked for a cancel before its last batch
+            api = SessionLocal()
+            api.query(ImportJob).filter(ImportJob.id == job.id).update({"status": "Cancelled"})
+            api.commit()
+            api.close()
+            return write_batch(*args)
+
+        monkeypatch.setattr(importer, "write_properties", cancel_then_write)
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU", status="Pending")
+            db.add(job)
+            db.commit()
+
+            run_import_job(job.id, self.spool([["Name", "County"], ["Job D", "Comal"]]))
+
+            db.refresh(job)
+            assert job.status == "Cancelled"
+            assert job.completed_at is not None
+            assert job.processed_count == 1
+            assert db.query(Property).filter(Property.name == "Job D").count() == 1
+        finally:
+            db.query(Property).filter(Property.name == "Job D").delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_running_job_stops_at_shutdown(self, test_db, monkeypatch):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        stopping = threading.Event()
+        write_batch = importer.write_properties
+
+        def stop_after_write(*args):
+            stopping.set()
+            return write_batch(*args)
+
+        monkeypatch.setattr(importer, "_imports_stopping", stopping)
+        monkeypatch.setattr(importer, "write_properties", stop_after_write)
+        monkeypatch.setattr(importer.settings, "import_batch_size", 2)
+        rows = [["Name", "County"]] + [[f"Job S{i}", "Comal"] for i in range(5)]
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU", status="Pending")
+            db.add(job)
+            db.commit()
+
+            run_import_job(job.id, self.spool(rows))
+
+            db.refresh(job)
+            assert job.status == "Cancelled"
+            assert job.processed_count == 2
+            assert job.errors == [{"error": "Interrupted by server shutdown"}]
+            assert db.query(Property).filter(Property.name.like("Job S%")).count() == 2
+        finally:
+            db.query(Property).filter(Property.name.like("Job S%")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_stop_imports(self, monkeypatch):
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(importer, "import_executor", executor)
+        monkeypatch.setattr(importer, "_imports_stopping", threading.Event())
+
+        importer.stop_imports()
+
+        assert importer._imports_stopping.is_set()
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+    def test_queued_job_cancelled_on_shutdown_removes_spool(self, monkeypatch):
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(importer, "import_executor", executor)
+        release = threading.Event()
+        running = executor.submit(release.wait)
+        path = self.spool([["Name", "County"], ["Job E", "Comal"]])
+
+        queued = importer.submit_import(0, path)
+        executor.shutdown(wait=False, cancel_futures=True)
+        release.set()
+        running.result()
+
+        assert queued.cancelled()
+        assert not os.path.exists(path)
+
+    def test_dry_run_counts_without_writing(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        rows = [["Name", "County", "Units"], ["Dry A", "Comal", 10], ["Dry B", "Hays", 20]]
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU", status="Pending")
+            db.add(job)
+            db.commit()
+            run_import_job(job.id, self.spool(rows))
+
+            changed = rows[:2] + [["Dry B", "Hays", 25], ["Dry C", "Bexar", 5],
+                                  ["Dry C", "Bexar", 6], [None, "Hays", 1]]
+            summary = dry_run_import(db, make_workbook(changed), "vendor.xlsx", "MDU")
+
+            assert summary["total_rows"] == 5
+            assert (summary["imported_count"], summary["updated_count"],
+                    summary["unchanged_count"], summary["error_count"]) == (1, 2, 1, 1)
+            assert summary["errors"] == [{"row": 6, "error": "Missing property name"}]
+            assert summary["column_mapping"]["name"] == "Name"
+            assert db.query(Property).filter(Property.name.like("Dry %")).count() == 2
+        finally:
+            db.query(Property).filter(Property.name.like("Dry %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_sheets_parsed_in_parallel_into_one_job(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        sheets = {
+            "Comal": [["Name", "County", "Units"], ["Sheet A", "Comal", 10], [None, "Comal", 1]],
+            "Hays": [["Property Name", "County", "Units"], ["Sheet B", "Hays", 20],
+                     ["Sheet A", "Comal", 15]],
+            "Notes": [["Name", "County"], ["Sheet C", "Bexar"]]
+        }
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU",
+                            status="Pending", sheets=["Comal", "Hays"])
+            db.add(job)
+            db.commit()
+            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as spooled:
+                spooled.write(make_sheets(sheets).getvalue())
+
+            run_import_job(job.id, spooled.name)
+
+            db.refresh(job)
+            assert job.status == "Completed"
+            assert (job.processed_count, job.imported_count, job.updated_count) == (4, 2, 1)
+            assert job.errors == [{"sheet": "Comal", "row": 3, "error": "Missing property name"}]
+            assert job.sheet_counts["Comal"]["imported"] == 1
+            assert job.sheet_counts["Hays"]["updated"] == 1
+            assert "Notes" not in job.sheet_counts
+            assert db.query(Property).filter(Property.name == "Sheet A").one().units == 15
+            assert db.query(Property).filter(Property.name == "Sheet C").count() == 0
+            assert not any(name.startswith(os.path.basename(spooled.name))
+                           for name in os.listdir(os.path.dirname(spooled.name)))
+
+            # Sheet A is merged into one row and hash, so nothing changes on a re-import
+            summary = dry_run_import(db, make_sheets(sheets), "vendor.xlsx", "MDU", ["Comal", "Hays"])
+            assert (summary["updated_count"], summary["unchanged_count"]) == (0, 3)
+            assert summary["sheet_counts"]["Hays"]["unchanged"] == 2
+
+            again = ImportJob(filename="vendor.xlsx", import_type="MDU",
+                              status="Pending", sheets=["Comal", "Hays"])
+            db.add(again)
+            db.commit()
+            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as spooled:
+                spooled.write(make_sheets(sheets).getvalue())
+            run_import_job(again.id, spooled.name, force=True)
+            db.refresh(again)
+            assert (again.imported_count, again.updated_count, again.unchanged_count) == (0, 0, 3)
+        finally:
+            shutdown_sheet_executor()
+            db.query(Property).filter(Property.name.like("Sheet %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
+
+    def test_keys_repeated_across_sheets_with_different_columns(self, test_db):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        sheets = {
+            "Units": [["Name", "County", "Units"], ["Mixed A", "Comal", 10], ["Mixed B", "Hays", 20]],
+            "Geo": [["Name", "County", "Latitude", "Longitude"], ["Mixed B", "Hays", 29.9, -97.9],
+                    ["Mixed C", "Bexar", 29.4, -98.5]],
+            "Plain": [["Name", "County"], ["Mixed A", "Comal"], ["Mixed C", "Bexar"]]
+        }
+        try:
+            job = ImportJob(filename="vendor.xlsx", import_type="MDU",
+                            status="Pending", sheets=list(sheets))
+            db.add(job)
+            db.commit()
+            with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as spooled:
+                spooled.write(make_sheets(sheets).getvalue())
+
+            run_import_job(job.id, spooled.name)
+
+            db.refresh(job)
+            assert job.status == "Completed"
+            assert (job.processed_count, job.imported_count, job.error_count) == (6, 3, 0)
+            props = {p.name: p for p in db.query(Property).filter(Property.name.like("Mixed %"))}
+            assert (props["Mixed A"].units, props["Mixed A"].latitude) == (10, None)
+            assert (props["Mixed B"].units, props["Mixed B"].latitude) == (20, 29.9)
+            assert (props["Mixed C"].units, props["Mixed C"].longitude) == (None, -98.5)
+            assert props["Mixed B"].geo_cell is not None
+        finally:
+            shutdown_sheet_executor()
+            db.query(Property).filter(Property.name.like("Mixed %")).delete(synchronize_session=False)
+            db.commit()
+            db.close()
@@ -0,0 +1,144 @@
+"""Tests for the schema migrations."""
+import logging
+from argparse import Namespace
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from app.database import MIGRATIONS_DIRECTORY, Base, run_migrations
+from app.models import models  # noqa: F401
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+# Columns added to tables an older release created, with whether they are indexed
+ADDED_COLUMNS = {
+    "properties": {"timing_rescore_at": True, "geo_cell": True, "import_hash": False},
+    "import_jobs": {"unchanged_count": False, "file_digest": True, "processed_count": False, "sheets": False, "sheet_counts": False, "unmapped_columns": False},
+    "documents": {"content_hash": True},
+}
+
+
+def make_legacy(connection):
+    """Strip what create_all cannot add to the tables of an older release."""
+    connection.execute(text("DROP INDEX ix_properties_name_county"))
+    connection.execute(text("DROP INDEX ix_properties_sort_score_id"))
+    connection.execute(text("CREATE INDEX ix_properties_score_id ON properties (score, id)"))
+    operations = Operations(MigrationContext.configure(connection))
+    for table, columns in ADDED_COLUMNS.items():
+        for column, indexed in columns.items():
+            if indexed:
+                operations.drop_index(f"ix_{table}_{column}", table_name=table)
+        # SQLite cannot drop a foreign key column in place; batch mode copies the table
+        with operations.batch_alter_table(table) as batch:
+            for column in columns:
+                batch.drop_column(column)
+
+
+def index_named(connection, table, name):
+    return next(i for i in inspect(connection).get_indexes(table) if i["name"] == name)
+
+
+def add_duplicates(connection):
+    connection.execute(text(
+        "INSERT INTO properties (id, name, county, property_type) VALUES "
+        "(1, 'Oak Ridge', 'Comal', 'MDU'), (2, 'Oak Ridge', 'Comal', 'MDU'), "
+        "(3, 'Oak Ridge', 'Hays', 'MDU'), (4, 'Oak Ridge', 'Comal', 'MDU')"
+    ))
+    connection.execute(text(
+        "INSERT INTO documents (property_id, filename, file_path) VALUES "
+        "(2, 'plat.pdf', 'uploads/plat.pdf')"
+    ))
+    connection.execute(text(
+        "INSERT INTO property_costs (property_id, build_cost) VALUES (2, 10), (4, 20)"
+    ))
+
+
+def merge_with_x_argument(connection):
+    """Upgrade as `alembic -x merge_duplicates=true upgrade head` does."""
+    config = Config(cmd_opts=Namespace(x=["merge_duplicates=true"]))
+    config.set_main_option("script_location", MIGRATIONS_DIRECTORY)
+    config.attributes["connection"] = connection
+    command.upgrade(config, "head")
+
+
+@pytest.mark.filterwarnings("ignore:Skipped unsupported reflection")
+class TestExistingSchema:
+    """Test upgrading databases created before migrations."""
+
+    def test_new_database_passes_through(self, engine):
+        with engine.begin() as connection:
+            run_migrations(connection)
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0001"
+            assert index_named(connection, "properties", "ix_properties_name_county")["unique"]
+
+    def test_added_columns_and_indexes_created(self, engine):
+        with engine.begin() as connection:
+            make_legacy(connection)
+            run_migrations(connection)
+
+        with engine.connect() as connection:
+            inspector = inspect(connection)
+            for table, columns in ADDED_COLUMNS.items():
+                assert set(columns) <= {c["name"] for c in inspector.get_columns(table)}
+                indexes = {i["name"] for i in inspector.get_indexes(table)}
+                assert {f"ix_{table}_{c}" for c, indexed in columns.items() if indexed} <= indexes
+            sort_index = connection.execute(text(
+                "SELECT sql FROM sqlite_master WHERE name LIKE 'ix_properties_%score_id'"
+            )).scalars().all()
+            assert sort_index == ["CREATE INDEX ix_properties_sort_score_id ON properties (coalesce(score, -1), id)"]
+
+    def test_duplicate_properties_stop_the_upgrade(self, engine):
+        with engine.begin() as connection:
+            make_legacy(connection)
+            add_duplicates(connection)
+
+        with pytest.raises(RuntimeError) as raised:
+            with engine.begin() as connection:
+                run_migrations(connection)
+
+        assert "1 groups of properties share a name and county" in str(raised.value)
+        assert "'Oak Ridge' in 'Comal': ids 1, 2, 4" in str(raised.value)
+        assert "'Hays'" not in str(raised.value)
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM properties")).scalar() == 4
+            assert connection.execute(text("SELECT COUNT(*) FROM property_costs")).scalar() == 2
+            assert "geo_cell" not in {c["name"] for c in inspect(connection).get_columns("properties")}
+
+    @pytest.mark.parametrize("upgrade", [
+        lambda connection: run_migrations(connection, merge_duplicates=True),
+        merge_with_x_argument,
+    ], ids=["run_migrations", "x_argument"])
+    def test_duplicate_properties_merged_on_request(self, engine, upgrade, caplog):
+        with engine.begin() as connection:
+            make_legacy(connection)
+            add_duplicates(connection)
+
+        with caplog.at_level(logging.WARNING, logger="alembic.runtime.migration"):
+            with engine.begin() as connection:
+                upgrade(connection)
+
+        assert "Merging duplicate properties 2, 4 into 1 ('Oak Ridge' in 'Comal')" in caplog.text
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT id FROM properties ORDER BY id")).scalars().all() == [1, 3]
+            assert connection.execute(text("SELECT property_id FROM documents")).scalar() == 1
+            assert connection.execute(text(
+                "SELECT property_id, build_cost FROM property_costs"
+            )).all() == [(1, 10)]
+            assert index_named(connection, "properties", "ix_properties_name_county")["unique"]
+            with pytest.raises(IntegrityError):
+                connection.execute(text(
+                    "INSERT INTO properties (name, county, property_type) "
+                    "VALUES ('Oak Ridge', 'Comal', 'MDU')"
+                ))
@@ -0,0 +1,80 @@
+"""Tests for document preview rendering."""
+import os
+import threading
+import pytest
+from app import previews
+from app.previews import PreviewRenderer, PreviewSize, preview_path, render_preview
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def preview_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(previews.settings, "upload_directory", str(tmp_path))
+    return tmp_path
+
+
+class TestRenderPreview:
+    """Test rendering preview JPEGs."""
+
+    def test_image_thumbnail_flattens_transparency(self, tmp_path):
+        source = tmp_path / "photo.png"
+        Image.new("RGBA", (1200, 600), (255, 0, 0, 0)).save(source)
+        path = str(tmp_path / "thumb.jpg")
+
+        render_preview(str(source), "Image", path, 256)
+
+        with Image.open(path) as thumb:
+            assert thumb.format == "JPEG"
+            assert thumb.size == (256, 128)
+            assert thumb.getpixel((10, 10)) == (255, 255, 255)
+
+    def test_jpeg_rotated_by_exif(self, tmp_path):
+        source = tmp_path / "photo.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        Image.new("RGB", (800, 400), "blue").save(source, exif=exif)
+        path = str(tmp_path / "thumb.jpg")
+
+        render_preview(str(source), "Image", path, 256)
+
+        with Image.open(path) as thumb:
+            assert thumb.size == (128, 256)
+
+    def test_pdf_first_page(self, tmp_path):
+        fitz = pytest.importorskip("fitz")
+        pdf = fitz.open()
+        pdf.new_page(width=612, height=792)
+        pdf.new_page(width=792, height=612)
+        source = tmp_path / "plat.pdf"
+        pdf.save(str(source))
+        path = str(tmp_path / "page.jpg")
+
+        render_preview(str(source), "PDF", path, 256)
+
+        with Image.open(path) as raster:
+            assert raster.size[1] == 256
+            assert raster.size[0] < 256
+
+
+class TestPreviewRenderer:
+    """Test the background preview pool."""
+
+    def test_renders_once_per_preview(self, tmp_path, preview_dir):
+        source = tmp_path / "photo.jpg"
+        Image.new("RGB", (800, 800), (0, 99, 0)).save(source)
+        renderer = PreviewRenderer(max_workers=1)
+        busy = threading.Event()
+        try:
+            # Hold the only worker so both requests find the render queued
+            renderer._executor.submit(busy.wait)
+            first = renderer.submit(str(source), "Image", "ab" * 32, PreviewSize.THUMB)
+            second = renderer.submit(str(source), "Image", "ab" * 32, PreviewSize.THUMB)
+            busy.set()
+            first.result(timeout=10)
+
+            assert first is second
+            assert os.path.exists(preview_path("ab" * 32, PreviewSize.THUMB))
+        finally:
+            busy.set()
+            renderer.shutdown()
@@ -0,0 +1,134 @@
+"""Tests for the property list endpoints."""
+import math
+import random
+from types import SimpleNamespace
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from app.geo import cluster_cell_degrees
+from app.models.models import Property, PropertyType
+from app.routers import properties
+
+
+@pytest.fixture
+def client(test_db):
+    app = FastAPI()
+    app.include_router(properties.router, prefix="/api")
+    return TestClient(app)
+
+
+@pytest.fixture
+def db(test_db):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.query(Property).filter(
+        Property.county.in_(["Pagination", "Clusters", "Elsewhere"])
+    ).delete(synchronize_session=False)
+    session.commit()
+    session.close()
+
+
+class TestKeysetPagination:
+    """Test paging the property list with X-Next-Cursor."""
+
+    def test_pages_cover_every_property_once(self, client, db):
+        scores = [90, 90, 80, None, None, 50, 90, 80]
+        props = [
+            Property(name=f"Page {i}", county="Pagination", property_type=PropertyType.MDU,
+                     score=0 if score is None else score)
+            for i, score in enumerate(scores)
+        ]
+        db.add_all(props)
+        db.flush()
+        # Unscored rows hold NULL, which the column default would replace on insert
+        db.query(Property).filter(Property.county == "Pagination", Property.score == 0).update(
+            {Property.score: None}, synchronize_session=False
+        )
+        db.commit()
+        expected = [
+            p.id for p, score in sorted(
+                zip(props, scores), key=lambda pair: (-1 if pair[1] is None else pair[1], pair[0].id),
+                reverse=True
+            )
+        ]
+
+        seen, cursor, pages = [], "", 0
+        while cursor is not None:
+            response = client.get("/api/properties", params={
+                "county": "Pagination", "limit": 3, "cursor": cursor
+            })
+            assert response.status_code == 200
+            page = response.json()
+            assert 0 < len(page) <= 3
+            seen.extend(p["id"] for p in page)
+            cursor = response.headers.get("x-next-cursor")
+            pages += 1
+
+        assert seen == expected
+        assert pages == 3
+        assert [p["id"] for p in client.get(
+            "/api/properties", params={"county": "Pagination", "limit": 100}
+        ).json()] == expected
+
+    def test_malformed_cursor_rejected(self, client, db):
+        for cursor in ("not-a-cursor", "WzFd", "WyJ4IiwgMV0"):
+            response = client.get("/api/properties", params={"cursor": cursor})
+            assert response.status_code == 400
+            assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+class TestClusters:
+    """Test the map clustering endpoint."""
+
+    def test_clusters_partition_filtered_properties(self, client, db):
+        rng = random.Random(7)
+        inside = []
+        for i in range(60):
+            prop = Property(
+                name=f"Cluster {i}", county="Clusters" if i % 5 else "Elsewhere",
+                property_type=PropertyType.MDU, tier=1 + i % 3,
+                latitude=rng.uniform(29.4, 30.2), longitude=rng.uniform(-98.6, -97.8)
+            )
+            db.add(prop)
+            inside.append(prop)
+        # Outside the box
+        db.add(Property(name="Cluster far", county="Clusters", property_type=PropertyType.MDU,
+                        tier=1, latitude=31.5, longitude=-98.0))
+        db.commit()
+
+        zoom = 9
+        cell_size = cluster_cell_degrees(zoom)
+        response = client.get("/api/properties/clusters", params={
+            "bbox": "-98.5,29.5,-97.9,30.1", "zoom": zoom, "county": "Clusters", "tier": 2
+        })
+        assert response.status_code == 200
+        body = response.json()
+
+        def cell(lat, lng):
+            return math.floor((lat + 90) / cell_size), math.floor((lng + 180) / cell_size)
+
+        expected = {}
+        for prop in inside:
+            if (prop.county == "Clusters" and prop.tier == 2
+                    and 29.5 <= prop.latitude <= 30.1 and -98.5 <= prop.longitude <= -97.9):
+                key = cell(prop.latitude, prop.longitude)
+                expected[key] = expected.get(key, 0) + 1
+
+        assert body["total"] == sum(c["count"] for c in body["clusters"]) == sum(expected.values())
+        assert {cell(c["latitude"], c["longitude"]): c["count"] for c in body["clusters"]} == expected
+        for cluster in body["clusters"]:
+            assert cluster["tiers"] == {"1": 0, "2": cluster["count"], "3": 0}
+            assert (cluster["property_id"] is not None) == (cluster["count"] == 1)
+
+    def test_bad_bbox_rejected(self, client, test_db):
+        assert client.get("/api/properties/clusters", params={"bbox": "1,2,3", "zoom": 5}).status_code == 400
+        assert client.get("/api/properties/clusters", params={"bbox": "3,2,1,4", "zoom": 5}).status_code == 400
+
+    def test_postgres_grid_index_floors(self):
+        db = SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+        expression = properties._grid_index(db, Property.latitude + 90, 0.5)
+
+        assert str(expression.compile(dialect=postgresql.dialect())).startswith("floor(")
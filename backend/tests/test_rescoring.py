@@ -0,0 +1,84 @@
+"""Tests for chunked bulk rescoring."""
+import pytest
+from app import rescoring
+from app.models.models import Property, PropertyType, ScoringJob
+from app.scoring import calculate_score
+
+
+@pytest.fixture
+def db(test_db):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    session.add_all([
+        Property(name=f"Rescore {i}", county="Comal", property_type=PropertyType.MDU,
+                 units=50 * (i + 1), score=0, tier=3)
+        for i in range(5)
+    ])
+    job = ScoringJob(status="Pending")
+    session.add(job)
+    session.commit()
+    yield session
+    session.rollback()
+    session.query(Property).filter(Property.name.like("Rescore %")).delete(synchronize_session=False)
+    session.query(ScoringJob).delete()
+    session.commit()
+    session.close()
+
+
+def job_of(db):
+    db.expire_all()
+    return db.query(ScoringJob).one()
+
+
+def rescored(db):
+    return db.query(Property).filter(Property.name.like("Rescore %")).order_by(Property.id).all()
+
+
+class TestRescoringJob:
+    """Test the chunked recalculate-all job."""
+
+    def test_chunks_rescore_every_property(self, db, monkeypatch):
+        chunks = []
+        rescore_rows = rescoring.rescore_rows
+
+        def record(session, rows, *args):
+            chunks.append([row.id for row in rows])
+            return rescore_rows(session, rows, *args)
+
+        monkeypatch.setattr(rescoring, "rescore_rows", record)
+        rescoring.run_rescoring_job(job_of(db).id, chunk_size=2)
+
+        job = job_of(db)
+        total = db.query(Property).count()
+        assert job.status == "Completed"
+        assert job.total_rows == job.processed_count == total
+        assert len(chunks) == -(-total // 2)
+        assert all(len(chunk) <= 2 for chunk in chunks)
+        ids = [row_id for chunk in chunks for row_id in chunk]
+        assert ids == sorted(set(ids))
+        for prop in rescored(db):
+            expected = calculate_score(prop)
+            assert prop.score == expected["total_score"]
+            assert prop.tier == expected["tier"]
+            assert prop.last_scored_at is not None
+
+    def test_failed_chunk_fails_job_and_keeps_committed_chunks(self, db, monkeypatch):
+        rescore_rows = rescoring.rescore_rows
+        calls = []
+
+        def fail_second(session, rows, *args):
+            calls.append([row.id for row in rows])
+            if len(calls) == 2:
+                raise RuntimeError("scoring exploded")
+            return rescore_rows(session, rows, *args)
+
+        monkeypatch.setattr(rescoring, "rescore_rows", fail_second)
+        rescoring.run_rescoring_job(job_of(db).id, chunk_size=2)
+
+        job = job_of(db)
+        assert job.status == "Failed"
+        assert job.error == "scoring exploded"
+        assert job.processed_count == 2
+        assert job.completed_at is not None
+        scored = db.query(Property.id).filter(Property.last_scored_at.isnot(None)).order_by(Property.id)
+        assert [row.id for row in scored] == calls[0]
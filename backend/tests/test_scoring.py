@@ -11,9 +11,17 @@ from app.scoring import (
     calculate_erate_points,
     calculate_timing_points,
     determine_tier,
-    calculate_score
+    calculate_score,
+    factors_affected_by,
+    recalculate_property_score,
+    rescore_changed_factors,
+    weight_provider,
+    next_timing_change,
+    DEFAULT_WEIGHTS
+)
+from app.models.models import (
+    Property, PropertyType, PropertyStatus, PropertyPhase, ScoringWeight
 )
-from app.models.models import Property, PropertyType, PropertyStatus, PropertyPhase
 
 
 class TestScalePoints:
@@ -183,6 +191,29 @@ class TestTimingPoints:
         assert calculate_timing_points(None) == 40
 
 
+class TestNextTimingChange:
+    """Test timing threshold crossing predictions."""
+    
+    NOW = datetime(2025, 1, 1, 12, 0)
+    
+    def test_crossings_in_order(self):
+        start = self.NOW + timedelta(days=1000)
+        first = next_timing_change(start, self.NOW)
+        assert first == start - timedelta(days=731)
+        assert next_timing_change(start, first + timedelta(seconds=1)) == start - timedelta(days=366)
+        assert next_timing_change(start, start - timedelta(days=100)) == start
+    
+    def test_points_change_right_after_crossing(self):
+        start = self.NOW + timedelta(days=400, hours=3)
+        crossing = next_timing_change(start, self.NOW)
+        assert calculate_timing_points(start, crossing) == 40
+        assert calculate_timing_points(start, crossing + timedelta(seconds=1)) == 70
+    
+    def test_no_more_changes(self):
+        assert next_timing_change(self.NOW - timedelta(days=1), self.NOW) is None
+        assert next_timing_change(None, self.NOW) is None
+
+
 class TestTierDetermination:
     """Test tier determination."""
     
@@ -312,5 +343,112 @@ class TestFullScoreCalculation:
         assert "timing" in factor_names
 
 
+
+class TestIncrementalRescoring:
+    """Test dirty-field rescoring."""
+    
+    def create_scored_property(self, **kwargs):
+        defaults = {
+            "name": "Test MDU",
+            "property_type": PropertyType.MDU,
+            "county": "Comal",
+            "units": 200,
+            "fiber_distance_gvtc": 0.3,
+            "competitor_count": 1,
+            "median_income": 80000,
+            "population_density": 2000,
+            "nearby_schools": 2,
+            "nearby_libraries": 0
+        }
+        defaults.update(kwargs)
+        return recalculate_property_score(Property(**defaults))
+    
+    def test_factors_affected_by(self):
+        assert factors_affected_by({"units"}) == {"scale"}
+        assert factors_affected_by({"nearby_libraries", "median_income"}) == {"erate_anchors", "income"}
+        assert factors_affected_by({"notes", "status"}) == set()
+    
+    def test_irrelevant_change_skips_rescore(self):
+        prop = self.create_scored_property()
+        breakdown = prop.score_breakdown
+        prop.notes = "Called the developer"
+        
+        assert rescore_changed_factors(prop, {"notes", "status"}) is False
+        assert prop.score_breakdown is breakdown
+    
+    def test_changed_factor_matches_full_recalculation(self):
+        prop = self.create_scored_property()
+        untouched = prop.score_breakdown[1]
+        prop.units = 450
+        prop.median_income = 30000
+        
+        assert rescore_changed_factors(prop, {"units", "median_income"}) is True
+        expected = calculate_score(prop)
+        assert prop.score == expected["total_score"]
+        assert prop.tier == expected["tier"]
+        assert prop.score_breakdown[0]["raw_value"] == 450
+        assert prop.score_breakdown[1] is untouched
+    
+    def test_property_type_change_rescores_everything(self):
+        prop = self.create_scored_property(lots=1000)
+        prop.property_type = PropertyType.SUBDIVISION
+        
+        assert rescore_changed_factors(prop, {"property_type"}) is True
+        factors = [b["factor"] for b in prop.score_breakdown]
+        assert "hoa_readiness" in factors
+        assert prop.score == calculate_score(prop)["total_score"]
+    
+    def test_missing_breakdown_rescores_everything(self):
+        prop = Property(name="New", property_type=PropertyType.MDU, county="Comal", units=300)
+        
+        assert rescore_changed_factors(prop, {"units"}) is True
+        assert len(prop.score_breakdown) == 8
+
+
+
+class TestWeightProvider:
+    """Test the cached scoring weight provider."""
+    
+    @pytest.fixture
+    def db(self, test_db):
+        from app.database import SessionLocal
+        session = SessionLocal()
+        yield session
+        session.query(ScoringWeight).delete()
+        session.commit()
+        weight_provider.load(session)
+        session.close()
+    
+    def test_defaults_without_rows(self, db):
+        weight_provider.load(db)
+        assert dict(weight_provider.get(PropertyType.MDU)) == DEFAULT_WEIGHTS[PropertyType.MDU]
+        assert dict(weight_provider.get(PropertyType.SUBDIVISION)) == DEFAULT_WEIGHTS[PropertyType.SUBDIVISION]
+    
+    def test_active_rows_drive_scoring(self, db):
+        db.add(ScoringWeight(property_type=PropertyType.MDU, factor_name="scale", weight=0.5))
+        db.add(ScoringWeight(property_type=PropertyType.MDU, factor_name="fiber", weight=0.9, is_active=False))
+        db.commit()
+        version = weight_provider.version
+        
+        assert weight_provider.load(db) == version + 1
+        weights = weight_provider.get(PropertyType.MDU)
+        assert weights["scale"] == 0.5
+        assert weights["fiber"] == DEFAULT_WEIGHTS[PropertyType.MDU]["fiber"]
+        assert {k: v for k, v in weights.items() if k != "scale"} == {
+            k: v for k, v in DEFAULT_WEIGHTS[PropertyType.MDU].items() if k != "scale"
+        }
+        assert dict(weight_provider.get(PropertyType.SUBDIVISION)) == DEFAULT_WEIGHTS[PropertyType.SUBDIVISION]
+        
+        prop = Property(name="A", property_type=PropertyType.MDU, county="Comal", units=400)
+        scale = calculate_score(prop)["breakdown"][0]
+        assert scale["weight"] == 0.5
+        assert scale["points"] == 50
+    
+    def test_weights_are_immutable(self, db):
+        weight_provider.load(db)
+        with pytest.raises(TypeError):
+            weight_provider.get(PropertyType.MDU)["scale"] = 1.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,56 @@
+"""Tests for cached dashboard statistics."""
+import pytest
+from app.models.models import Property, PropertyType, PropertyStatus
+from app.stats import StatsCache, compute_property_stats
+
+
+@pytest.fixture
+def db(test_db):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    session.add_all([
+        Property(name="A", county="Comal", property_type=PropertyType.MDU,
+                 status=PropertyStatus.PROSPECT, units=200, score=80.0, tier=1),
+        Property(name="B", county="Comal", property_type=PropertyType.MDU,
+                 status=PropertyStatus.PROSPECT, units=100, score=50.0, tier=2),
+        Property(name="C", county="Hays", property_type=PropertyType.SUBDIVISION,
+                 status=PropertyStatus.COMMITTED, lots=500, score=20.0, tier=3),
+    ])
+    session.commit()
+    yield session
+    session.query(Property).delete()
+    session.commit()
+    session.close()
+
+
+class TestPropertyStats:
+    """Test the single-query statistics."""
+
+    def test_totals_and_groupings(self, db):
+        stats = compute_property_stats(db)
+
+        assert stats["total_properties"] == 3
+        assert stats["by_type"] == {"MDU": 2, "Subdivision": 1}
+        assert stats["by_tier"] == {"1": 1, "2": 1, "3": 1}
+        assert stats["by_status"] == {"Prospect": 2, "Committed": 1}
+        assert stats["total_units"] == 300
+        assert stats["total_lots"] == 500
+        assert stats["average_score"] == 50.0
+
+    def test_cache_serves_until_invalidated(self, db):
+        cache = StatsCache(ttl_seconds=3600)
+        assert cache.get(db)["total_properties"] == 3
+
+        db.add(Property(name="D", county="Hays", property_type=PropertyType.MDU, units=10))
+        db.commit()
+        assert cache.get(db)["total_properties"] == 3
+
+        cache.invalidate()
+        assert cache.get(db)["total_properties"] == 4
+
+    def test_zero_ttl_always_recomputes(self, db):
+        cache = StatsCache(ttl_seconds=0)
+        cache.get(db)
+        db.add(Property(name="D", county="Hays", property_type=PropertyType.MDU))
+        db.commit()
+        assert cache.get(db)["total_properties"] == 4
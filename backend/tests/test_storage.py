@@ -0,0 +1,50 @@
+"""Tests for the content-addressed document store."""
+import hashlib
+import io
+import os
+import pytest
+from app import storage
+from app.models.models import DocumentBlob
+
+
+@pytest.fixture
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage.settings, "upload_directory", str(tmp_path))
+    return tmp_path
+
+
+def stage(data: bytes):
+    return storage.stage_upload(io.BytesIO(data), len(data))
+
+
+class TestBlobStore:
+    """Test storing, sharing and releasing blobs."""
+
+    def test_duplicates_share_one_blob(self, test_db, blob_dir):
+        from app.database import SessionLocal
+        db = SessionLocal()
+        data = b"plat contents"
+        content_hash = hashlib.sha256(data).hexdigest()
+        try:
+            first = storage.store_blob(db, *stage(data))
+            second = storage.store_blob(db, *stage(data))
+            db.commit()
+
+            assert first.content_hash == second.content_hash == content_hash
+            assert db.get(DocumentBlob, content_hash).ref_count == 2
+            assert os.listdir(blob_dir / "blobs" / "staging") == []
+            with open(storage.blob_path(content_hash), "rb") as stored:
+                assert stored.read() == data
+
+            assert storage.add_reference(db, "0" * 64) is None
+            assert not storage.release_blob(db, content_hash)
+            assert os.path.exists(storage.blob_path(content_hash))
+            assert storage.release_blob(db, content_hash)
+            db.commit()
+            assert db.get(DocumentBlob, content_hash) is None
+            assert not os.path.exists(storage.blob_path(content_hash))
+        finally:
+            db.rollback()
+            db.query(DocumentBlob).delete()
+            db.commit()
+            db.close()
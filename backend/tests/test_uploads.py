@@ -0,0 +1,65 @@
+"""Tests for streaming uploads."""
+import hashlib
+import io
+import os
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from app.uploads import UploadLimitMiddleware, copy_upload
+
+
+def limited_app(limit: int) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware, max_body_size=limit, paths=["/upload"])
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.post("/other")
+    async def other(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(app)
+
+
+class TestCopyUpload:
+    """Test chunked copies of uploaded files."""
+
+    def test_copies_and_hashes(self, tmp_path):
+        data = os.urandom(3 * 1024 * 1024 + 5)
+        path = str(tmp_path / "plat.pdf")
+
+        size, digest = copy_upload(io.BytesIO(data), path, len(data))
+
+        assert size == len(data)
+        assert digest == hashlib.sha256(data).hexdigest()
+        with open(path, "rb") as copied:
+            assert copied.read() == data
+
+    def test_oversized_file_removed(self, tmp_path):
+        path = str(tmp_path / "plat.pdf")
+
+        with pytest.raises(HTTPException) as exc:
+            copy_upload(io.BytesIO(b"x" * 2048), path, 1024)
+
+        assert exc.value.status_code == 413
+        assert not os.path.exists(path)
+
+
+class TestUploadLimitMiddleware:
+    """Test rejecting oversized bodies while they stream in."""
+
+    def test_declared_length_over_limit(self):
+        client = limited_app(100)
+
+        assert client.post("/upload", content=b"x" * 100).json() == {"size": 100}
+        assert client.post("/upload", content=b"x" * 101).status_code == 413
+        assert client.post("/other", content=b"x" * 101).status_code == 200
+
+    def test_streamed_body_over_limit(self):
+        client = limited_app(100)
+
+        response = client.post("/upload", content=iter([b"x" * 60, b"x" * 60]))
+
+        assert response.status_code == 413
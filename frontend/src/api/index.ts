@@ -11,6 +11,7 @@ import type {
   PropertyCreate,
   PropertyUpdate,
   PropertyStats,
+  ClusterResponse,
   Organization,
   OrganizationCreate,
   Contact,
@@ -21,7 +22,9 @@ import type {
   PropertyCost,
   PropertyCostUpdate,
   ImportJob,
+  ImportDryRun,
   PropertyFilter,
+  ScoringJob,
 } from './types';
 
 const API_BASE = '/api';
@@ -83,6 +86,19 @@ export const propertiesApi = {
     return response.data;
   },
 
+  listPage: async (
+    filter?: PropertyFilter,
+    cursor: string = ''
+  ): Promise<{ items: PropertyListItem[]; nextCursor: string | null }> => {
+    const response = await api.get<PropertyListItem[]>('/properties', {
+      params: { ...filter, cursor },
+    });
+    return {
+      items: response.data,
+      nextCursor: response.headers['x-next-cursor'] ?? null,
+    };
+  },
+
   get: async (id: number): Promise<Property> => {
     const response = await api.get<Property>(`/properties/${id}`);
     return response.data;
@@ -102,6 +118,17 @@ export const propertiesApi = {
     await api.delete(`/properties/${id}`);
   },
 
+  getClusters: async (
+    bbox: [number, number, number, number],
+    zoom: number,
+    filter?: PropertyFilter
+  ): Promise<ClusterResponse> => {
+    const response = await api.get<ClusterResponse>('/properties/clusters', {
+      params: { ...filter, bbox: bbox.join(','), zoom },
+    });
+    return response.data;
+  },
+
   getStats: async (): Promise<PropertyStats> => {
     const response = await api.get<PropertyStats>('/properties/stats');
     return response.data;
@@ -122,8 +149,13 @@ export const propertiesApi = {
     return response.data;
   },
 
-  recalculateAll: async (): Promise<{ message: string }> => {
-    const response = await api.post('/properties/recalculate-all');
+  recalculateAll: async (): Promise<ScoringJob> => {
+    const response = await api.post<ScoringJob>('/properties/recalculate-all');
+    return response.data;
+  },
+
+  getRecalculateJob: async (jobId: number): Promise<ScoringJob> => {
+    const response = await api.get<ScoringJob>(`/properties/recalculate-all/${jobId}`);
     return response.data;
   },
 };
@@ -228,6 +260,15 @@ export const contactsApi = {
 
 // ============ Documents ============
 
+async function sha256Hex(file: File): Promise<string | null> {
+  // Web Crypto is only available in secure contexts
+  if (!window.crypto?.subtle) return null;
+  const digest = await window.crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, '0'))
+    .join('');
+}
+
 export const documentsApi = {
   list: async (params?: {
     property_id?: number;
@@ -250,11 +291,28 @@ export const documentsApi = {
     description?: string
   ): Promise<Document> => {
     const formData = new FormData();
-    formData.append('file', file);
     formData.append('property_id', propertyId.toString());
     if (documentType) formData.append('document_type', documentType);
     if (description) formData.append('description', description);
 
+    // Content the server already stores is attached without re-uploading it
+    const contentHash = await sha256Hex(file);
+    if (contentHash) {
+      const attachData = new FormData();
+      formData.forEach((value, key) => attachData.append(key, value));
+      attachData.append('content_hash', contentHash);
+      attachData.append('filename', file.name);
+      try {
+        const response = await api.post<Document>('/documents/attach', attachData, {
+          headers: { 'Content-Type': 'multipart/form-data' },
+        });
+        return response.data;
+      } catch (error) {
+        if (!axios.isAxiosError(error) || error.response?.status !== 404) throw error;
+      }
+    }
+
+    formData.append('file', file);
     const response = await api.post<Document>('/documents/upload', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
     });
@@ -268,6 +326,18 @@ export const documentsApi = {
     return response.data;
   },
 
+  previewUrl: (id: number, size: 'thumb' | 'large' = 'thumb'): string =>
+    `${API_BASE}/documents/${id}/preview?size=${size}`,
+
+  bundleUrl: (params?: { property_id?: number; document_type?: string; search?: string }): string => {
+    const query = new URLSearchParams();
+    Object.entries(params ?? {}).forEach(([key, value]) => {
+      if (value !== undefined && value !== '') query.append(key, String(value));
+    });
+    const search = query.toString();
+    return `${API_BASE}/documents/bundle${search ? `?${search}` : ''}`;
+  },
+
   delete: async (id: number): Promise<void> => {
     await api.delete(`/documents/${id}`);
   },
@@ -300,10 +370,21 @@ export const importsApi = {
     return response.data;
   },
 
-  upload: async (file: File, propertyType: 'MDU' | 'Subdivision'): Promise<ImportJob> => {
+  upload: async (
+    file: File,
+    propertyType: 'MDU' | 'Subdivision',
+    force: boolean = false,
+    sheets: string[] = [],
+    columnMapping?: Record<string, string | null>
+  ): Promise<ImportJob> => {
     const formData = new FormData();
     formData.append('file', file);
     formData.append('property_type', propertyType);
+    formData.append('force', String(force));
+    sheets.forEach((sheet) => formData.append('sheets', sheet));
+    if (columnMapping) {
+      formData.append('column_mapping', JSON.stringify(columnMapping));
+    }
 
     const response = await api.post<ImportJob>('/imports/upload', formData, {
       headers: { 'Content-Type': 'multipart/form-data' },
@@ -311,10 +392,36 @@ export const importsApi = {
     return response.data;
   },
 
+  validate: async (
+    file: File,
+    propertyType: 'MDU' | 'Subdivision',
+    sheets: string[] = [],
+    columnMapping?: Record<string, string | null>
+  ): Promise<ImportDryRun> => {
+    const formData = new FormData();
+    formData.append('file', file);
+    formData.append('property_type', propertyType);
+    formData.append('dry_run', 'true');
+    sheets.forEach((sheet) => formData.append('sheets', sheet));
+    if (columnMapping) {
+      formData.append('column_mapping', JSON.stringify(columnMapping));
+    }
+
+    const response = await api.post<ImportDryRun>('/imports/upload', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
   get: async (id: number): Promise<ImportJob> => {
     const response = await api.get<ImportJob>(`/imports/${id}`);
     return response.data;
   },
+
+  cancel: async (id: number): Promise<ImportJob> => {
+    const response = await api.post<ImportJob>(`/imports/${id}/cancel`);
+    return response.data;
+  },
 };
 
 // ============ Health Check ============
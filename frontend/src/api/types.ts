@@ -152,6 +152,22 @@ export interface PropertyStats {
   average_score: number;
 }
 
+export interface PropertyCluster {
+  count: number;
+  latitude: number;
+  longitude: number;
+  max_score: number | null;
+  tiers: Record<string, number>;
+  property_id: number | null;
+}
+
+export interface ClusterResponse {
+  zoom: number;
+  cell_size: number;
+  total: number;
+  clusters: PropertyCluster[];
+}
+
 export interface Organization {
   id: number;
   name: string;
@@ -221,6 +237,7 @@ export interface Document {
   original_filename?: string;
   file_type?: string;
   file_size?: number;
+  content_hash?: string;
   document_type?: string;
   description?: string;
   created_at: string;
@@ -261,18 +278,66 @@ export interface PropertyCostUpdate {
   notes?: string;
 }
 
+export interface ImportError {
+  row?: number;
+  sheet?: string;
+  error: string;
+}
+
+export interface ImportCounts {
+  processed: number;
+  imported: number;
+  updated: number;
+  unchanged: number;
+  skipped: number;
+  errors: number;
+}
+
 export interface ImportJob {
   id: number;
   filename?: string;
   import_type?: string;
   status: string;
   total_rows?: number;
+  processed_count: number;
+  imported_count: number;
+  updated_count: number;
+  unchanged_count: number;
+  skipped_count: number;
+  error_count: number;
+  errors?: ImportError[];
+  column_mapping?: Record<string, string>;
+  unmapped_columns?: string[];
+  sheets?: string[];
+  sheet_counts?: Record<string, ImportCounts>;
+  created_at: string;
+  completed_at?: string;
+}
+
+export interface ImportDryRun {
+  filename: string;
+  import_type: string;
+  dry_run: true;
+  total_rows: number;
   imported_count: number;
   updated_count: number;
+  unchanged_count: number;
   skipped_count: number;
   error_count: number;
-  errors?: { row?: number; error: string }[];
+  errors: ImportError[];
+  column_mapping: Record<string, string>;
+  unmapped_columns: string[];
+  sheet_counts?: Record<string, ImportCounts>;
+}
+
+export interface ScoringJob {
+  id: number;
+  status: string;
+  total_rows?: number;
+  processed_count: number;
+  error?: string;
   created_at: string;
+  started_at?: string;
   completed_at?: string;
 }
 
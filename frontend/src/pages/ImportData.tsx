@@ -15,14 +15,15 @@ export default function ImportData() {
   const [propertyType, setPropertyType] = useState<'MDU' | 'Subdivision'>('MDU');
   const [importing, setImporting] = useState(false);
   const [importResult, setImportResult] = useState<ImportJob | null>(null);
+  const [progress, setProgress] = useState<ImportJob | null>(null);
   const [error, setError] = useState('');
   const fileInputRef = useRef<HTMLInputElement>(null);
 
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const selectedFile = e.target.files?.[0];
     if (selectedFile) {
-      if (!selectedFile.name.match(/\.(xlsx|xls)$/)) {
-        setError('Please select an Excel file (.xlsx or .xls)');
+      if (!selectedFile.name.match(/\.(xlsx|xls|csv|parquet)$/i)) {
+        setError('Please select an Excel (.xlsx or .xls), CSV or Parquet file');
         return;
       }
       setFile(selectedFile);
@@ -35,8 +36,8 @@ export default function ImportData() {
     e.preventDefault();
     const droppedFile = e.dataTransfer.files[0];
     if (droppedFile) {
-      if (!droppedFile.name.match(/\.(xlsx|xls)$/)) {
-        setError('Please select an Excel file (.xlsx or .xls)');
+      if (!droppedFile.name.match(/\.(xlsx|xls|csv|parquet)$/i)) {
+        setError('Please select an Excel (.xlsx or .xls), CSV or Parquet file');
         return;
       }
       setFile(droppedFile);
@@ -53,7 +54,14 @@ export default function ImportData() {
     setImportResult(null);
 
     try {
-      const result = await importsApi.upload(file, propertyType);
+      let result = await importsApi.upload(file, propertyType);
+      setProgress(result);
+      // Imports run in the background; poll until the job finishes
+      while (result.status === 'Pending' || result.status === 'Processing') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        result = await importsApi.get(result.id);
+        setProgress(result);
+      }
       setImportResult(result);
       setFile(null);
       if (fileInputRef.current) {
@@ -63,6 +71,13 @@ export default function ImportData() {
       setError(err.response?.data?.detail || 'Import failed. Please check your file format.');
     } finally {
       setImporting(false);
+      setProgress(null);
+    }
+  };
+
+  const handleCancel = async () => {
+    if (progress) {
+      await importsApi.cancel(progress.id);
     }
   };
 
@@ -76,7 +91,7 @@ export default function ImportData() {
       <div className="bg-blue-50 border border-blue-200 rounded-lg p-4">
         <h3 className="font-medium text-blue-900 mb-2">Excel Import Instructions</h3>
         <ul className="text-sm text-blue-800 space-y-1 list-disc list-inside">
-          <li>Upload Excel files (.xlsx or .xls) containing property data</li>
+          <li>Upload Excel (.xlsx or .xls), CSV or Parquet files containing property data</li>
           <li>Required columns: <strong>Name</strong> and <strong>County</strong></li>
           <li>Recommended columns: City, Address, Units/Lots, Status, Break Ground Date</li>
           <li>The system will automatically map common column names</li>
@@ -187,14 +202,14 @@ export default function ImportData() {
                     </button>
                   </p>
                   <p className="mt-1 text-xs text-gray-500">
-                    .xlsx or .xls files up to 50MB
+                    .xlsx, .xls, .csv or .parquet files up to 50MB
                   </p>
                 </>
               )}
               <input
                 ref={fileInputRef}
                 type="file"
-                accept=".xlsx,.xls"
+                accept=".xlsx,.xls,.csv,.parquet"
                 onChange={handleFileChange}
                 className="hidden"
               />
@@ -210,7 +225,24 @@ export default function ImportData() {
           )}
 
           {/* Import Button */}
-          <div className="flex justify-end">
+          <div className="flex justify-end items-center space-x-4">
+            {progress && (
+              <>
+                <p className="text-sm text-gray-500">
+                  {progress.status === 'Pending'
+                    ? 'Waiting for an import worker...'
+                    : `Processed ${progress.processed_count}${
+                        progress.total_rows ? ` of ~${progress.total_rows}` : ''
+                      } rows`}
+                </p>
+                <button
+                  onClick={handleCancel}
+                  className="px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50"
+                >
+                  Cancel
+                </button>
+              </>
+            )}
             <button
               onClick={handleImport}
               disabled={!file || importing}
@@ -253,7 +285,7 @@ export default function ImportData() {
                 Import {importResult.status}
               </h3>
               
-              <div className="mt-4 grid grid-cols-2 md:grid-cols-4 gap-4">
+              <div className="mt-4 grid grid-cols-2 md:grid-cols-5 gap-4">
                 <div className="bg-white rounded-lg p-3 shadow-sm">
                   <p className="text-xs text-gray-500">Total Rows</p>
                   <p className="text-lg font-semibold text-gray-900">{importResult.total_rows || 0}</p>
@@ -266,12 +298,52 @@ export default function ImportData() {
                   <p className="text-xs text-gray-500">Updated</p>
                   <p className="text-lg font-semibold text-blue-600">{importResult.updated_count}</p>
                 </div>
+                <div className="bg-white rounded-lg p-3 shadow-sm">
+                  <p className="text-xs text-gray-500">Unchanged</p>
+                  <p className="text-lg font-semibold text-gray-600">{importResult.unchanged_count}</p>
+                </div>
                 <div className="bg-white rounded-lg p-3 shadow-sm">
                   <p className="text-xs text-gray-500">Errors</p>
                   <p className="text-lg font-semibold text-red-600">{importResult.error_count}</p>
                 </div>
               </div>
 
+              {importResult.unmapped_columns && importResult.unmapped_columns.length > 0 && (
+                <p className="mt-4 text-sm text-gray-600">
+                  Columns not imported: {importResult.unmapped_columns.join(', ')}
+                </p>
+              )}
+
+              {importResult.sheet_counts && Object.keys(importResult.sheet_counts).length > 1 && (
+                <div className="mt-4">
+                  <h4 className="text-sm font-medium text-gray-900 mb-2">Sheets</h4>
+                  <div className="bg-white rounded-lg border border-gray-200 max-h-48 overflow-y-auto">
+                    <table className="min-w-full divide-y divide-gray-200">
+                      <thead className="bg-gray-50">
+                        <tr>
+                          <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Sheet</th>
+                          <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Imported</th>
+                          <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Updated</th>
+                          <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Unchanged</th>
+                          <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Errors</th>
+                        </tr>
+                      </thead>
+                      <tbody className="divide-y divide-gray-200">
+                        {Object.entries(importResult.sheet_counts).map(([sheet, counts]) => (
+                          <tr key={sheet}>
+                            <td className="px-4 py-2 text-sm text-gray-900">{sheet}</td>
+                            <td className="px-4 py-2 text-sm text-green-600">{counts.imported}</td>
+                            <td className="px-4 py-2 text-sm text-blue-600">{counts.updated}</td>
+                            <td className="px-4 py-2 text-sm text-gray-600">{counts.unchanged}</td>
+                            <td className="px-4 py-2 text-sm text-red-600">{counts.errors}</td>
+                          </tr>
+                        ))}
+                      </tbody>
+                    </table>
+                  </div>
+                </div>
+              )}
+
               {importResult.errors && importResult.errors.length > 0 && (
                 <div className="mt-4">
                   <h4 className="text-sm font-medium text-gray-900 mb-2">Errors</h4>
@@ -280,6 +352,9 @@ export default function ImportData() {
                       <thead className="bg-gray-50">
                         <tr>
                           <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Row</th>
+                          {importResult.errors.some((err) => err.sheet) && (
+                            <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Sheet</th>
+                          )}
                           <th className="px-4 py-2 text-left text-xs font-medium text-gray-500">Error</th>
                         </tr>
                       </thead>
@@ -287,6 +362,9 @@ export default function ImportData() {
                         {importResult.errors.map((err, i) => (
                           <tr key={i}>
                             <td className="px-4 py-2 text-sm text-gray-900">{err.row || '-'}</td>
+                            {importResult.errors?.some((e) => e.sheet) && (
+                              <td className="px-4 py-2 text-sm text-gray-900">{err.sheet || '-'}</td>
+                            )}
                             <td className="px-4 py-2 text-sm text-red-600">{err.error}</td>
                           </tr>
                         ))}
@@ -430,10 +430,20 @@ export default function PropertyDetail() {
           <div>
             <div className="flex justify-between items-center mb-4">
               <h3 className="text-lg font-medium text-gray-900">Documents</h3>
-              <button className="inline-flex items-center px-3 py-2 border border-gray-300 rounded-md text-sm font-medium text-gray-700 bg-white hover:bg-gray-50">
-                <DocumentArrowUpIcon className="h-4 w-4 mr-2" />
-                Upload Document
-              </button>
+              <div className="flex space-x-2">
+                {documents.length > 0 && (
+                  <a
+                    href={documentsApi.bundleUrl({ property_id: property.id })}
+                    className="inline-flex items-center px-3 py-2 border border-gray-300 rounded-md text-sm font-medium text-gray-700 bg-white hover:bg-gray-50"
+                  >
+                    Download All
+                  </a>
+                )}
+                <button className="inline-flex items-center px-3 py-2 border border-gray-300 rounded-md text-sm font-medium text-gray-700 bg-white hover:bg-gray-50">
+                  <DocumentArrowUpIcon className="h-4 w-4 mr-2" />
+                  Upload Document
+                </button>
+              </div>
             </div>
             {documents.length === 0 ? (
               <p className="text-gray-500">No documents uploaded.</p>
@@ -451,7 +461,20 @@ export default function PropertyDetail() {
                 <tbody className="divide-y divide-gray-200">
                   {documents.map((doc) => (
                     <tr key={doc.id}>
-                      <td className="px-6 py-4 text-sm text-gray-900">{doc.original_filename}</td>
+                      <td className="px-6 py-4 text-sm text-gray-900">
+                        <div className="flex items-center">
+                          {(doc.file_type === 'Image' || doc.file_type === 'PDF') && (
+                            <img
+                              src={documentsApi.previewUrl(doc.id)}
+                              alt=""
+                              loading="lazy"
+                              className="h-10 w-10 mr-3 object-cover rounded border border-gray-200"
+                              onError={(e) => { e.currentTarget.style.display = 'none'; }}
+                            />
+                          )}
+                          {doc.original_filename}
+                        </div>
+                      </td>
                       <td className="px-6 py-4 text-sm text-gray-500">{doc.document_type}</td>
                       <td className="px-6 py-4 text-sm text-gray-500">
                         {doc.file_size ? `${(doc.file_size / 1024).toFixed(1)} KB` : '-'}